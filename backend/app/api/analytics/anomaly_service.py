@@ -0,0 +1,334 @@
+import math
+from collections import defaultdict
+from datetime import date
+from typing import List, NamedTuple, Optional
+from fastapi import HTTPException
+from sqlalchemy import and_, case, func, update
+from sqlalchemy import inspect as inspect_state
+from sqlalchemy.orm import Session
+
+from app.core.config import ANOMALY_MIN_HISTORY, ANOMALY_Z_THRESHOLD
+from app.entities.category import Category
+from app.entities.category_amount_stats import CategoryAmountStats
+from app.entities.transaction import Transaction
+from app.entities.user import User
+from app.entities.wallet import Wallet
+from app.utils.enums.transaction_type import TransactionType
+from app.services.response_cache import cached_response
+
+from .model import UnusualTransaction
+
+'''
+Flags unusually large expenses without reading the history.
+
+category_amount_stats keeps, per (user, category, wallet currency), the
+count, mean and M2 (sum of squared deviations) of the expense amounts:
+Welford's running statistics. Write paths pass every transaction they add
+or remove through apply_amount_stats (aggregate_service does this for every
+create / edit / delete), in the same database transaction. The amounts of
+one write are summarised per key first and merged into the stored row with
+one UPDATE (Chan's combination of two sets of moments, or its inverse to
+take amounts out), so concurrent writers add up and the cost does not grow
+with the history.
+
+A new or edited expense is compared with its category as it was before the
+write: when the category has at least ANOMALY_MIN_HISTORY expenses and the
+amount is ANOMALY_Z_THRESHOLD or more standard deviations above their mean,
+its z-score is stored in transactions.anomaly_score, together with that
+mean and standard deviation (anomaly_mean, anomaly_std), so the listing
+shows the baseline the score was computed from. Nothing here commits.
+'''
+
+# (category_id, currency)
+StatsKey = tuple
+
+
+class Moments(NamedTuple):
+    count: int
+    mean: float
+    m2: float
+
+
+class Unusual(NamedTuple):
+    z_score: float
+    mean: float
+    std: float
+
+
+def moments(amounts: list[float]) -> Moments:
+    """Welford's count, mean and M2 of `amounts`."""
+    count, mean, m2 = 0, 0.0, 0.0
+    for amount in amounts:
+        count += 1
+        delta = amount - mean
+        mean += delta / count
+        m2 += delta * (amount - mean)
+    return Moments(count, mean, m2)
+
+
+def unusual_score(stats: Optional[Moments], amount: float) -> Optional[Unusual]:
+    """z-score of `amount` against `stats`, with their mean and spread, when it is high enough to flag, else None."""
+    if stats is None or stats.count < ANOMALY_MIN_HISTORY:
+        return None
+    variance = max(stats.m2, 0.0) / (stats.count - 1)
+    if variance <= 0:
+        return None
+    std = math.sqrt(variance)
+    z = (amount - stats.mean) / std
+    return Unusual(z, stats.mean, std) if z >= ANOMALY_Z_THRESHOLD else None
+
+
+def apply_amount_stats(db: Session, user_id: int, signed: list[tuple]):
+    """
+    Add (sign 1) or remove (sign -1) the expenses among `signed`
+    ((transaction or snapshot, sign, wallet currency) tuples) from the
+    running statistics, and score the added transactions.
+    """
+    added = defaultdict(list)
+    removed = defaultdict(list)
+    candidates = []
+
+    for tx, sign, currency in signed:
+        scored = sign > 0 and isinstance(tx, Transaction)
+        if tx.type != TransactionType.EXPENSE or tx.category_id is None:
+            if scored:
+                _set_score(tx, None)
+            continue
+
+        key = (tx.category_id, currency)
+        amount = float(tx.amount)
+        (added if sign > 0 else removed)[key].append(amount)
+        if scored:
+            candidates.append((tx, key, amount))
+
+    # An edit that kept the amount, category and currency changes nothing
+    for key in [key for key in added if sorted(added[key]) == sorted(removed.get(key, []))]:
+        del added[key], removed[key]
+    candidates = [candidate for candidate in candidates if candidate[1] in added]
+
+    if candidates:
+        stats = _load_stats(db, user_id, {key for _, key, _ in candidates})
+        for tx, key, amount in candidates:
+            _set_score(tx, unusual_score(stats.get(key), amount))
+
+    for key, amounts in removed.items():
+        _remove_moments(db, user_id, key, moments(amounts))
+
+    if removed:
+        # Keys whose last expense is gone
+        db.query(CategoryAmountStats).filter(
+            CategoryAmountStats.user_id == user_id,
+            CategoryAmountStats.count <= 0
+        ).delete(synchronize_session=False)
+
+    inserted = False
+    for key, amounts in added.items():
+        inserted = _add_moments(db, user_id, key, moments(amounts)) or inserted
+
+    if inserted:
+        # A later call in the same unit of work must see these rows
+        db.flush()
+
+
+def remove_wallet_expenses(db: Session, user_id: int, wallet: Wallet):
+    """Take every expense of `wallet` out of the statistics, e.g. before they are bulk deleted."""
+    for key, wallet_moments in _wallet_moments(db, wallet).items():
+        _remove_moments(db, user_id, key, wallet_moments)
+    db.query(CategoryAmountStats).filter(
+        CategoryAmountStats.user_id == user_id,
+        CategoryAmountStats.count <= 0
+    ).delete(synchronize_session=False)
+
+
+def add_wallet_expenses(db: Session, user_id: int, wallet: Wallet):
+    """Count every expense of `wallet` again, e.g. under its new currency."""
+    inserted = False
+    for key, wallet_moments in _wallet_moments(db, wallet).items():
+        inserted = _add_moments(db, user_id, key, wallet_moments) or inserted
+    if inserted:
+        db.flush()
+
+
+@cached_response("analytics.anomalies")
+def get_unusual_transactions_service(
+    db: Session,
+    current_user: User,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 50,
+) -> List[UnusualTransaction]:
+    """The user's flagged expenses, newest first, with the category mean and spread each was scored against."""
+    try:
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(status_code=400, detail="Start date cannot be after end date")
+
+        query = (
+            db.query(
+                Transaction.id,
+                Transaction.name,
+                Transaction.amount,
+                Transaction.transaction_date,
+                Transaction.category_id,
+                Transaction.anomaly_score,
+                Transaction.anomaly_mean,
+                Transaction.anomaly_std,
+                Category.name.label("category_name"),
+                Wallet.currency,
+            )
+            .join(Wallet, Wallet.id == Transaction.wallet_id)
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .filter(
+                Transaction.user_id == current_user.id,
+                Transaction.anomaly_score.isnot(None),
+            )
+        )
+        if start_date:
+            query = query.filter(Transaction.transaction_date >= start_date)
+        if end_date:
+            query = query.filter(Transaction.transaction_date <= end_date)
+
+        rows = query.order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).limit(limit).all()
+
+        return [
+            UnusualTransaction(
+                transaction_id=row.id,
+                name=row.name,
+                amount=float(row.amount),
+                currency=row.currency,
+                transaction_date=row.transaction_date,
+                category_id=row.category_id,
+                category_name=row.category_name,
+                z_score=round(row.anomaly_score, 2),
+                category_mean=_round_or_none(row.anomaly_mean),
+                category_std=_round_or_none(row.anomaly_std),
+            )
+            for row in rows
+        ]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error while listing unusual transactions: {str(e)}",
+        )
+
+
+def _set_score(tx: Transaction, unusual: Optional[Unusual]):
+    # Loaded value only: checking a new row must not cost a SELECT, and
+    # rows that were never flagged must not cost an UPDATE
+    if unusual is not None or inspect_state(tx).dict.get("anomaly_score") is not None:
+        tx.anomaly_score, tx.anomaly_mean, tx.anomaly_std = unusual or (None, None, None)
+
+
+def _round_or_none(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+def _load_stats(db: Session, user_id: int, keys: set[StatsKey]) -> dict[StatsKey, Moments]:
+    rows = db.query(
+        CategoryAmountStats.category_id,
+        CategoryAmountStats.currency,
+        CategoryAmountStats.count,
+        CategoryAmountStats.mean,
+        CategoryAmountStats.m2,
+    ).filter(
+        CategoryAmountStats.user_id == user_id,
+        CategoryAmountStats.category_id.in_({category_id for category_id, _ in keys}),
+    )
+    return {
+        (row.category_id, row.currency): Moments(row.count, row.mean, row.m2)
+        for row in rows
+        if (row.category_id, row.currency) in keys
+    }
+
+
+def _add_moments(db: Session, user_id: int, key: StatsKey, part: Moments) -> bool:
+    """Merge `part` into the row of `key`; True when a new row had to be added."""
+    stats = CategoryAmountStats
+    total = stats.count + part.count
+    delta = part.mean - stats.mean
+
+    # Every right-hand side reads the row as it was before this UPDATE
+    updated = db.execute(
+        update(stats)
+        .where(_key_matches(user_id, key))
+        .values(
+            count=total,
+            mean=stats.mean + delta * part.count / total,
+            m2=stats.m2 + part.m2 + delta * delta * stats.count * part.count / total,
+        )
+    ).rowcount
+
+    if updated:
+        return False
+
+    category_id, currency = key
+    db.add(CategoryAmountStats(
+        user_id=user_id,
+        category_id=category_id,
+        currency=currency,
+        count=part.count,
+        mean=part.mean,
+        m2=part.m2,
+    ))
+    return True
+
+
+def _remove_moments(db: Session, user_id: int, key: StatsKey, part: Moments):
+    """Take `part` back out of the row of `key`; rows left empty are deleted by the caller."""
+    stats = CategoryAmountStats
+    remaining = stats.count - part.count
+    delta = part.mean - stats.mean
+
+    db.execute(
+        update(stats)
+        .where(_key_matches(user_id, key))
+        .values(
+            count=remaining,
+            mean=case(
+                (remaining > 0, (stats.count * stats.mean - part.count * part.mean) / remaining),
+                else_=0.0,
+            ),
+            m2=case(
+                (remaining > 0, stats.m2 - part.m2 - delta * delta * stats.count * part.count / remaining),
+                else_=0.0,
+            ),
+        )
+    )
+
+
+def _wallet_moments(db: Session, wallet: Wallet) -> dict[StatsKey, Moments]:
+    amount = Transaction.amount
+    rows = (
+        db.query(
+            Transaction.category_id,
+            func.count(Transaction.id).label("count"),
+            func.sum(amount).label("total"),
+            func.sum(amount * amount).label("squares"),
+        )
+        .filter(
+            Transaction.wallet_id == wallet.id,
+            Transaction.type == TransactionType.EXPENSE,
+            Transaction.category_id.isnot(None),
+        )
+        .group_by(Transaction.category_id)
+        .all()
+    )
+
+    result = {}
+    for row in rows:
+        total, squares = float(row.total), float(row.squares)
+        result[(row.category_id, wallet.currency)] = Moments(
+            row.count, total / row.count, max(squares - total * total / row.count, 0.0)
+        )
+    return result
+
+
+def _key_matches(user_id: int, key: StatsKey):
+    category_id, currency = key
+    return and_(
+        CategoryAmountStats.user_id == user_id,
+        CategoryAmountStats.category_id == category_id,
+        CategoryAmountStats.currency == currency,
+    )
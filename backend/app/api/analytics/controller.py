@@ -1,27 +1,35 @@
 from datetime import date
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.entities.user import User
 
-from .model import PeriodSummary, MonthlyComparison
+from .model import PeriodSummary, MonthlyComparison, CategoryMatrix, AmountDistribution, UnusualTransaction
 from .service import (
+    SAVINGS_GRANULARITIES,
     get_category_summary_service,
     get_monthly_comparison_service,
+    get_category_matrix_service,
     get_spending_trends_service,
     get_top_categories_current_month_service,
     get_average_spending_service,
     get_savings_trends_service
 )
 from ...core.auth import get_current_user
+from app.core.etag import conditional_get
 from app.api.analytics.forecasting_service import (
     get_savings_forecast_service,
     get_end_of_month_spending_forecast_service,
     get_saving_opportunities_service
 )
+from app.api.analytics.forecast_models import DEFAULT_FORECAST_MODEL, FORECAST_MODELS
+from app.api.analytics.distribution_service import DISTRIBUTION_SCALES, get_amount_distribution_service
+from app.api.analytics.anomaly_service import get_unusual_transactions_service
+from app.utils.enums.transaction_type import TransactionType
+from app.utils.periods import GRANULARITIES
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(conditional_get)])
 
 
 @router.get("/category-summary", response_model=PeriodSummary)
@@ -65,24 +73,55 @@ def get_monthly_comparison(
     )
 
 
+@router.get("/category-matrix", response_model=CategoryMatrix)
+def get_category_matrix(
+        months: int = Query(
+            6,
+            ge=1,
+            le=12,
+            description="Number of months to include (1-12)",
+        ),
+        end_month: Optional[str] = Query(
+            None,
+            description="Last month in YYYY-MM format. Defaults to the current month",
+        ),
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db),
+):
+    """
+    Get income and expense per category for each of the last N months in one request.
+    """
+    return get_category_matrix_service(
+        db=db,
+        current_user=current_user,
+        months=months,
+        end_month=end_month,
+    )
+
+
 @router.get("/spending-trends")
 def get_spending_trends(
         months: int = Query(
             6,
             ge=1,
-            le=12,
-            description="Number of months to analyze (1-12)",
+            description="Number of calendar months to analyze, up to the current one. Ignored when start_date is given",
         ),
+        start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+        end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD). Defaults to today"),
+        granularity: str = Query("month", enum=list(GRANULARITIES)),
         current_user: User = Depends(get_current_user),
         db: Session = Depends(get_db),
 ):
     """
-    Get spending trends over multiple months (income vs expense).
+    Get spending trends over any date range (income vs expense), per day, week, month, quarter or year.
     """
     return get_spending_trends_service(
         db=db,
         current_user=current_user,
         months=months,
+        start_date=start_date,
+        end_date=end_date,
+        granularity=granularity,
     )
 
 
@@ -111,17 +150,69 @@ def get_average_spending(
 
 @router.get("/savings-trends")
 def get_savings_trends(
-    months: int = Query(6, ge=1, le=12),
+    months: int = Query(6, ge=1),
+    start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD). Defaults to today"),
+    granularity: str = Query("month", enum=list(SAVINGS_GRANULARITIES)),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Get savings trends over multiple months.
+    Get savings trends over any date range, per month, quarter or year.
     """
     return get_savings_trends_service(
         db=db,
         current_user=current_user,
         months=months,
+        start_date=start_date,
+        end_date=end_date,
+        granularity=granularity,
+    )
+
+
+@router.get("/distribution", response_model=AmountDistribution)
+def get_amount_distribution(
+    transaction_type: TransactionType = Query(TransactionType.EXPENSE, alias="type"),
+    start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
+    category_id: Optional[int] = None,
+    bins: int = Query(20, ge=1, le=200),
+    scale: str = Query("fixed", enum=list(DISTRIBUTION_SCALES)),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get p50 / p90 / p99 and a histogram of transaction amounts per category.
+    """
+    return get_amount_distribution_service(
+        db=db,
+        current_user=current_user,
+        transaction_type=transaction_type,
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        bins=bins,
+        scale=scale,
+    )
+
+
+@router.get("/anomalies", response_model=List[UnusualTransaction])
+def get_unusual_transactions(
+    start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get expenses flagged as unusually large for their category, newest first.
+    """
+    return get_unusual_transactions_service(
+        db=db,
+        current_user=current_user,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
     )
 
 
@@ -129,23 +220,26 @@ def get_savings_trends(
 @router.get("/forecast/savings")
 def get_savings_forecast(
     months_ahead: int = 3,
+    model: str = Query(DEFAULT_FORECAST_MODEL, enum=list(FORECAST_MODELS)),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return get_savings_forecast_service(db, current_user, months_ahead)
+    return get_savings_forecast_service(db, current_user, months_ahead, model)
 
 
 @router.get("/forecast/spending")
 def get_spending_forecast(
+    model: str = Query(DEFAULT_FORECAST_MODEL, enum=list(FORECAST_MODELS)),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return get_end_of_month_spending_forecast_service(db, current_user)
+    return get_end_of_month_spending_forecast_service(db, current_user, model)
 
 
 @router.get("/forecast/suggestions")
 def get_saving_suggestions(
+    model: str = Query(DEFAULT_FORECAST_MODEL, enum=list(FORECAST_MODELS)),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return get_saving_opportunities_service(db, current_user)
+    return get_saving_opportunities_service(db, current_user, model)
@@ -0,0 +1,212 @@
+from datetime import date
+from typing import Dict, Optional
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.entities.category import Category
+from app.entities.transaction import Transaction
+from app.entities.user import User
+from app.utils.enums.transaction_type import TransactionType
+from app.services.response_cache import cached_response
+
+from .model import AmountDistribution, AmountHistogram, CategoryDistribution
+
+'''
+Distribution of transaction amounts per category: p50 / p90 / p99 and a
+histogram, to tell a usual purchase from an unusual one.
+
+On PostgreSQL the database computes both (percentile_cont, width_bucket)
+and only one row per category and bin comes back. Elsewhere the
+(category, amount) columns are streamed in chunks into NumPy arrays. No
+Transaction objects are loaded on either path.
+
+Histogram bins span each category's own min to max, either evenly
+("fixed") or evenly in log space ("log", which leaves out amounts that are
+not positive). Both paths put an amount in a bin by the width_bucket rule,
+and the max goes in the last bin, so they return the same counts.
+'''
+
+DISTRIBUTION_SCALES = ("fixed", "log")
+PERCENTILES = (50, 90, 99)
+STREAM_CHUNK_ROWS = 10_000
+
+
+@cached_response("analytics.distribution")
+def get_amount_distribution_service(
+    db: Session,
+    current_user: User,
+    transaction_type: TransactionType = TransactionType.EXPENSE,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category_id: Optional[int] = None,
+    bins: int = 20,
+    scale: str = "fixed",
+) -> AmountDistribution:
+    """Amount percentiles and histogram for each category of the user's `transaction_type` transactions."""
+    try:
+        if scale not in DISTRIBUTION_SCALES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid scale. Use one of: {', '.join(DISTRIBUTION_SCALES)}",
+            )
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(status_code=400, detail="Start date cannot be after end date")
+
+        filters = [Transaction.user_id == current_user.id, Transaction.type == transaction_type]
+        if start_date:
+            filters.append(Transaction.transaction_date >= start_date)
+        if end_date:
+            filters.append(Transaction.transaction_date <= end_date)
+        if category_id is not None:
+            filters.append(Transaction.category_id == category_id)
+        if scale == "log":
+            filters.append(Transaction.amount > 0)
+
+        if db.get_bind().dialect.name == "postgresql":
+            distributions = _database_distributions(db, filters, bins, scale)
+        else:
+            distributions = _numpy_distributions(db, filters, bins, scale)
+
+        names = dict(
+            db.query(Category.id, Category.name)
+            .filter(Category.id.in_([key for key in distributions if key is not None]))
+            .all()
+        ) if distributions else {}
+
+        categories = [
+            CategoryDistribution(
+                category_id=key,
+                category_name=names.get(key),
+                count=stats["count"],
+                min=round(stats["min"], 2),
+                max=round(stats["max"], 2),
+                mean=round(stats["mean"], 2),
+                p50=round(stats["p50"], 2),
+                p90=round(stats["p90"], 2),
+                p99=round(stats["p99"], 2),
+                histogram=AmountHistogram(
+                    edges=_bin_edges(stats["min"], stats["max"], bins, scale),
+                    counts=stats["counts"],
+                ),
+            )
+            for key, stats in distributions.items()
+        ]
+        categories.sort(key=lambda item: item.count, reverse=True)
+
+        return AmountDistribution(
+            transaction_type=transaction_type.value,
+            scale=scale,
+            bins=bins,
+            categories=categories,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error while generating amount distribution: {str(e)}",
+        )
+
+
+def _database_distributions(db: Session, filters: list, bins: int, scale: str) -> Dict[Optional[int], dict]:
+    amount = Transaction.amount
+    stats = (
+        select(
+            Transaction.category_id,
+            func.count().label("count"),
+            func.min(amount).label("min"),
+            func.max(amount).label("max"),
+            func.avg(amount).label("mean"),
+            *(func.percentile_cont(p / 100).within_group(amount).label(f"p{p}") for p in PERCENTILES),
+        )
+        .where(*filters)
+        .group_by(Transaction.category_id)
+        .cte("amount_stats")
+    )
+
+    distributions = {}
+    for row in db.execute(select(stats)).mappings():
+        distributions[row["category_id"]] = {
+            **{name: float(row[name]) for name in ("min", "max", "mean", *(f"p{p}" for p in PERCENTILES))},
+            "count": row["count"],
+            "counts": [0] * bins,
+        }
+
+    value, low, high = amount, stats.c.min, stats.c.max
+    if scale == "log":
+        value, low, high = func.ln(value), func.ln(low), func.ln(high)
+    # width_bucket puts the max itself in bin bins + 1; a single-valued category has one bin
+    bucket = case(
+        (stats.c.max > stats.c.min, func.least(func.width_bucket(value, low, high, bins), bins)),
+        else_=1,
+    )
+
+    histogram = db.execute(
+        select(Transaction.category_id, bucket.label("bucket"), func.count())
+        .join(stats, stats.c.category_id.is_not_distinct_from(Transaction.category_id))
+        .where(*filters)
+        .group_by(Transaction.category_id, "bucket")
+    )
+    for key, index, count in histogram:
+        distributions[key]["counts"][index - 1] = count
+
+    return distributions
+
+
+def _numpy_distributions(db: Session, filters: list, bins: int, scale: str) -> Dict[Optional[int], dict]:
+    result = db.execute(
+        select(func.coalesce(Transaction.category_id, 0), Transaction.amount)
+        .where(*filters)
+        .execution_options(yield_per=STREAM_CHUNK_ROWS)
+    )
+    category_chunks, amount_chunks = [], []
+    for chunk in result.partitions():
+        ids, amounts = zip(*chunk)
+        category_chunks.append(np.array(ids, dtype=np.int64))
+        amount_chunks.append(np.array(amounts, dtype=float))
+
+    if not amount_chunks:
+        return {}
+
+    categories = np.concatenate(category_chunks)
+    amounts = np.concatenate(amount_chunks)
+
+    # Group by category, amounts ascending within each group
+    order = np.lexsort((amounts, categories))
+    categories, amounts = categories[order], amounts[order]
+    group_starts = np.flatnonzero(np.r_[True, np.diff(categories) != 0])
+
+    distributions = {}
+    for key, values in zip(categories[group_starts].tolist(), np.split(amounts, group_starts[1:])):
+        low, high = float(values[0]), float(values[-1])
+        # 0 stands for transactions without a category
+        distributions[key or None] = {
+            "count": len(values),
+            "min": low,
+            "max": high,
+            "mean": float(values.mean()),
+            # Linear interpolation, as percentile_cont
+            **{f"p{p}": float(q) for p, q in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+            "counts": _bin_counts(values, low, high, bins, scale).tolist(),
+        }
+    return distributions
+
+
+def _bin_counts(values: np.ndarray, low: float, high: float, bins: int, scale: str) -> np.ndarray:
+    """Amounts per bin, assigned like width_bucket."""
+    if high <= low:
+        counts = np.zeros(bins, dtype=np.int64)
+        counts[0] = len(values)
+        return counts
+    if scale == "log":
+        values, low, high = np.log(values), np.log(low), np.log(high)
+    index = np.minimum(((values - low) / (high - low) * bins).astype(np.int64), bins - 1)
+    return np.bincount(index, minlength=bins)
+
+
+def _bin_edges(low: float, high: float, bins: int, scale: str) -> list[float]:
+    edges = np.geomspace(low, high, bins + 1) if scale == "log" else np.linspace(low, high, bins + 1)
+    return [round(float(edge), 2) for edge in edges]
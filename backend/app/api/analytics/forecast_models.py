@@ -0,0 +1,197 @@
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.entities.daily_rollup import DailyRollup
+from app.entities.transaction import Transaction
+from app.entities.wallet import Wallet
+from app.utils.enums.transaction_type import TransactionType
+from app.utils.enums.wallet_type import WalletType
+
+'''
+Forecasting models over daily series, vectorized across users.
+
+A history is a (users, days) array with one row per user, loaded in one
+query by load_daily_totals / load_daily_savings. fit_forecast fits the
+chosen model to every row at once and returns, for each of the next
+`horizon` days, the point forecast and the variance of its error:
+
+- average: the mean day, with the sample variance.
+- smoothing: simple exponential smoothing; the smoothing factor is picked
+  per user from a grid by one-step-ahead squared error.
+- seasonal: a mean per weekday, for spending that follows the week.
+- trend: least-squares line with the usual prediction variance
+  s^2 (1 + 1/n + (t - mean t)^2 / Sxx).
+
+Totals over several days treat the daily errors as independent, so their
+variances add up. Forecasts and lower bounds never go below zero.
+'''
+
+FORECAST_MODELS = ("average", "smoothing", "seasonal", "trend")
+DEFAULT_FORECAST_MODEL = "average"
+
+CONFIDENCE_LEVEL = 0.95
+# Two-sided normal quantile for CONFIDENCE_LEVEL
+Z_SCORE = 1.959964
+
+SMOOTHING_ALPHAS = np.linspace(0.05, 0.95, 19)
+
+SAVING_WALLET_TYPES = (WalletType.SAVING_ACCOUNT, WalletType.GOAL)
+
+
+class Forecast(NamedTuple):
+    mean: np.ndarray      # (users, horizon)
+    variance: np.ndarray  # (users, horizon)
+
+
+def fit_forecast(model: str, history: np.ndarray, horizon: int, first_weekday: int = 0) -> Forecast:
+    """
+    Forecast `horizon` days after `history` (users x days) with `model`.
+    `first_weekday` is the weekday (Monday 0) of the first history column.
+    """
+    history = np.atleast_2d(np.asarray(history, dtype=float))
+    if history.shape[1] == 0:
+        empty = np.zeros((history.shape[0], horizon))
+        return Forecast(empty, empty.copy())
+
+    if model == "smoothing":
+        mean, variance = _smoothing(history, horizon)
+    elif model == "seasonal":
+        mean, variance = _seasonal(history, horizon, first_weekday)
+    elif model == "trend":
+        mean, variance = _trend(history, horizon)
+    else:
+        mean, variance = _average(history, horizon)
+
+    return Forecast(np.maximum(mean, 0.0), np.maximum(variance, 0.0))
+
+
+def interval(total: np.ndarray, variance: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Lower and upper CONFIDENCE_LEVEL bounds around `total`."""
+    margin = Z_SCORE * np.sqrt(variance)
+    return np.maximum(total - margin, 0.0), total + margin
+
+
+def history_window(today: date, days: int) -> tuple[date, date]:
+    """The `days` days ending with `today`."""
+    return today - timedelta(days=days - 1), today
+
+
+def load_daily_totals(
+    db: Session,
+    user_ids: list[int],
+    start_date: date,
+    end_date: date,
+    tx_type: TransactionType = TransactionType.EXPENSE,
+) -> np.ndarray:
+    """Daily totals of `tx_type` for each user, as a (users, days) array over [start_date, end_date]."""
+    rows = (
+        db.query(DailyRollup.user_id, DailyRollup.date, func.sum(DailyRollup.total))
+        .filter(
+            DailyRollup.user_id.in_(user_ids),
+            DailyRollup.type == tx_type,
+            DailyRollup.date >= start_date,
+            DailyRollup.date <= end_date,
+        )
+        .group_by(DailyRollup.user_id, DailyRollup.date)
+        .all()
+    )
+    return _to_matrix(rows, user_ids, start_date, end_date)
+
+
+def load_daily_savings(db: Session, user_ids: list[int], start_date: date, end_date: date) -> np.ndarray:
+    """Daily amounts moved into saving and goal wallets, as a (users, days) array."""
+    rows = (
+        db.query(Transaction.user_id, Transaction.transaction_date, func.sum(Transaction.amount))
+        .join(Wallet, Transaction.wallet_id == Wallet.id)
+        .filter(
+            Transaction.user_id.in_(user_ids),
+            Wallet.wallet_type.in_(SAVING_WALLET_TYPES),
+            Transaction.transaction_date >= start_date,
+            Transaction.transaction_date <= end_date,
+        )
+        .group_by(Transaction.user_id, Transaction.transaction_date)
+        .all()
+    )
+    return _to_matrix(rows, user_ids, start_date, end_date)
+
+
+def _to_matrix(rows, user_ids: list[int], start_date: date, end_date: date) -> np.ndarray:
+    matrix = np.zeros((len(user_ids), (end_date - start_date).days + 1))
+    row_of = {user_id: i for i, user_id in enumerate(user_ids)}
+    for user_id, day, amount in rows:
+        matrix[row_of[user_id], (day - start_date).days] += float(amount or 0)
+    return matrix
+
+
+def _average(history: np.ndarray, horizon: int):
+    n = history.shape[1]
+    mean = history.mean(axis=1)
+    variance = history.var(axis=1, ddof=1) * (1 + 1 / n) if n > 1 else np.zeros(len(history))
+    return np.repeat(mean[:, None], horizon, axis=1), np.repeat(variance[:, None], horizon, axis=1)
+
+
+def _smoothing(history: np.ndarray, horizon: int):
+    alphas = SMOOTHING_ALPHAS[:, None]
+    # (alphas, users): every candidate factor for every user in one pass over time
+    level = np.repeat(history[None, :, 0], len(SMOOTHING_ALPHAS), axis=0)
+    sse = np.zeros_like(level)
+    for t in range(1, history.shape[1]):
+        error = history[None, :, t] - level
+        sse += error ** 2
+        level = level + alphas * error
+
+    best = sse.argmin(axis=0)
+    users = np.arange(history.shape[0])
+    alpha = SMOOTHING_ALPHAS[best]
+    sigma2 = sse[best, users] / max(history.shape[1] - 1, 1)
+
+    steps = np.arange(1, horizon + 1)
+    mean = np.repeat(level[best, users][:, None], horizon, axis=1)
+    variance = sigma2[:, None] * (1 + (steps[None, :] - 1) * alpha[:, None] ** 2)
+    return mean, variance
+
+
+def _seasonal(history: np.ndarray, horizon: int, first_weekday: int):
+    n = history.shape[1]
+    weekdays = (first_weekday + np.arange(n)) % 7
+    one_hot = np.eye(7)[weekdays]  # (days, 7)
+    counts = one_hot.sum(axis=0)
+
+    overall = history.mean(axis=1, keepdims=True)
+    sums = history @ one_hot
+    # Weekdays not in the history fall back to the overall mean
+    profile = np.where(counts > 0, sums / np.maximum(counts, 1), overall)
+
+    residuals = history - profile[:, weekdays]
+    dof = max(n - int((counts > 0).sum()), 1)
+    sigma2 = (residuals ** 2).sum(axis=1) / dof
+
+    future = (first_weekday + n + np.arange(horizon)) % 7
+    mean = profile[:, future]
+    variance = sigma2[:, None] * (1 + 1 / np.maximum(counts[future], 1))[None, :]
+    return mean, variance
+
+
+def _trend(history: np.ndarray, horizon: int):
+    n = history.shape[1]
+    if n < 3:
+        return _average(history, horizon)
+
+    t = np.arange(n, dtype=float)
+    t_mean = t.mean()
+    sxx = ((t - t_mean) ** 2).sum()
+    y_mean = history.mean(axis=1)
+    slope = (history - y_mean[:, None]) @ (t - t_mean) / sxx
+    intercept = y_mean - slope * t_mean
+
+    fitted = intercept[:, None] + slope[:, None] * t[None, :]
+    s2 = ((history - fitted) ** 2).sum(axis=1) / (n - 2)
+
+    future = np.arange(n, n + horizon, dtype=float)
+    mean = intercept[:, None] + slope[:, None] * future[None, :]
+    variance = s2[:, None] * (1 + 1 / n + ((future - t_mean) ** 2 / sxx)[None, :])
+    return mean, variance
@@ -1,4 +1,6 @@
 from datetime import date
+import numpy as np
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 
@@ -10,26 +12,46 @@ from app.entities.transaction import Transaction
 from app.utils.enums.transaction_type import TransactionType
 from app.api.analytics.service import (
     get_average_spending_service,
+    get_category_summary_service,
     get_spending_trends_service,
 )
 from app.entities.wallet import Wallet
 from app.utils.enums.wallet_type import WalletType
+from app.services.response_cache import cached_response
+from app.api.analytics.forecast_models import (
+    CONFIDENCE_LEVEL,
+    DEFAULT_FORECAST_MODEL,
+    FORECAST_MODELS,
+    fit_forecast,
+    history_window,
+    interval,
+    load_daily_savings,
+    load_daily_totals,
+)
+
+
+SPENDING_HISTORY_DAYS = 90
+SAVINGS_HISTORY_DAYS = 365
+# Length of a forecast month, as in the analytics reports
+DAYS_PER_MONTH = 30
 
 
 '''
-This function forecasts future savings progress by calculating the users average monthly saving rate from past months and projecting it forward.
+This function forecasts future savings progress by projecting the amount the user saves per month forward from last month's amount.
 
-It assumes:
-- The user saves consistently
-- Past behavior is the best predictor of short-term future behavior
+The projection comes from the chosen model (see forecast_models):
+- average (default): the average monthly saving of past months
+- smoothing / seasonal / trend: fitted to the daily saving series of the past year
 
-* This is a trend-based projection, not a prediction.
+* Every point comes with a confidence band; the band widens the further out it is.
 '''
 
+@cached_response("analytics.forecast_savings")
 def get_savings_forecast_service(
     db: Session,
     current_user: User,
     months_ahead: int = 3,
+    model: str = DEFAULT_FORECAST_MODEL,
 ) -> Dict[str, Any]:
     """
     Forecast future savings based on money accumulated in saving-related wallets.
@@ -37,86 +59,139 @@ def get_savings_forecast_service(
     Counts all transactions (income or transfers) that increase the balance
     of SAVING_ACCOUNT or GOAL wallets.
     """
+    _validate_model(model)
+    return forecast_savings(db, [current_user.id], months_ahead, model)[current_user.id]
+
+
+def forecast_savings(
+    db: Session,
+    user_ids: list[int],
+    months_ahead: int = 3,
+    model: str = DEFAULT_FORECAST_MODEL,
+    today: date | None = None,
+) -> Dict[int, Dict[str, Any]]:
+    """Savings forecast for every user in `user_ids`, fitted in one batch."""
+    today = today or date.today()
 
     monthly_savings = (
         db.query(
-            func.extract("year", Transaction.transaction_date).label("year"),
-            func.extract("month", Transaction.transaction_date).label("month"),
+            Transaction.user_id,
             func.sum(Transaction.amount).label("saved_amount"),
         )
         .join(Wallet, Transaction.wallet_id == Wallet.id)
         .filter(
-            Transaction.user_id == current_user.id,
+            Transaction.user_id.in_(user_ids),
             Wallet.wallet_type.in_([
                 WalletType.SAVING_ACCOUNT,
                 WalletType.GOAL,
             ]),
         )
-        .group_by("year", "month")
-        .order_by("year", "month")
+        .group_by(Transaction.user_id, Transaction.year_month)
+        .order_by(Transaction.user_id, Transaction.year_month)
         .all()
     )
 
-    if len(monthly_savings) < 2:
-        return {
-            "average_monthly_saving": 0.0,
-            "forecast": [],
-            "note": "Not enough historical saving data to generate forecast",
+    monthly_amounts: Dict[int, list] = {user_id: [] for user_id in user_ids}
+    for row in monthly_savings:
+        monthly_amounts[row.user_id].append(float(row.saved_amount or 0))
+
+    horizon = DAYS_PER_MONTH * months_ahead
+    if model != "average":
+        start_date, end_date = history_window(today, SAVINGS_HISTORY_DAYS)
+        history = load_daily_savings(db, user_ids, start_date, end_date)
+        daily = fit_forecast(model, history, horizon, start_date.weekday())
+        # Saved from tomorrow through each future day, and its error variance
+        cumulative_mean = daily.mean.cumsum(axis=1)
+        cumulative_variance = daily.variance.cumsum(axis=1)
+
+    results = {}
+    for row, user_id in enumerate(user_ids):
+        amounts = np.array(monthly_amounts[user_id])
+
+        if len(amounts) < 2:
+            results[user_id] = {
+                "average_monthly_saving": 0.0,
+                "forecast": [],
+                "note": "Not enough historical saving data to generate forecast",
+                "model": model,
+            }
+            continue
+
+        average_monthly_saving = float(amounts.mean())
+        last_month_amount = float(amounts[-1])
+
+        months = np.arange(1, months_ahead + 1)
+        if model == "average":
+            saved = average_monthly_saving * months
+            variance = amounts.var(ddof=1) * (1 + 1 / len(amounts)) * months
+        else:
+            last_day = months * DAYS_PER_MONTH - 1
+            saved = cumulative_mean[row, last_day]
+            variance = cumulative_variance[row, last_day]
+
+        predicted = last_month_amount + saved
+        lower, upper = interval(predicted, variance)
+
+        results[user_id] = {
+            "average_monthly_saving": round(average_monthly_saving, 2),
+            "forecast": [
+                {
+                    "month_offset": int(i),
+                    "predicted_saved_amount": round(float(predicted[k]), 2),
+                    "lower_bound": round(float(lower[k]), 2),
+                    "upper_bound": round(float(upper[k]), 2),
+                }
+                for k, i in enumerate(months)
+            ],
+            "months_ahead": months_ahead,
+            "based_on_months": len(amounts),
+            "model": model,
+            "confidence_level": CONFIDENCE_LEVEL,
         }
 
-    monthly_amounts = [float(row.saved_amount or 0) for row in monthly_savings]
-    average_monthly_saving = sum(monthly_amounts) / len(monthly_amounts)
-
-    last_month_amount = monthly_amounts[-1]
-
-    forecast = []
-    for i in range(1, months_ahead + 1):
-        forecast.append({
-            "month_offset": i,
-            "predicted_saved_amount": round(
-                last_month_amount + average_monthly_saving * i, 2
-            ),
-        })
-
-    return {
-        "average_monthly_saving": round(average_monthly_saving, 2),
-        "forecast": forecast,
-        "months_ahead": months_ahead,
-        "based_on_months": len(monthly_amounts),
-    }
+    return results
 
 
 '''
 This function estimates total spending at the end of the current month using:
 - Spending so far
-- Number of days elapsed
-- Total days in the month
+- A forecast of the remaining days from the chosen model (see forecast_models);
+  the default "average" continues the current month's daily average rate
 
-* It assumes spending continues at the current daily average rate.
+* The forecast comes with a confidence band, never below what is already spent.
 '''
+@cached_response("analytics.forecast_spending")
 def get_end_of_month_spending_forecast_service(
     db: Session,
     current_user: User,
+    model: str = DEFAULT_FORECAST_MODEL,
 ) -> Dict[str, Any]:
     """
-    Forecast the user's total spending for the current month
-    using linear projection based on daily average spending.
+    Forecast the user's total spending for the current month.
     """
+    _validate_model(model)
+    return forecast_month_end_spending(db, [current_user.id], model)[current_user.id]
 
-    today = date.today()
-    start_date = today.replace(day=1)
 
-    spent_so_far = (
-        db.query(func.coalesce(func.sum(Transaction.amount), 0))
-        .filter(
-            Transaction.user_id == current_user.id,
-            Transaction.type == TransactionType.EXPENSE,
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date <= today,
-        )
-        .scalar()
-    )
+def forecast_month_end_spending(
+    db: Session,
+    user_ids: list[int],
+    model: str = DEFAULT_FORECAST_MODEL,
+    today: date | None = None,
+) -> Dict[int, Dict[str, Any]]:
+    """End-of-month spending forecast for every user in `user_ids`, fitted in one batch."""
+    today = today or date.today()
+    start_date, end_date = history_window(today, SPENDING_HISTORY_DAYS)
+    history = load_daily_totals(db, user_ids, start_date, end_date, TransactionType.EXPENSE)
+    return dict(zip(user_ids, spending_forecasts(history, today, model)))
+
 
+def build_spending_forecast(history: np.ndarray, today: date, model: str = DEFAULT_FORECAST_MODEL) -> Dict[str, Any]:
+    """Forecast response for one user from their daily spending over the SPENDING_HISTORY_DAYS ending today."""
+    return spending_forecasts(np.asarray(history)[None, :], today, model)[0]
+
+
+def spending_forecasts(history: np.ndarray, today: date, model: str) -> list[Dict[str, Any]]:
     days_elapsed = max(today.day, 1)
 
     # Compute days in month
@@ -127,17 +202,40 @@ def get_end_of_month_spending_forecast_service(
             today.replace(month=today.month + 1, day=1) - timedelta(days=1)
         ).day
 
-    daily_average = float(spent_so_far) / days_elapsed
-    forecast_total = daily_average * days_in_month
+    spent_so_far = history[:, -days_elapsed:].sum(axis=1)
+    # The average model continues this month's rate; the others learn from the whole history
+    fit_history = history[:, -days_elapsed:] if model == "average" else history
+    first_weekday = (today - timedelta(days=fit_history.shape[1] - 1)).weekday()
+
+    remaining = fit_forecast(model, fit_history, days_in_month - days_elapsed, first_weekday)
+    forecast_total = spent_so_far + remaining.mean.sum(axis=1)
+    lower, upper = interval(forecast_total, remaining.variance.sum(axis=1))
+    lower = np.maximum(lower, spent_so_far)
+
+    return [
+        {
+            "spent_so_far": round(float(spent_so_far[i]), 2),
+            "daily_average_spending": round(float(forecast_total[i]) / days_in_month, 2),
+            "forecast_end_of_month": round(float(forecast_total[i]), 2),
+            "days_elapsed": days_elapsed,
+            "days_in_month": days_in_month,
+            "model": model,
+            "confidence_interval": {
+                "level": CONFIDENCE_LEVEL,
+                "lower": round(float(lower[i]), 2),
+                "upper": round(float(upper[i]), 2),
+            },
+        }
+        for i in range(len(history))
+    ]
 
-    return {
-        "spent_so_far": round(float(spent_so_far), 2),
-        "daily_average_spending": round(daily_average, 2),
-        "forecast_end_of_month": round(forecast_total, 2),
-        "days_elapsed": days_elapsed,
-        "days_in_month": days_in_month,
-        "confidence": "medium",
-    }
+
+def _validate_model(model: str):
+    if model not in FORECAST_MODELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid model. Use one of: {', '.join(FORECAST_MODELS)}",
+        )
 
 
 '''
@@ -145,29 +243,33 @@ This function generates rule-based saving recommendations by comparing:
 - Current month spending
 - Historical averages
 - Net monthly cash flow
+- The end-of-month spending forecast of the chosen model
 
 * It produces actionable insights, not predictions.
 '''
+@cached_response("analytics.forecast_suggestions")
 def get_saving_opportunities_service(
     db: Session,
     current_user: User,
+    model: str = DEFAULT_FORECAST_MODEL,
 ) -> Dict[str, Any]:
     """
     Suggest saving opportunities based on spending patterns and trends.
     """
+    _validate_model(model)
 
     suggestions = []
 
-    # 1. Overspending compared to historical average
+    # 1. Overspending compared to historical average, category by category
+    today = date.today()
     averages = get_average_spending_service(db, current_user, period="month")
-    current_trends = get_spending_trends_service(db, current_user, months=1)
-
-    current_month = current_trends["monthly_summary"][-1]
+    this_month = get_category_summary_service(db, current_user, today.replace(day=1), today)
+    spent_by_category = {item.category_id: item.total_amount for item in this_month.expenses}
 
     for avg in averages:
         if avg["average_monthly_spending"] > 0:
             ratio = (
-                current_month["total_spent"]
+                spent_by_category.get(avg["category_id"], 0.0)
                 / avg["average_monthly_spending"]
             )
 
@@ -181,7 +283,22 @@ def get_saving_opportunities_service(
                     ),
                 })
 
-    # 2. Positive cash flow but no explicit saving
+    # 2. Month on course to cost more than usual, even at the optimistic end of the forecast
+    # The last of the six months is the current one
+    trends = get_spending_trends_service(db, current_user, months=6)
+    current_month = trends["monthly_summary"][-1]
+    usual = _usual_monthly_spending(trends["monthly_summary"][:-1])
+    forecast = get_end_of_month_spending_forecast_service(db, current_user, model=model)
+    if usual > 0 and forecast["confidence_interval"]["lower"] > usual:
+        suggestions.append({
+            "type": "forecast_overspending",
+            "message": (
+                f"At your current pace this month's spending will likely reach "
+                f"{forecast['forecast_end_of_month']:.2f}, above your usual {usual:.2f}."
+            ),
+        })
+
+    # 3. Positive cash flow but no explicit saving
     if current_month["total_income"] > current_month["total_spent"]:
         suggestions.append({
             "type": "saving_potential",
@@ -193,5 +310,16 @@ def get_saving_opportunities_service(
 
     return {
         "suggestions": suggestions,
-        "generated_at": date.today().isoformat(),
-    }
\ No newline at end of file
+        "generated_at": today.isoformat(),
+    }
+
+
+def _usual_monthly_spending(past_months: list[dict]) -> float:
+    """
+    Average spending of the past months that had any. Months without
+    spending (before the user started tracking, or a wallet left unused)
+    would otherwise pull the usual month down and make an ordinary month
+    look like overspending.
+    """
+    active = [month["total_spent"] for month in past_months if month["total_spent"] > 0]
+    return round(sum(active) / len(active), 2) if active else 0.0
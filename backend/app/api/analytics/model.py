@@ -1,5 +1,5 @@
 from datetime import date
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 
 
@@ -28,6 +28,20 @@ class MonthlyComparison(BaseModel):
     percentage_change: float
 
 
+class CategoryMatrixRow(BaseModel):
+    category_id: int
+    category_name: str
+    transaction_type: str
+    # One amount per entry of CategoryMatrix.months
+    amounts: List[float]
+    total: float
+
+
+class CategoryMatrix(BaseModel):
+    months: List[str]
+    rows: List[CategoryMatrixRow]
+
+
 class DateRange(BaseModel):
     start_date: date
     end_date: date
@@ -65,3 +79,45 @@ class SavingsTrendSummary(BaseModel):
     best_month: str
     worst_month: str
     month_over_month_change: float
+
+
+class AmountHistogram(BaseModel):
+    # len(edges) == len(counts) + 1; the last bin includes its upper edge
+    edges: List[float]
+    counts: List[int]
+
+
+class CategoryDistribution(BaseModel):
+    category_id: Optional[int]
+    category_name: Optional[str]
+    count: int
+    min: float
+    max: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    histogram: AmountHistogram
+
+
+class AmountDistribution(BaseModel):
+    transaction_type: str
+    scale: str
+    bins: int
+    categories: List[CategoryDistribution]
+
+
+class UnusualTransaction(BaseModel):
+    transaction_id: int
+    name: str
+    amount: float
+    currency: str
+    transaction_date: date
+    category_id: int
+    category_name: Optional[str]
+    # Standard deviations above the category mean when it was written
+    z_score: float
+    # The category mean and standard deviation z_score was computed from;
+    # None for expenses flagged before these were stored
+    category_mean: Optional[float]
+    category_std: Optional[float]
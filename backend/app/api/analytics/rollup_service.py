@@ -0,0 +1,107 @@
+from decimal import Decimal
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.entities.daily_rollup import DailyRollup
+from app.entities.transaction import Transaction
+from app.entities.wallet import Wallet
+
+'''
+Maintains daily_rollups, the per-day totals the analytics reports read.
+
+A rollup row is keyed by (user, date, category, type, wallet currency) and
+holds the sum and count of the matching transactions. Write paths pass the
+change they made through apply_rollup_deltas in the same database
+transaction as the rows themselves (aggregate_service does this for every
+create / edit / delete), so the table never drifts from `transactions`.
+Increments are single UPDATE statements, so concurrent writers to the same
+day add up instead of overwriting each other. Nothing here commits.
+'''
+
+# (date, category_id, type, currency)
+RollupKey = tuple
+
+
+def apply_rollup_deltas(db: Session, user_id: int, deltas: dict[RollupKey, list]):
+    """Add `[total, count]` (negative to remove) to the rollup row of every key in `deltas`."""
+    added = False
+    emptied = False
+
+    for (day, category_id, tx_type, currency), (total, count) in deltas.items():
+        if not (total or count):
+            continue
+
+        updated = db.execute(
+            update(DailyRollup)
+            .where(
+                DailyRollup.user_id == user_id,
+                DailyRollup.date == day,
+                _category_matches(category_id),
+                DailyRollup.type == tx_type,
+                DailyRollup.currency == currency,
+            )
+            .values(total=DailyRollup.total + total, count=DailyRollup.count + count)
+        ).rowcount
+
+        if updated:
+            emptied = emptied or count < 0
+        elif count > 0:
+            db.add(DailyRollup(
+                user_id=user_id,
+                date=day,
+                category_id=category_id,
+                type=tx_type,
+                currency=currency,
+                total=total,
+                count=count,
+            ))
+            added = True
+
+    if emptied:
+        # Days whose last transaction is gone
+        db.query(DailyRollup).filter(
+            DailyRollup.user_id == user_id,
+            DailyRollup.count <= 0
+        ).delete(synchronize_session=False)
+
+    if added:
+        # A later call in the same unit of work must see these rows
+        db.flush()
+
+
+def remove_wallet_transactions(db: Session, user_id: int, wallet: Wallet):
+    """Take every transaction of `wallet` out of the rollups, e.g. before they are bulk deleted."""
+    apply_rollup_deltas(db, user_id, _wallet_deltas(db, wallet, -1))
+
+
+def add_wallet_transactions(db: Session, user_id: int, wallet: Wallet):
+    """Count every transaction of `wallet` again, e.g. under its new currency."""
+    apply_rollup_deltas(db, user_id, _wallet_deltas(db, wallet, 1))
+
+
+def _wallet_deltas(db: Session, wallet: Wallet, sign: int) -> dict[RollupKey, list]:
+    rows = (
+        db.query(
+            Transaction.transaction_date,
+            Transaction.category_id,
+            Transaction.type,
+            func.sum(Transaction.amount).label("total"),
+            func.count(Transaction.id).label("count"),
+        )
+        .filter(Transaction.wallet_id == wallet.id)
+        .group_by(Transaction.transaction_date, Transaction.category_id, Transaction.type)
+        .all()
+    )
+
+    return {
+        (row.transaction_date, row.category_id, row.type, wallet.currency): [
+            sign * Decimal(str(row.total)), sign * row.count
+        ]
+        for row in rows
+    }
+
+
+def _category_matches(category_id: int | None):
+    if category_id is None:
+        return DailyRollup.category_id.is_(None)
+    return DailyRollup.category_id == category_id
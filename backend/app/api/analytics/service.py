@@ -1,23 +1,43 @@
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from decimal import ROUND_HALF_UP, Decimal
 from typing import List, Dict, Any
 from fastapi import HTTPException
-from sqlalchemy import func
+import numpy as np
+from sqlalchemy import Date, case, cast, func
 from sqlalchemy.orm import Session
 
-from app.entities.transaction import Transaction
+from app.entities.daily_rollup import DailyRollup
 from app.entities.category import Category
 from app.entities.user import User
 from app.entities.monthly_savings_goal import MonthlySavingsGoal as SavingsGoal
 from app.utils.enums.transaction_type import TransactionType
+from app.utils.periods import (
+    GRANULARITIES,
+    months_back,
+    period_ends,
+    period_label,
+    period_starts,
+    year_month,
+)
+from app.services.response_cache import cached_response
 
 from .model import (
     CategorySummary,
     PeriodSummary,
     MonthlyComparison,
+    CategoryMatrix,
+    CategoryMatrixRow,
     DateRange
 )
 
+# Reports read daily_rollups (kept up to date by every transaction write, see
+# rollup_service) rather than aggregating the raw transactions each time.
+
+# Ten years of days
+MAX_TREND_PERIODS = 3660
+SAVINGS_GRANULARITIES = ("month", "quarter", "year")
+
+@cached_response("analytics.category_summary")
 def get_category_summary_service(
         db: Session,
         current_user: User,
@@ -29,49 +49,43 @@ def get_category_summary_service(
         # Validate date range
         DateRange.validate_range(start_date, end_date)
 
-        # Query expenses by category
-        expense_results = (
-            db.query(
-                Category.id,
-                Category.name,
-                Category.type,
-                func.sum(Transaction.amount).label("total_amount"),
-                func.count(Transaction.id).label("transaction_count"),
-            )
-            .join(Transaction, Transaction.category_id == Category.id)
-            .filter(
-                Transaction.user_id == current_user.id,
-                Transaction.type == TransactionType.EXPENSE,
-                Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date
-            )
-            .group_by(Category.id, Category.name, Category.type)
-            .all()
-        )
+        is_expense = DailyRollup.type == TransactionType.EXPENSE
+        is_income = DailyRollup.type == TransactionType.INCOME
 
-        # Query incomes by category
-        income_results = (
+        # Expenses and incomes per category in one scan
+        results = (
             db.query(
                 Category.id,
                 Category.name,
                 Category.type,
-                func.sum(Transaction.amount).label("total_amount"),
-                func.count(Transaction.id).label("transaction_count"),
+                func.sum(case((is_expense, DailyRollup.total), else_=0)).label("expense_amount"),
+                func.sum(case((is_expense, DailyRollup.count), else_=0)).label("expense_count"),
+                func.sum(case((is_income, DailyRollup.total), else_=0)).label("income_amount"),
+                func.sum(case((is_income, DailyRollup.count), else_=0)).label("income_count"),
             )
-            .join(Transaction, Transaction.category_id == Category.id)
+            .join(DailyRollup, DailyRollup.category_id == Category.id)
             .filter(
-                Transaction.user_id == current_user.id,
-                Transaction.type == TransactionType.INCOME,
-                Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date
+                DailyRollup.user_id == current_user.id,
+                DailyRollup.type.in_([TransactionType.EXPENSE, TransactionType.INCOME]),
+                DailyRollup.date >= start_date,
+                DailyRollup.date <= end_date
             )
             .group_by(Category.id, Category.name, Category.type)
             .all()
         )
 
+        expense_results = [
+            (result, result.expense_amount, result.expense_count)
+            for result in results if result.expense_count
+        ]
+        income_results = [
+            (result, result.income_amount, result.income_count)
+            for result in results if result.income_count
+        ]
+
         # Calculate totals
-        total_expenses = sum(float(result.total_amount or 0) for result in expense_results)
-        total_incomes = sum(float(result.total_amount or 0) for result in income_results)
+        total_expenses = sum(float(amount or 0) for _, amount, _ in expense_results)
+        total_incomes = sum(float(amount or 0) for _, amount, _ in income_results)
 
         return PeriodSummary(
             expenses=[
@@ -79,20 +93,20 @@ def get_category_summary_service(
                     category_id=result.id,
                     category_name=result.name,
                     category_type=result.type.value,
-                    total_amount=float(result.total_amount or 0),
-                    transaction_count=result.transaction_count,
+                    total_amount=float(amount or 0),
+                    transaction_count=count,
                 )
-                for result in expense_results
+                for result, amount, count in expense_results
             ],
             incomes=[
                 CategorySummary(
                     category_id=result.id,
                     category_name=result.name,
                     category_type=result.type.value,
-                    total_amount=float(result.total_amount or 0),
-                    transaction_count=result.transaction_count,
+                    total_amount=float(amount or 0),
+                    transaction_count=count,
                 )
-                for result in income_results
+                for result, amount, count in income_results
             ],
             total_expenses=total_expenses,
             total_incomes=total_incomes,
@@ -108,6 +122,7 @@ def get_category_summary_service(
         )
 
 
+@cached_response("analytics.monthly_comparison")
 def get_monthly_comparison_service(
         db: Session,
         current_user: User,
@@ -134,80 +149,32 @@ def get_monthly_comparison_service(
         else:
             previous_date = selected_date.replace(month=selected_date.month - 1)
 
-        # Calculate date ranges for both months
-        def get_month_range(base_date: date):
-            start_date = base_date.replace(day=1)
-            if base_date.month == 12:
-                end_date = base_date.replace(
-                    year=base_date.year + 1, month=1, day=1
-                ) - timedelta(days=1)
-            else:
-                end_date = base_date.replace(month=base_date.month + 1, day=1) - timedelta(
-                    days=1
-                )
-            return start_date, end_date
+        selected_month = year_month(selected_date)
+        in_selected = DailyRollup.year_month == selected_month
 
-        selected_start, selected_end = get_month_range(selected_date)
-        previous_start, previous_end = get_month_range(previous_date)
-
-        # Get selected month data (both income and expense)
-        selected_month_data = (
-            db.query(
-                Category.id,
-                Category.name,
-                Transaction.type,
-                func.sum(Transaction.amount).label("total_amount"),
-            )
-            .join(Transaction, Transaction.category_id == Category.id)
-            .filter(
-                Transaction.user_id == current_user.id,
-                Transaction.transaction_date >= selected_start,
-                Transaction.transaction_date <= selected_end,
-            )
-            .group_by(Category.id, Category.name, Transaction.type)
-            .all()
-        )
-
-        # Get previous month data (both income and expense)
-        previous_month_data = (
+        # Both months, all types, in one scan
+        results = (
             db.query(
                 Category.id,
                 Category.name,
-                Transaction.type,
-                func.sum(Transaction.amount).label("total_amount"),
+                DailyRollup.type,
+                func.sum(case((in_selected, DailyRollup.total), else_=0)).label("selected_amount"),
+                func.sum(case((in_selected, 0), else_=DailyRollup.total)).label("previous_amount"),
             )
-            .join(Transaction, Transaction.category_id == Category.id)
+            .join(DailyRollup, DailyRollup.category_id == Category.id)
             .filter(
-                Transaction.user_id == current_user.id,
-                Transaction.transaction_date >= previous_start,
-                Transaction.transaction_date <= previous_end,
+                DailyRollup.user_id == current_user.id,
+                DailyRollup.year_month.in_([year_month(previous_date), selected_month]),
             )
-            .group_by(Category.id, Category.name, Transaction.type)
+            .group_by(Category.id, Category.name, DailyRollup.type)
             .all()
         )
 
-        # Create dictionaries for easy lookup (separate by type)
-        selected_dict: Dict[Any, Any] = {}
-        for result in selected_month_data:
-            key = (result.id, result.type)
-            selected_dict[key] = (result.name, float(result.total_amount or 0))
-
-        previous_dict: Dict[Any, Any] = {}
-        for result in previous_month_data:
-            key = (result.id, result.type)
-            previous_dict[key] = (result.name, float(result.total_amount or 0))
-
-        # Combine all categories from both months and both types
-        all_category_keys = set(selected_dict.keys()) | set(previous_dict.keys())
-
         comparisons: List[MonthlyComparison] = []
-        for category_key in all_category_keys:
-            category_id, transaction_type = category_key
-            selected_name, selected_amount = selected_dict.get(category_key, ("Unknown", 0))
-            previous_name, previous_amount = previous_dict.get(category_key, ("Unknown", 0))
-
-            # Use the name from whichever record exists
-            category_name = selected_name if selected_name != "Unknown" else previous_name
+        for result in results:
+            category_id, category_name, transaction_type = result.id, result.name, result.type
+            selected_amount = float(result.selected_amount or 0)
+            previous_amount = float(result.previous_amount or 0)
 
             # Calculate difference and percentage change
             difference = selected_amount - previous_amount
@@ -244,14 +211,14 @@ def get_monthly_comparison_service(
         )
 
 
-def get_spending_trends_service(
+@cached_response("analytics.category_matrix")
+def get_category_matrix_service(
         db: Session,
         current_user: User,
         months: int,
-) -> dict:
-    """Get spending trends over multiple months."""
-    from sqlalchemy import extract
-
+        end_month: str | None = None,
+) -> CategoryMatrix:
+    """Amount per category and month for the `months` months ending with `end_month`."""
     try:
         if months < 1 or months > 12:
             raise HTTPException(
@@ -259,95 +226,112 @@ def get_spending_trends_service(
                 detail="Months parameter must be between 1 and 12",
             )
 
-        end_date = date.today()
-        start_date = end_date - timedelta(days=30 * months)
+        if end_month:
+            try:
+                last_month = datetime.strptime(end_month, "%Y-%m").date()
+            except ValueError:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid date format. Use YYYY-MM format (e.g., 2024-01)",
+                )
+        else:
+            last_month = date.today().replace(day=1)
+
+        # Month starts, oldest first
+        periods = []
+        for offset in range(months - 1, -1, -1):
+            index = last_month.year * 12 + last_month.month - 1 - offset
+            periods.append(date(index // 12, index % 12 + 1, 1))
 
-        # Query monthly spending for both income and expense
-        monthly_data = (
+        # Every (category, type, month) cell in one round trip
+        results = (
             db.query(
-                func.extract("year", Transaction.transaction_date).label("year"),
-                func.extract("month", Transaction.transaction_date).label("month"),
-                Transaction.type,
-                func.sum(Transaction.amount).label("total_amount"),
+                Category.id,
+                Category.name,
+                DailyRollup.type,
+                DailyRollup.year_month,
+                func.sum(DailyRollup.total).label("total_amount"),
             )
+            .join(DailyRollup, DailyRollup.category_id == Category.id)
             .filter(
-                Transaction.user_id == current_user.id,
-                Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
-                Transaction.type.in_([TransactionType.INCOME, TransactionType.EXPENSE]),
-                )
-            .group_by("year", "month", Transaction.type)
-            .order_by("year", "month")
+                DailyRollup.user_id == current_user.id,
+                DailyRollup.type.in_([TransactionType.EXPENSE, TransactionType.INCOME]),
+                DailyRollup.year_month >= year_month(periods[0]),
+                DailyRollup.year_month <= year_month(periods[-1]),
+            )
+            .group_by(Category.id, Category.name, DailyRollup.type, DailyRollup.year_month)
             .all()
         )
 
-        # Organize data by month
-        monthly_totals: Dict[str, Dict[str, Any]] = {}
-        for result in monthly_data:
-            key = f"{int(result.year)}-{int(result.month):02d}"
-            if key not in monthly_totals:
-                monthly_totals[key] = {
-                    "year": int(result.year),
-                    "month": int(result.month),
-                    "total_spent": 0.0,
-                    "total_income": 0.0,
-                    "month_name": f"{int(result.year)}-{int(result.month):02d}",
-                    "display_name": datetime(
-                        int(result.year), int(result.month), 1
-                    ).strftime("%b %Y"),
-                }
+        column = {year_month(period): i for i, period in enumerate(periods)}
+        rows: Dict[Any, CategoryMatrixRow] = {}
+        for result in results:
+            key = (result.id, result.type)
+            if key not in rows:
+                rows[key] = CategoryMatrixRow(
+                    category_id=result.id,
+                    category_name=result.name,
+                    transaction_type=result.type.value,
+                    amounts=[0.0] * months,
+                    total=0.0,
+                )
+            row = rows[key]
+            amount = float(result.total_amount or 0)
+            row.amounts[column[result.year_month]] = round(amount, 2)
+            row.total = round(row.total + amount, 2)
+
+        return CategoryMatrix(
+            months=[period.strftime("%Y-%m") for period in periods],
+            rows=sorted(rows.values(), key=lambda row: row.total, reverse=True),
+        )
 
-            if result.type == TransactionType.EXPENSE:
-                monthly_totals[key]["total_spent"] = float(result.total_amount or 0)
-            elif result.type == TransactionType.INCOME:
-                monthly_totals[key]["total_income"] = float(result.total_amount or 0)
-
-        # Fill in missing months with zero values
-        complete_monthly_data = []
-        current = start_date.replace(day=1)
-        while current <= end_date.replace(day=1):
-            month_key = f"{current.year}-{current.month:02d}"
-            existing_month = monthly_totals.get(
-                month_key,
-                {
-                    "year": current.year,
-                    "month": current.month,
-                    "total_spent": 0.0,
-                    "total_income": 0.0,
-                    "month_name": month_key,
-                    "display_name": current.strftime("%b %Y"),
-                },
-            )
-            complete_monthly_data.append(existing_month)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error while generating category matrix: {str(e)}",
+        )
 
-            # Move to next month
-            if current.month == 12:
-                current = current.replace(year=current.year + 1, month=1)
-            else:
-                current = current.replace(month=current.month + 1)
 
-        # Calculate summary statistics
-        total_spent = sum(month["total_spent"] for month in complete_monthly_data)
-        total_income = sum(month["total_income"] for month in complete_monthly_data)
-        average_monthly_spent = (
-            total_spent / len(complete_monthly_data) if complete_monthly_data else 0
+@cached_response("analytics.spending_trends")
+def get_spending_trends_service(
+        db: Session,
+        current_user: User,
+        months: int = 6,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        granularity: str = "month",
+) -> dict:
+    """
+    Get income and spending per period over a date range: `start_date` to
+    `end_date` (today by default) or else the last `months` calendar months.
+    """
+    try:
+        start_date, end_date = trend_window(months, start_date, end_date, granularity)
+
+        # Bucketed in SQL: one row per period and type, whatever the range
+        bucket = _rollup_bucket(db, granularity)
+        period_data = (
+            db.query(
+                bucket.label("period"),
+                DailyRollup.type,
+                func.sum(DailyRollup.total).label("total_amount"),
+            )
+            .filter(
+                DailyRollup.user_id == current_user.id,
+                DailyRollup.date >= start_date,
+                DailyRollup.date <= end_date,
+                DailyRollup.type.in_([TransactionType.INCOME, TransactionType.EXPENSE]),
+            )
+            .group_by(bucket, DailyRollup.type)
+            .all()
         )
 
-        return {
-            "monthly_summary": complete_monthly_data,
-            "summary": {
-                "total_spent": round(total_spent, 2),
-                "total_income": round(total_income, 2),
-                "net_flow": round(total_income - total_spent, 2),
-                "average_monthly_spent": round(average_monthly_spent, 2),
-                "months_analyzed": len(complete_monthly_data),
-            },
-            "analysis_period": {
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat(),
-                "months_analyzed": months,
-            },
-        }
+        return build_spending_trends(
+            [(_bucket_start(row.period, granularity), row.type, row.total_amount) for row in period_data],
+            start_date, end_date, granularity,
+        )
 
     except HTTPException:
         raise
@@ -356,33 +340,145 @@ def get_spending_trends_service(
             status_code=500,
             detail=f"Internal server error while generating spending trends: {str(e)}",
         )
-    
 
-def get_top_categories_current_month_service(db: Session, current_user: User):
-    today = date.today()
-    start_date = today.replace(day=1)
 
-    # Compute end of month
-    if today.month == 12:
-        end_date = date(today.year, 12, 31)
-    else:
-        end_date = date(today.year, today.month + 1, 1) - timedelta(days=1)
+def trend_window(
+        months: int,
+        start_date: date | None,
+        end_date: date | None,
+        granularity: str,
+) -> tuple[date, date]:
+    """Validated [start_date, end_date] of a trends request."""
+    if granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid granularity. Use one of: {', '.join(GRANULARITIES)}",
+        )
+
+    end_date = end_date or date.today()
+    if start_date is None:
+        if months < 1:
+            raise HTTPException(status_code=400, detail="Months parameter must be at least 1")
+        start_date = months_back(end_date, months)
+
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="Start date cannot be after end date")
+
+    if len(period_starts(start_date, end_date, granularity)) > MAX_TREND_PERIODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many periods, at most {MAX_TREND_PERIODS}: use a coarser granularity",
+        )
+
+    return start_date, end_date
+
+
+def build_spending_trends(period_totals, start_date: date, end_date: date, granularity: str = "month") -> dict:
+    """
+    Spending trends response from per-period totals: (period start, type,
+    amount) tuples. Periods without totals are filled in with zeros.
+    """
+    starts = period_starts(start_date, end_date, granularity)
+    ends = period_ends(starts, granularity)
+    position = {start: i for i, start in enumerate(starts.tolist())}
+
+    spent = np.zeros(len(starts))
+    income = np.zeros(len(starts))
+    for start, tx_type, amount in period_totals:
+        if tx_type == TransactionType.EXPENSE:
+            spent[position[start]] += float(amount or 0)
+        elif tx_type == TransactionType.INCOME:
+            income[position[start]] += float(amount or 0)
+
+    periods = []
+    for start, end, period_spent, period_income in zip(starts.tolist(), ends.tolist(), spent.tolist(), income.tolist()):
+        label, display_name = period_label(start, granularity)
+        periods.append({
+            "period_start": start.isoformat(),
+            "period_end": end.isoformat(),
+            "label": label,
+            "year": start.year,
+            "month": start.month,
+            "total_spent": period_spent,
+            "total_income": period_income,
+            # Older clients read the label under this name
+            "month_name": label,
+            "display_name": display_name,
+        })
 
+    # Calculate summary statistics
+    total_spent = float(spent.sum())
+    total_income = float(income.sum())
+    months_analyzed = len(period_starts(start_date, end_date, "month"))
+
+    return {
+        "monthly_summary": periods,
+        "summary": {
+            "total_spent": round(total_spent, 2),
+            "total_income": round(total_income, 2),
+            "net_flow": round(total_income - total_spent, 2),
+            "average_period_spent": round(total_spent / len(periods), 2),
+            "average_monthly_spent": round(total_spent / months_analyzed, 2),
+            "periods_analyzed": len(periods),
+            "months_analyzed": months_analyzed,
+        },
+        "analysis_period": {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "granularity": granularity,
+            "months_analyzed": months_analyzed,
+        },
+    }
+
+
+def _rollup_bucket(db: Session, granularity: str):
+    """
+    SQL expression grouping daily_rollups rows by period. Months, quarters
+    and years are integers derived from the stored year_month (202610,
+    20264, 2026); weeks are the date of their Monday.
+    """
+    if granularity == "day":
+        return DailyRollup.date
+    if granularity == "month":
+        return DailyRollup.year_month
+    if granularity == "quarter":
+        return (DailyRollup.year_month // 100) * 10 + (DailyRollup.year_month % 100 + 2) // 3
+    if granularity == "year":
+        return DailyRollup.year_month // 100
+
+    if db.get_bind().dialect.name == "sqlite":
+        return func.date(DailyRollup.date, "weekday 0", "-6 days", type_=Date)
+    return cast(func.date_trunc("week", DailyRollup.date), Date)
+
+
+def _bucket_start(period, granularity: str) -> date:
+    """First day of the period a _rollup_bucket value stands for."""
+    if granularity in ("day", "week"):
+        return period
+    period = int(period)
+    if granularity == "month":
+        return date(period // 100, period % 100, 1)
+    if granularity == "quarter":
+        return date(period // 10, (period % 10 - 1) * 3 + 1, 1)
+    return date(period, 1, 1)
+
+
+@cached_response("analytics.top_categories")
+def get_top_categories_current_month_service(db: Session, current_user: User):
     results = (
         db.query(
             Category.id,
             Category.name,
-            func.sum(Transaction.amount).label("total_amount")
+            func.sum(DailyRollup.total).label("total_amount")
         )
-        .join(Transaction, Transaction.category_id == Category.id)
+        .join(DailyRollup, DailyRollup.category_id == Category.id)
         .filter(
-            Transaction.user_id == current_user.id,
-            Transaction.type == TransactionType.EXPENSE,
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date <= end_date,
+            DailyRollup.user_id == current_user.id,
+            DailyRollup.type == TransactionType.EXPENSE,
+            DailyRollup.year_month == year_month(date.today()),
         )
         .group_by(Category.id, Category.name)
-        .order_by(func.sum(Transaction.amount).desc())
+        .order_by(func.sum(DailyRollup.total).desc())
         .limit(3)
         .all()
     )
@@ -397,6 +493,7 @@ def get_top_categories_current_month_service(db: Session, current_user: User):
     ]
 
 
+@cached_response("analytics.average_spending")
 def get_average_spending_service(db: Session, current_user: User, period: str):
     try:
         if period not in ("year", "month", "day"):
@@ -410,14 +507,15 @@ def get_average_spending_service(db: Session, current_user: User, period: str):
             db.query(
                 Category.id.label("category_id"),
                 Category.name.label("category_name"),
-                func.coalesce(func.sum(Transaction.amount), 0).label("total_year_spent"),
-                func.count(Transaction.id).label("txn_count")
+                func.coalesce(func.sum(DailyRollup.total), 0).label("total_year_spent"),
+                func.sum(DailyRollup.count).label("txn_count")
             )
-            .join(Transaction, Transaction.category_id == Category.id)
+            .join(DailyRollup, DailyRollup.category_id == Category.id)
             .filter(
-                Transaction.user_id == current_user.id,
-                Transaction.type == TransactionType.EXPENSE,
-                func.extract("year", Transaction.transaction_date) == current_year,
+                DailyRollup.user_id == current_user.id,
+                DailyRollup.type == TransactionType.EXPENSE,
+                DailyRollup.year_month >= current_year * 100 + 1,
+                DailyRollup.year_month <= current_year * 100 + 12,
             )
             .group_by(Category.id, Category.name)
             .all()
@@ -471,85 +569,81 @@ def get_average_spending_service(db: Session, current_user: User, period: str):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@cached_response("analytics.savings_trends")
 def get_savings_trends_service(
     db: Session,
     current_user: User,
-    months: int,
+    months: int = 6,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    granularity: str = "month",
 ):
-    end_date = date.today()
-    start_date = end_date - timedelta(days=30 * months)
+    # Savings goals are set per month, so periods are months or longer
+    if granularity not in SAVINGS_GRANULARITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid granularity. Use one of: {', '.join(SAVINGS_GRANULARITIES)}",
+        )
+    start_date, end_date = trend_window(months, start_date, end_date, granularity)
 
-    start_year = start_date.year
-    start_month = start_date.month
+    goal_month = SavingsGoal.year * 100 + SavingsGoal.month
+    if granularity == "month":
+        bucket = goal_month
+    elif granularity == "quarter":
+        bucket = SavingsGoal.year * 10 + (SavingsGoal.month + 2) // 3
+    else:
+        bucket = SavingsGoal.year
 
     data = (
         db.query(
-            SavingsGoal.year,
-            SavingsGoal.month,
-            SavingsGoal.current_saved,
-            SavingsGoal.target_amount,
+            bucket.label("period"),
+            func.sum(SavingsGoal.current_saved).label("current_saved"),
+            func.sum(SavingsGoal.target_amount).label("target_amount"),
         )
         .filter(
             SavingsGoal.user_id == current_user.id,
-            (
-                (SavingsGoal.year > start_year) |
-                (
-                    (SavingsGoal.year == start_year) &
-                    (SavingsGoal.month >= start_month)
-                )
-            )
+            goal_month >= year_month(start_date),
+            goal_month <= year_month(end_date),
         )
-        .order_by(SavingsGoal.year, SavingsGoal.month)
+        .group_by(bucket)
         .all()
     )
 
-    indexed = {
-        (row.year, row.month): row
-        for row in data
-    }
-
-    monthly_trends = []
-
-    current = start_date.replace(day=1)
-    end_month = end_date.replace(day=1)
+    starts = period_starts(start_date, end_date, granularity)
+    position = {start: i for i, start in enumerate(starts.tolist())}
+    saved = np.zeros(len(starts))
+    target = np.zeros(len(starts))
+    for row in data:
+        i = position[_bucket_start(row.period, granularity)]
+        saved[i] = float(row.current_saved or 0)
+        target[i] = float(row.target_amount or 0)
 
-    while current <= end_month:
-        row = indexed.get((current.year, current.month))
-
-        saved = float(row.current_saved) if row else 0.0
-        target = float(row.target_amount) if row else 0.0
-
-        achievement = (
-            round(saved / target, 2)
-            if target > 0
-            else 0.0
-        )
+    achievement = np.round(np.divide(saved, target, out=np.zeros_like(saved), where=target > 0), 2)
 
+    monthly_trends = []
+    for start, period_saved, period_target, rate in zip(starts.tolist(), saved.tolist(), target.tolist(), achievement.tolist()):
+        label, display_name = period_label(start, granularity)
         monthly_trends.append({
-            "year": current.year,
-            "month": current.month,
-            "display_name": current.strftime("%b %Y"),
-            "saved_amount": saved,
-            "target_amount": target,
-            "achievement_rate": achievement,
+            "label": label,
+            "year": start.year,
+            "month": start.month,
+            "display_name": display_name,
+            "saved_amount": period_saved,
+            "target_amount": period_target,
+            "achievement_rate": rate,
         })
 
-        if current.month == 12:
-            current = current.replace(year=current.year + 1, month=1)
-        else:
-            current = current.replace(month=current.month + 1)
-
     return {
         "monthly_trends": monthly_trends,
-        "months_analyzed": months,
+        "months_analyzed": len(period_starts(start_date, end_date, "month")),
         "analysis_period": {
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
+            "granularity": granularity,
         },
     }
 
 
-
 def _to_float_round(value: Decimal | None, places: int = 2) -> float:
     if value is None:
         return 0.0
@@ -4,11 +4,12 @@ from app.database import get_db
 from app.entities.user import User
 from app.api.budget.model import BudgetResponse, BudgetUpdate
 from app.core.auth import get_current_user
+from app.core.etag import conditional_get
 from app.api.budget import service as budget_service
 
 router = APIRouter()
 
-@router.get("/current", response_model=BudgetResponse)
+@router.get("/current", response_model=BudgetResponse, dependencies=[Depends(conditional_get)])
 def get_current_budget(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -3,6 +3,7 @@ from datetime import date
 from app.entities.budget import Budget
 from app.api.budget.model import BudgetUpdate
 from decimal import Decimal
+from app.utils.concurrency import retry_on_conflict
 
 def get_or_create_current_budget(db: Session, user_id: int) -> Budget:
     today = date.today()
@@ -25,6 +26,7 @@ def get_or_create_current_budget(db: Session, user_id: int) -> Budget:
     return budget
 
 
+@retry_on_conflict
 def update_budget(db: Session, budget: Budget, updates: BudgetUpdate):
     for field, value in updates.dict(exclude_unset=True).items():
         setattr(budget, field, value)
@@ -33,12 +35,34 @@ def update_budget(db: Session, budget: Budget, updates: BudgetUpdate):
     return budget
 
 
-def record_expense(db: Session, user_id: int, amount: float):
-    """Increment spent amounts when an expense transaction is added."""
-    budget = refresh_budget_if_needed(db, user_id)
-    budget.daily_spent += to_decimal(amount)
-    budget.monthly_spent += to_decimal(amount)
-    db.commit()
+def apply_expense_totals(db: Session, user_id: int, daily_amount: Decimal, monthly_amount: Decimal):
+    """
+    Add pre-aggregated expense totals to the current budget in one step.
+    Negative totals undo earlier expenses and never go below zero.
+    The caller owns the commit.
+    """
+    today = date.today()
+    budget = db.query(Budget).filter_by(
+        user_id=user_id,
+        month=today.month,
+        year=today.year
+    ).first()
+
+    if not budget:
+        budget = Budget(
+            user_id=user_id,
+            month=today.month,
+            year=today.year,
+            monthly_spent=to_decimal("0.00"),
+            daily_spent=to_decimal("0.00"),
+            last_updated_date=today,
+        )
+        db.add(budget)
+    else:
+        _reset_stale_counters(budget, today)
+
+    budget.daily_spent = max(Decimal("0.00"), budget.daily_spent + daily_amount)
+    budget.monthly_spent = max(Decimal("0.00"), budget.monthly_spent + monthly_amount)
     return budget
 
 def to_decimal(value):
@@ -46,23 +70,29 @@ def to_decimal(value):
         return value
     return Decimal(str(value))
 
+@retry_on_conflict
 def refresh_budget_if_needed(db: Session, user_id: int):
     """Resets daily/monthly spending if a new day/month has started."""
     today = date.today()
     budget = get_or_create_current_budget(db, user_id)
 
-    if budget.last_updated_date != today:
-        # Reset daily
-        budget.daily_spent = to_decimal("0.00")
-        
-        # Reset monthly if month or year changed
-        if budget.last_updated_date.month != today.month or budget.last_updated_date.year != today.year:
-            budget.monthly_spent = to_decimal("0.00")
-        
-        # Update tracker
-        budget.last_updated_date = today
-        
+    if _reset_stale_counters(budget, today):
         db.commit()
         db.refresh(budget)
 
-    return budget
\ No newline at end of file
+    return budget
+
+def _reset_stale_counters(budget: Budget, today: date) -> bool:
+    if budget.last_updated_date == today:
+        return False
+
+    # Reset daily
+    budget.daily_spent = to_decimal("0.00")
+
+    # Reset monthly if month or year changed
+    if budget.last_updated_date.month != today.month or budget.last_updated_date.year != today.year:
+        budget.monthly_spent = to_decimal("0.00")
+
+    # Update tracker
+    budget.last_updated_date = today
+    return True
\ No newline at end of file
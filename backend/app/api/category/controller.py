@@ -3,13 +3,14 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
 from app.core.auth import get_current_user
+from app.core.etag import conditional_get
 from app.api.category.model import CategoryCreate, CategoryResponse
 from app.utils.enums.transaction_type import TransactionType
 from app.api.category.service import CategoryService
 
 router = APIRouter()
 
-@router.get("/", response_model=List[CategoryResponse])
+@router.get("/", response_model=List[CategoryResponse], dependencies=[Depends(conditional_get)])
 def get_categories(current_user=Depends(get_current_user), db: Session = Depends(get_db)):
     return CategoryService.get_all_categories(db, current_user.id)
 
@@ -6,8 +6,9 @@ from decimal import Decimal
 
 from app.api.category.service import CategoryService
 from app.entities.category_limit import CategoryLimit
-from app.entities.transaction import Transaction
+from app.entities.daily_rollup import DailyRollup
 from app.utils.enums.transaction_type import TransactionType
+from app.utils.periods import year_month
 
 class CategoryLimitService:
 
@@ -49,45 +50,42 @@ class CategoryLimitService:
 
     @staticmethod
     def get_all_category_limits_with_spent(db: Session, user_id: int):
-        today = date.today()
-
-        categories = CategoryService.get_all_categories(db, user_id)
-
-        categories = [cat for cat in categories if cat.type == TransactionType.EXPENSE]
-
-        results = []
-        for cat in categories:
-
-            # total spent in this category for current month
-            total_spent = (
-                db.query(func.sum(Transaction.amount))
-                .filter(
-                    Transaction.category_id == cat.id,
-                    Transaction.user_id == user_id,
-                    func.extract('month', Transaction.transaction_date) == today.month,
-                    func.extract('year', Transaction.transaction_date) == today.year,
-                    Transaction.type == TransactionType.EXPENSE
-                )
-                .scalar()
+        categories = CategoryService.get_categories_by_type(db, user_id, TransactionType.EXPENSE)
+        limits = CategoryLimitService.get_limits(db, user_id)
+
+        # total spent per category for current month
+        spent = dict(
+            db.query(DailyRollup.category_id, func.sum(DailyRollup.total))
+            .filter(
+                DailyRollup.user_id == user_id,
+                DailyRollup.type == TransactionType.EXPENSE,
+                DailyRollup.year_month == year_month(date.today()),
             )
+            .group_by(DailyRollup.category_id)
+            .all()
+        )
 
-            total_spent = total_spent or Decimal("0.00")
+        return CategoryLimitService.build_overview(categories, limits, spent)
 
-            # fetch limit if exists
-            limit = (
-                db.query(CategoryLimit)
-                .filter_by(user_id=user_id, category_id=cat.id)
-                .first()
-            )
+    @staticmethod
+    def get_limits(db: Session, user_id: int) -> dict:
+        """Monthly limit per category id."""
+        return {
+            limit.category_id: limit.monthly_limit
+            for limit in db.query(CategoryLimit).filter_by(user_id=user_id)
+        }
 
-            results.append({
+    @staticmethod
+    def build_overview(categories, limits: dict, spent: dict):
+        """One overview item per category from limits and current-month spending by category id."""
+        return [
+            {
                 "category_id": cat.id,
                 "category_name": cat.name,
                 "category_color": cat.color,
                 "category_icon": cat.icon,
-                "monthly_limit": limit.monthly_limit if limit else Decimal("0.00"),
-                "monthly_spent": total_spent
-            })
-
-        return results
-
+                "monthly_limit": limits.get(cat.id, Decimal("0.00")),
+                "monthly_spent": spent.get(cat.id) or Decimal("0.00"),
+            }
+            for cat in categories
+        ]
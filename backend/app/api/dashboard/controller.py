@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from app.entities.user import User
+from app.core.auth import get_current_user
+from app.core.etag import conditional_get
+from app.api.dashboard.model import DashboardResponse
+from app.api.dashboard import service
+
+router = APIRouter(dependencies=[Depends(conditional_get)])
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(current_user: User = Depends(get_current_user)):
+    """
+    Current summary, total balance, top categories, spending trends,
+    spending forecast and category limits in one round trip.
+    """
+    return await service.get_dashboard(current_user)
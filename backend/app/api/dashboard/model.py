@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from app.api.category_limits.model import CategoryLimitOverviewItem
+from app.api.financial_summary.model import FinancialSummaryResponse
+
+
+class DashboardResponse(BaseModel):
+    financial_summary: FinancialSummaryResponse
+    total_balance: dict
+    top_categories: list[dict]
+    spending_trends: dict
+    spending_forecast: dict
+    category_limits: list[CategoryLimitOverviewItem]
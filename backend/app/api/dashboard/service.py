@@ -0,0 +1,135 @@
+import asyncio
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import DASHBOARD_PARALLEL_LOADS
+from app.database import SessionLocal
+from app.entities.category import Category
+from app.entities.daily_rollup import DailyRollup
+from app.entities.user import User
+from app.utils.enums.transaction_type import TransactionType
+from app.utils.periods import months_back
+from app.api.analytics.service import build_spending_trends
+from app.api.analytics.forecast_models import history_window
+from app.api.analytics.forecasting_service import SPENDING_HISTORY_DAYS, build_spending_forecast
+from app.api.category.service import CategoryService
+from app.api.category_limits.service import CategoryLimitService
+from app.api.financial_summary.service import get_user_current_summary
+from app.api.wallet.service import WalletService
+
+'''
+The home screen in one request.
+
+Top categories, spending trends, the end-of-month forecast and category
+limit usage are all views of the same recent daily rollups, so those rows
+are loaded once and every view is computed from them in memory. The loads
+that do not depend on each other (that slice, the current summary, wallet
+balances, expense categories and limits) run concurrently, each on its own
+session. Every session holds a pooled connection while it runs, so the
+process as a whole never runs more than DASHBOARD_PARALLEL_LOADS of them:
+with the default pool (5 connections plus 10 overflow) one dashboard still
+loads fully in parallel, and several at once queue here instead of
+draining the pool and making unrelated requests wait for a connection.
+'''
+
+DASHBOARD_TREND_MONTHS = 6
+TOP_CATEGORY_COUNT = 3
+
+_load_slots = asyncio.Semaphore(DASHBOARD_PARALLEL_LOADS)
+
+
+async def get_dashboard(user: User) -> dict:
+    today = date.today()
+    month_start = today.replace(day=1)
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+    # Same window as /analytics/spending-trends
+    trend_start = months_back(today, DASHBOARD_TREND_MONTHS)
+    history_start, _ = history_window(today, SPENDING_HISTORY_DAYS)
+
+    summary, total_balance, rollups, categories, limits = await asyncio.gather(
+        _in_session(get_user_current_summary, user),
+        _in_session(WalletService.get_user_total_balance, user),
+        _in_session(_load_rollups, user.id, min(trend_start, month_start, history_start), next_month_start),
+        _in_session(CategoryService.get_categories_by_type, user.id, TransactionType.EXPENSE),
+        _in_session(CategoryLimitService.get_limits, user.id),
+    )
+
+    month_spent = defaultdict(Decimal)
+    category_names = {}
+    daily_spent = np.zeros(SPENDING_HISTORY_DAYS)
+    month_totals = defaultdict(Decimal)
+
+    for row in rollups:
+        if row.type == TransactionType.EXPENSE and row.date >= month_start:
+            month_spent[row.category_id] += row.total
+            category_names[row.category_id] = row.name
+
+        if row.type == TransactionType.EXPENSE and history_start <= row.date <= today:
+            daily_spent[(row.date - history_start).days] += float(row.total)
+
+        if trend_start <= row.date <= today:
+            month_totals[(row.date.replace(day=1), row.type)] += row.total
+
+    top_categories = sorted(
+        (
+            {
+                "category_id": category_id,
+                "category_name": category_names[category_id],
+                "total_amount": float(amount),
+            }
+            # Rows whose category no longer exists are left out, as in the report
+            for category_id, amount in month_spent.items() if category_names[category_id]
+        ),
+        key=lambda item: item["total_amount"],
+        reverse=True,
+    )[:TOP_CATEGORY_COUNT]
+
+    return {
+        "financial_summary": summary,
+        "total_balance": total_balance,
+        "top_categories": top_categories,
+        "spending_trends": build_spending_trends(
+            [(*key, amount) for key, amount in month_totals.items()], trend_start, today
+        ),
+        "spending_forecast": build_spending_forecast(daily_spent, today),
+        "category_limits": CategoryLimitService.build_overview(categories, limits, month_spent),
+    }
+
+
+def _load_rollups(db: Session, user_id: int, start_date: date, end_date: date):
+    """Income and expense rollups in [start_date, end_date), with category names."""
+    return (
+        db.query(
+            DailyRollup.date,
+            DailyRollup.category_id,
+            Category.name,
+            DailyRollup.type,
+            DailyRollup.total,
+        )
+        .outerjoin(Category, Category.id == DailyRollup.category_id)
+        .filter(
+            DailyRollup.user_id == user_id,
+            DailyRollup.type.in_([TransactionType.INCOME, TransactionType.EXPENSE]),
+            DailyRollup.date >= start_date,
+            DailyRollup.date < end_date,
+        )
+        .all()
+    )
+
+
+async def _in_session(func, *args):
+    # Sessions are not thread safe: every concurrent load gets its own
+    async with _load_slots:
+        return await run_in_threadpool(_call_with_session, func, *args)
+
+
+def _call_with_session(func, *args):
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
@@ -4,9 +4,10 @@ from app.database import get_db
 from app.entities.user import User
 from app.api.financial_summary.model import FinancialSummaryResponse
 from app.core.auth import get_current_user
+from app.core.etag import conditional_get
 from app.api.financial_summary.service import get_user_current_summary
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(conditional_get)])
 
 @router.get("/current", response_model=FinancialSummaryResponse)
 def get_current_summary(
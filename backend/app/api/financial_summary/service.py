@@ -3,7 +3,6 @@ from sqlalchemy.orm import Session
 from datetime import date
 from datetime import date
 from sqlalchemy.orm import Session
-from sqlalchemy import extract
 from app.api.financial_summary.model import FinancialSummaryResponse
 from app.entities.financial_summary import FinancialSummary
 from app.entities.transaction import Transaction
@@ -11,56 +10,50 @@ from app.entities.user import User
 from app.entities.wallet import Wallet
 from app.utils.enums.transaction_type import TransactionType
 from app.utils.enums.wallet_type import WalletType
+from app.utils.periods import year_month
 from app.services.currency_service import currency_service
-
-def update_monthly_summary(db: Session, user_id: int, transaction):
-    today = date.today()
-
+from app.utils.concurrency import retry_on_conflict
+from app.api.wallet.lookup_service import get_user_wallet_rows
+from app.services.response_cache import cached_response
+
+def apply_summary_totals(
+    db: Session,
+    user_id: int,
+    year: int,
+    month: int,
+    income: Decimal = Decimal("0"),
+    spent: Decimal = Decimal("0"),
+    saved: Decimal = Decimal("0"),
+):
+    """
+    Add pre-aggregated totals (already in the user's display currency)
+    to one month's summary. Negative totals undo earlier ones and never go
+    below zero. The caller owns the commit.
+    """
     summary = (
         db.query(FinancialSummary)
-        .filter_by(user_id=user_id, month=today.month, year=today.year)
+        .filter_by(user_id=user_id, month=month, year=year)
         .first()
     )
 
     if not summary:
         summary = FinancialSummary(
             user_id=user_id,
-            month=today.month,
-            year=today.year,
+            month=month,
+            year=year,
+            total_income=Decimal("0.00"),
+            total_spent=Decimal("0.00"),
+            total_saved=Decimal("0.00"),
         )
         db.add(summary)
-        db.commit()
-        db.refresh(summary)
-
-    # Get user + wallet
-    wallet = db.query(Wallet).get(transaction.wallet_id)
-    user = wallet.owner
-
-    display_currency = user.default_currency.upper()
 
-    # Convert transaction amount into user's default currency
-    converted_amount = currency_service.convert_amount(
-        transaction.amount,
-        from_currency=wallet.currency,
-        to_currency=display_currency,
-    )
-
-    if transaction.type == TransactionType.INCOME:
-        summary.total_income += converted_amount
-
-    elif transaction.type == TransactionType.EXPENSE:
-        summary.total_spent += converted_amount
-
-    elif transaction.type == TransactionType.TRANSFER:
-        if wallet.wallet_type in (WalletType.SAVING_ACCOUNT, WalletType.GOAL):
-            summary.total_saved += converted_amount
-
-
-    db.commit()
-    db.refresh(summary)
+    summary.total_income = max(Decimal("0.00"), summary.total_income + income)
+    summary.total_spent = max(Decimal("0.00"), summary.total_spent + spent)
+    summary.total_saved = max(Decimal("0.00"), summary.total_saved + saved)
     return summary
 
 
+@retry_on_conflict
 def recalculate_monthly_summary(db: Session, user_id: int):
     today = date.today()
 
@@ -74,12 +67,11 @@ def recalculate_monthly_summary(db: Session, user_id: int):
         return
 
     transactions = (
-        db.query(Transaction)
+        db.query(Transaction, Wallet)
         .join(Wallet, Transaction.wallet_id == Wallet.id)
         .filter(
             Wallet.user_id == user_id,
-            extract('month', Transaction.created_at) == today.month,
-            extract('year', Transaction.created_at) == today.year,
+            Transaction.year_month == year_month(today),
         )
         .all()
     )
@@ -92,9 +84,7 @@ def recalculate_monthly_summary(db: Session, user_id: int):
     user = db.query(User).get(user_id)
     display_currency = user.default_currency.upper()
 
-    for txn in transactions:
-        wallet = db.query(Wallet).get(txn.wallet_id)
-
+    for txn, wallet in transactions:
         converted = currency_service.convert_amount(
             txn.amount,
             from_currency=wallet.currency,
@@ -120,6 +110,8 @@ def recalculate_monthly_summary(db: Session, user_id: int):
     db.refresh(summary)
     return summary
 
+@cached_response("financial_summary.current", user_arg="user")
+@retry_on_conflict
 def get_user_current_summary(db: Session, user: User):
     today = date.today()
 
@@ -144,7 +136,7 @@ def get_user_current_summary(db: Session, user: User):
     display_currency = user.default_currency.upper()
 
     # Determine "base currency": wallet currency or USD fallback
-    wallets = db.query(Wallet).filter(Wallet.user_id == user.id).all()
+    wallets = get_user_wallet_rows(db, user.id)
     base_currency = wallets[0].currency if wallets else "USD"
 
     # Convert totals
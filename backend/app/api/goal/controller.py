@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.entities.user import User
@@ -7,8 +8,9 @@ from app.api.goal.model import (
     GoalCreate, GoalUpdate, GoalResponse
 )
 from app.api.goal.service import (
-    create_goal, get_goals, get_goal, update_goal, delete_goal
+    create_goal, get_goals, get_goal, update_goal, delete_goal, save_goal_image
 )
+from app.services import upload_service
 from app.entities.goal import Goal
 from fastapi import Form, UploadFile, File
 from datetime import date
@@ -35,19 +37,20 @@ class GoalCreateForm:
         )
 
 @router.post("", response_model=GoalResponse)
-def create(
+async def create(
     form: GoalCreateForm = Depends(),
     image: UploadFile | None = File(None),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    goal = create_goal(
-        db=db,
-        user=user,
-        data=form.data,
-        image=image
-    )
-    return goal_to_response(goal)
+    image_url = None
+    if image:
+        image_url = await save_goal_image(upload_service.upload_file_chunks(image))
+
+    def create_and_serialize():
+        return goal_to_response(create_goal(db=db, user=user, data=form.data, image_url=image_url))
+
+    return await run_in_threadpool(create_and_serialize)
 
 
 @router.get("", response_model=list[GoalResponse])
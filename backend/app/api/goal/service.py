@@ -3,25 +3,15 @@ from decimal import Decimal
 from fastapi import HTTPException
 from app.entities.goal import Goal
 from app.entities.wallet import Wallet
-from app.entities.transaction import Transaction
 from app.utils.enums.wallet_type import WalletType
-from app.utils.enums.transaction_type import TransactionType
-from fastapi import UploadFile
-from pathlib import Path
-from uuid import uuid4
-import shutil
-from app.core.file_settings import (
-    GOAL_UPLOAD_DIR,
-    ALLOWED_EXTENSIONS,
-    MAX_FILE_SIZE
-)
-
-
-def create_goal(db: Session, user, data, image: UploadFile | None = None):
-    image_url = None
-    if image:
-        image_url = save_goal_image(user.id, image)
+from typing import AsyncIterator
+from app.services import upload_service
+from app.services import blob_service
+from app.utils.concurrency import retry_on_conflict
 
+
+def create_goal(db: Session, user, data, image_url: str | None = None):
+    """`image_url` comes from save_goal_image, which the caller awaits first."""
     wallet = Wallet(
         name=data.title,
         currency=data.currency,
@@ -43,6 +33,7 @@ def create_goal(db: Session, user, data, image: UploadFile | None = None):
     )
 
     db.add(goal)
+    blob_service.acquire(db, image_url)
     db.commit()
     db.refresh(goal)
     return goal
@@ -59,6 +50,7 @@ def get_goal(db: Session, user, goal_id: int):
     return goal
 
 
+@retry_on_conflict
 def update_goal(db: Session, user, goal_id: int, data):
     goal = get_goal(db, user, goal_id)
 
@@ -74,6 +66,7 @@ def update_goal(db: Session, user, goal_id: int, data):
     return goal
 
 
+@retry_on_conflict
 def delete_goal(db: Session, user, goal_id: int):
     goal = (
         db.query(Goal)
@@ -92,6 +85,8 @@ def delete_goal(db: Session, user, goal_id: int):
 
     # ✅ CASE 1: No money saved → delete freely
     if goal.amount_saved == 0:
+        blob_service.release(db, [goal.image])
+        db.delete(goal)
         db.delete(goal_wallet)
         db.commit()
         return
@@ -116,42 +111,18 @@ def delete_goal(db: Session, user, goal_id: int):
     # Transfer funds
     saving_wallet.balance += goal_wallet.balance
 
+    blob_service.release(db, [goal.image])
+    db.delete(goal)
     db.delete(goal_wallet)
     db.commit()
 
-def update_goal_progress(db: Session, transaction: Transaction):
-    if transaction.type != TransactionType.TRANSFER:
-        return
-
-    wallet = db.query(Wallet).get(transaction.wallet_id)
-
-    if wallet.wallet_type != WalletType.GOAL:
-        return
-
-    goal = db.query(Goal).filter(Goal.wallet_id == wallet.id).first()
+def apply_goal_progress(db: Session, wallet_id: int, amount: Decimal):
+    """Add `amount` (negative to undo) to the goal behind a GOAL wallet. Does not commit."""
+    goal = db.query(Goal).filter(Goal.wallet_id == wallet_id).first()
     if not goal:
         return
 
-    goal.amount_saved += transaction.amount
-    db.commit()
-
-def save_goal_image(user_id: int, file: UploadFile) -> str:
-    ext = Path(file.filename).suffix.lower()
-
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(400, "Invalid image type")
-
-    file.file.seek(0, 2)
-    size = file.file.tell()
-    file.file.seek(0)
-
-    if size > MAX_FILE_SIZE:
-        raise HTTPException(400, "Image too large")
-
-    filename = f"{user_id}_{uuid4()}{ext}"
-    path = GOAL_UPLOAD_DIR / filename
-
-    with open(path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    goal.amount_saved += amount
 
-    return f"/static/goals/{filename}"
+async def save_goal_image(chunks: AsyncIterator[bytes]) -> str:
+    return await upload_service.store_image(chunks)
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.core.auth import get_current_user
+from app.entities.user import User
+from app.api.recurring.model import (
+    RecurringRuleCreate, RecurringRuleUpdate, RecurringRuleResponse
+)
+from app.api.recurring import service
+
+router = APIRouter()
+
+@router.post("/", response_model=RecurringRuleResponse, status_code=status.HTTP_201_CREATED)
+def create_rule(
+    data: RecurringRuleCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create a recurring income or expense, e.g. rent on the 1st of every
+    month. Occurrences already due are created immediately; later ones are
+    created by the scheduler as they fall due.
+    """
+    return service.create_rule(db, current_user.id, data)
+
+@router.get("/", response_model=list[RecurringRuleResponse])
+def list_rules(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return service.get_rules(db, current_user.id)
+
+@router.get("/{rule_id}", response_model=RecurringRuleResponse)
+def get_rule(
+    rule_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return service.get_rule(db, current_user.id, rule_id)
+
+@router.put("/{rule_id}", response_model=RecurringRuleResponse)
+def update_rule(
+    rule_id: int,
+    data: RecurringRuleUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return service.update_rule(db, current_user.id, rule_id, data)
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_rule(
+    rule_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    service.delete_rule(db, current_user.id, rule_id)
+    return
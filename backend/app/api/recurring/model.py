@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+from decimal import Decimal
+from app.utils.enums.transaction_type import TransactionType
+from app.utils.enums.recurrence_frequency import RecurrenceFrequency
+
+class RecurringRuleCreate(BaseModel):
+    name: str
+    amount: Decimal
+    note: Optional[str] = None
+    type: TransactionType
+    wallet_id: int
+    category_id: int
+    frequency: RecurrenceFrequency
+    interval: int = 1
+    start_date: date
+    end_date: Optional[date] = None
+
+class RecurringRuleUpdate(BaseModel):
+    name: Optional[str] = None
+    amount: Optional[Decimal] = None
+    note: Optional[str] = None
+    wallet_id: Optional[int] = None
+    category_id: Optional[int] = None
+    end_date: Optional[date] = None
+    active: Optional[bool] = None
+
+class RecurringRuleResponse(BaseModel):
+    id: int
+    name: str
+    amount: Decimal
+    note: Optional[str] = None
+    type: TransactionType
+    wallet_id: int
+    category_id: int
+    frequency: RecurrenceFrequency
+    interval: int
+    start_date: date
+    end_date: Optional[date] = None
+    occurrence_count: int
+    next_run_date: Optional[date] = None
+    active: bool
+    last_error: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,174 @@
+import calendar
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.entities.recurring_rule import RecurringRule
+from app.entities.transaction import Transaction
+from app.api.transaction.model import TransactionCreate
+from app.api.transaction.bulk_service import create_transactions_bulk
+from app.utils.concurrency import run_with_retry
+from app.utils.enums.recurrence_frequency import RecurrenceFrequency
+
+'''
+Turns due recurring rules into transactions.
+
+Due rules are scanned in id order, RECURRING_BATCH_SIZE at a time. Each
+batch creates its occurrences through the bulk write path (one insert, one
+aggregated balance / budget / summary update per user), advances the rules
+and commits once. A run interrupted by a crash leaves every batch either
+fully applied or not at all, and the unique (rule, date) index on
+transactions means a repeated run can never insert an occurrence twice.
+'''
+
+logger = logging.getLogger(__name__)
+
+RECURRING_BATCH_SIZE = 200
+# Occurrences one rule may catch up on in a single run
+MAX_CATCH_UP = 366
+RECURRING_INTERVAL_SECONDS = 60 * 60
+
+
+def occurrence_date(start: date, frequency: RecurrenceFrequency, interval: int, n: int) -> date:
+    """Date of occurrence number `n` (0 is `start`). Month ends are clamped: Jan 31 -> Feb 28."""
+    step = interval * n
+    if frequency == RecurrenceFrequency.DAILY:
+        return start + timedelta(days=step)
+    if frequency == RecurrenceFrequency.WEEKLY:
+        return start + timedelta(weeks=step)
+    if frequency == RecurrenceFrequency.MONTHLY:
+        return _add_months(start, step)
+    return _add_months(start, 12 * step)
+
+
+def next_run_date(rule: RecurringRule) -> date | None:
+    """Date of the rule's next unmaterialized occurrence, None once past end_date."""
+    upcoming = occurrence_date(rule.start_date, rule.frequency, rule.interval, rule.occurrence_count)
+    if rule.end_date and upcoming > rule.end_date:
+        return None
+    return upcoming
+
+
+def materialize_due(db: Session, today: date | None = None, rule_ids: list[int] | None = None) -> dict:
+    """Create every occurrence due up to `today`, optionally only for `rule_ids`."""
+    today = today or date.today()
+    result = {"rules": 0, "created": 0, "failed": 0}
+    last_id = 0
+
+    while True:
+        query = db.query(RecurringRule.id).filter(
+            RecurringRule.active.is_(True),
+            RecurringRule.next_run_date <= today,
+            RecurringRule.id > last_id
+        )
+        if rule_ids is not None:
+            query = query.filter(RecurringRule.id.in_(rule_ids))
+
+        batch = [rule_id for (rule_id,) in query.order_by(RecurringRule.id).limit(RECURRING_BATCH_SIZE)]
+        if not batch:
+            break
+        last_id = batch[-1]
+
+        created, failed = run_with_retry(db, lambda: _materialize_batch(db, batch, today))
+        result["rules"] += len(batch)
+        result["created"] += created
+        result["failed"] += failed
+
+    return result
+
+
+def run_scheduler() -> dict:
+    """Entry point for the periodic task and for cron: one run on its own session."""
+    db = SessionLocal()
+    try:
+        result = materialize_due(db)
+        if result["rules"]:
+            logger.info("Recurring rules: %s", result)
+        return result
+    finally:
+        db.close()
+
+
+def _materialize_batch(db: Session, rule_ids: list[int], today: date) -> tuple[int, int]:
+    # Re-read inside the unit of work: after a retry some rules may be done
+    rules = db.query(RecurringRule).filter(
+        RecurringRule.id.in_(rule_ids),
+        RecurringRule.active.is_(True),
+        RecurringRule.next_run_date <= today
+    ).all()
+
+    due: dict[int, list[date]] = {}
+    for rule in rules:
+        dates = []
+        n = rule.occurrence_count
+        while len(dates) < MAX_CATCH_UP:
+            when = occurrence_date(rule.start_date, rule.frequency, rule.interval, n)
+            if when > today or (rule.end_date and when > rule.end_date):
+                break
+            dates.append(when)
+            n += 1
+        due[rule.id] = dates
+
+    # Occurrences that already exist are skipped, whatever the counters say
+    existing = set(
+        db.query(Transaction.recurring_rule_id, Transaction.transaction_date).filter(
+            Transaction.recurring_rule_id.in_(due.keys())
+        ).filter(
+            Transaction.transaction_date.in_({d for dates in due.values() for d in dates})
+        ).all()
+    )
+
+    rows_by_user = defaultdict(list)
+    row_attrs: dict[int, dict] = {}
+    # row number -> (rule, occurrence date)
+    row_occurrence: dict[int, tuple[RecurringRule, date]] = {}
+    for rule in rules:
+        for when in due[rule.id]:
+            if (rule.id, when) in existing:
+                continue
+            row_number = len(row_occurrence)
+            row_occurrence[row_number] = (rule, when)
+            row_attrs[row_number] = {"recurring_rule_id": rule.id}
+            rows_by_user[rule.user_id].append((row_number, TransactionCreate(
+                name=rule.name,
+                amount=rule.amount,
+                note=rule.note,
+                type=rule.type,
+                transaction_date=when,
+                wallet_id=rule.wallet_id,
+                category_id=rule.category_id,
+            )))
+
+    created_count = 0
+    failed_count = 0
+    for user_id, rows in rows_by_user.items():
+        created, errors = create_transactions_bulk(db, user_id, rows, row_attrs)
+        created_count += len(created)
+        failed_count += len(errors)
+
+        for error in errors:
+            rule, when = row_occurrence[error["row"]]
+            # Skipped, not retried: a backlog of failed payments would all
+            # land at once when the wallet is topped up
+            rule.last_error = f"{when.isoformat()}: {error['error']}"
+            if error["error"].startswith("Wallet not found"):
+                rule.active = False
+
+    for rule in rules:
+        rule.occurrence_count += len(due[rule.id])
+        rule.next_run_date = next_run_date(rule)
+
+    db.commit()
+    return created_count, failed_count
+
+
+def _add_months(start: date, months: int) -> date:
+    month_index = start.month - 1 + months
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    return start.replace(year=year, month=month, day=min(start.day, calendar.monthrange(year, month)[1]))
+
+
+if __name__ == "__main__":
+    print(run_scheduler())
@@ -0,0 +1,157 @@
+from datetime import date
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+
+from app.entities.category import Category
+from app.entities.recurring_rule import RecurringRule
+from app.entities.transaction import Transaction
+from app.entities.wallet import Wallet
+from app.utils.enums.transaction_type import TransactionType
+from app.api.recurring.model import RecurringRuleCreate, RecurringRuleUpdate
+from app.api.recurring.scheduler_service import materialize_due, next_run_date
+
+
+def create_rule(db: Session, user_id: int, data: RecurringRuleCreate) -> RecurringRule:
+    if data.type == TransactionType.TRANSFER:
+        raise HTTPException(400, "Recurring transfers are not supported")
+
+    _validate_amount(data.amount)
+
+    if data.interval < 1:
+        raise HTTPException(400, "Interval must be at least 1")
+
+    if data.end_date and data.end_date < data.start_date:
+        raise HTTPException(400, "End date cannot be before start date")
+
+    _get_wallet(db, user_id, data.wallet_id)
+    _check_category_type(_get_category(db, user_id, data.category_id), data.type)
+
+    rule = RecurringRule(**data.dict(), user_id=user_id, occurrence_count=0, active=True)
+    rule.next_run_date = next_run_date(rule)
+    db.add(rule)
+    db.commit()
+
+    # Occurrences already due (start date today or earlier) show up right away
+    materialize_due(db, rule_ids=[rule.id])
+    db.refresh(rule)
+    return rule
+
+
+def get_rules(db: Session, user_id: int) -> list[RecurringRule]:
+    return db.query(RecurringRule).filter(
+        RecurringRule.user_id == user_id
+    ).order_by(RecurringRule.id).all()
+
+
+def get_rule(db: Session, user_id: int, rule_id: int) -> RecurringRule:
+    rule = db.query(RecurringRule).filter(
+        RecurringRule.id == rule_id,
+        RecurringRule.user_id == user_id
+    ).first()
+
+    if not rule:
+        raise HTTPException(404, "Recurring rule not found")
+
+    return rule
+
+
+def update_rule(db: Session, user_id: int, rule_id: int, data: RecurringRuleUpdate) -> RecurringRule:
+    """Changes apply to future occurrences; those already created are left as they are."""
+    rule = get_rule(db, user_id, rule_id)
+    changes = data.dict(exclude_unset=True)
+
+    if changes.get("amount") is not None:
+        _validate_amount(changes["amount"])
+
+    if changes.get("wallet_id") is not None:
+        _get_wallet(db, user_id, changes["wallet_id"])
+
+    if changes.get("category_id") is not None:
+        _check_category_type(_get_category(db, user_id, changes["category_id"]), rule.type)
+
+    if changes.get("end_date") and changes["end_date"] < rule.start_date:
+        raise HTTPException(400, "End date cannot be before start date")
+
+    resumed = changes.get("active") and not rule.active
+
+    for field, value in changes.items():
+        if value is not None or field in ("note", "end_date"):
+            setattr(rule, field, value)
+
+    if resumed:
+        rule.last_error = None
+        # Occurrences that fell due while paused are skipped, not back-filled
+        today = date.today()
+        while (upcoming := next_run_date(rule)) and upcoming < today:
+            rule.occurrence_count += 1
+
+    rule.next_run_date = next_run_date(rule)
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+
+def delete_rule(db: Session, user_id: int, rule_id: int):
+    """Stops the schedule. Transactions it already created are kept."""
+    rule = get_rule(db, user_id, rule_id)
+    _detach_transactions(db, [rule.id])
+    db.delete(rule)
+    db.commit()
+
+
+def delete_wallet_rules(db: Session, wallet_id: int):
+    """Remove the rules that pay into / out of a wallet being deleted. Does not commit."""
+    rule_ids = [
+        rule_id for (rule_id,) in
+        db.query(RecurringRule.id).filter(RecurringRule.wallet_id == wallet_id)
+    ]
+    if not rule_ids:
+        return
+
+    _detach_transactions(db, rule_ids)
+    db.query(RecurringRule).filter(
+        RecurringRule.id.in_(rule_ids)
+    ).delete(synchronize_session=False)
+
+
+def _detach_transactions(db: Session, rule_ids: list[int]):
+    # Done explicitly: SQLite does not enforce ON DELETE SET NULL by default,
+    # and a reused rule id would otherwise collide with old occurrences
+    db.query(Transaction).filter(
+        Transaction.recurring_rule_id.in_(rule_ids)
+    ).update({Transaction.recurring_rule_id: None}, synchronize_session=False)
+
+
+def _validate_amount(amount):
+    if amount <= 0:
+        raise HTTPException(400, "Amount must be greater than zero")
+
+
+def _get_wallet(db: Session, user_id: int, wallet_id: int) -> Wallet:
+    wallet = db.query(Wallet).filter(
+        Wallet.id == wallet_id,
+        Wallet.user_id == user_id
+    ).first()
+
+    if not wallet:
+        raise HTTPException(404, "Wallet not found or you don't have permission")
+
+    return wallet
+
+
+def _get_category(db: Session, user_id: int, category_id: int) -> Category:
+    category = db.query(Category).filter(
+        Category.id == category_id,
+        (Category.user_id == user_id) | (Category.user_id.is_(None))
+    ).first()
+
+    if not category:
+        raise HTTPException(404, "Category not found")
+
+    return category
+
+
+def _check_category_type(category: Category, transaction_type: TransactionType):
+    # Otherwise every occurrence would be rejected when it falls due
+    if category.type != transaction_type:
+        raise HTTPException(400, "Category type does not match the transaction type")
@@ -3,6 +3,7 @@ from fastapi import HTTPException
 from typing import List
 
 from app.entities.tag import Tag
+from app.services import search_index
 from app.api.tag.model import TagCreate, TagResponse
 
 def create_tag(db: Session, user_id: int, data: TagCreate) -> TagResponse:
@@ -37,6 +38,13 @@ def delete_tag(db: Session, user_id: int, tag_id: int):
     if not tag:
         raise HTTPException(404, "Tag not found")
 
+    # The tag name is part of each tagged transaction's search document
+    tagged = list(tag.transactions)
+
     db.delete(tag)
+    db.flush()
+    for tx in tagged:
+        db.expire(tx, ["tags"])
+    search_index.index_transactions(db, tagged)
     db.commit()
     return
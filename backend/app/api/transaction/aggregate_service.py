@@ -0,0 +1,177 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.entities.transaction import Transaction
+from app.entities.user import User
+from app.entities.wallet import Wallet
+from app.utils.enums.transaction_type import TransactionType
+from app.utils.enums.wallet_type import WalletType
+from app.api.budget import service as budget_service
+from app.api.financial_summary.service import apply_summary_totals
+from app.api.goal.service import apply_goal_progress
+from app.api.savings_goal.service import apply_saved_total
+from app.api.analytics.rollup_service import apply_rollup_deltas
+from app.api.analytics.anomaly_service import apply_amount_stats
+from app.services.currency_service import currency_service
+
+'''
+Everything a transaction row implies outside of itself: wallet balances,
+the current budget, monthly FinancialSummary and MonthlySavingsGoal rows,
+goal progress, the daily analytics rollups and the per-category amount
+statistics behind unusual-transaction flags.
+
+All write paths (single create, transfer, delete, bulk) go through
+apply_transaction_effects, and edits through apply_transaction_change, so
+the row and its aggregates change together in the caller's database
+transaction. Effects are summed first and written once per wallet / month;
+whatever nets out to zero is not written at all. Nothing here commits.
+'''
+
+TRANSFER_IN_CATEGORY = "Transfer In"
+SAVING_WALLET_TYPES = (WalletType.SAVING_ACCOUNT, WalletType.GOAL)
+
+
+class TransactionSnapshot(NamedTuple):
+    """The fields of a transaction that its effects depend on, as they were before an edit."""
+    amount: Decimal
+    type: TransactionType
+    transaction_date: date
+    wallet_id: int
+    category_id: int
+    category: object
+
+
+def snapshot(tx: Transaction) -> TransactionSnapshot:
+    return TransactionSnapshot(
+        tx.amount, tx.type, tx.transaction_date, tx.wallet_id, tx.category_id, tx.category
+    )
+
+
+def is_inflow(tx: Transaction | TransactionSnapshot) -> bool:
+    """Whether the transaction adds money to its wallet."""
+    if tx.type == TransactionType.TRANSFER:
+        return tx.category is not None and tx.category.name == TRANSFER_IN_CATEGORY
+    return tx.type == TransactionType.INCOME
+
+
+def apply_transaction_effects(
+    db: Session,
+    user_id: int,
+    transactions: list[Transaction],
+    wallets: dict[int, Wallet],
+    reverse: bool = False,
+):
+    """
+    Apply (or, with reverse=True, undo) the effects of `transactions`.
+    `wallets` must contain the wallet of every transaction.
+    """
+    sign = Decimal("-1") if reverse else Decimal("1")
+    _apply(db, user_id, [(tx, sign) for tx in transactions], wallets)
+
+
+def apply_transaction_change(
+    db: Session,
+    user_id: int,
+    before: TransactionSnapshot,
+    after: Transaction,
+    wallets: dict[int, Wallet],
+):
+    """
+    Apply only the difference between `before` and the edited `after`.
+    `wallets` must contain both the old and the new wallet.
+    """
+    _apply(db, user_id, [(before, Decimal("-1")), (after, Decimal("1"))], wallets)
+
+
+def _apply(db: Session, user_id: int, signed: list[tuple], wallets: dict[int, Wallet]):
+    if not signed:
+        return
+
+    today = date.today()
+
+    balance_deltas = defaultdict(Decimal)
+    daily_spent = Decimal("0")
+    monthly_spent = Decimal("0")
+    # (year, month, currency) -> [income, spent, saved]
+    summary_totals = defaultdict(lambda: [Decimal("0"), Decimal("0"), Decimal("0")])
+    # (year, month) -> saved
+    saved_totals = defaultdict(Decimal)
+    # wallet id -> amount added to the goal behind it
+    goal_deltas = defaultdict(Decimal)
+    # (date, category id, type, currency) -> [total, count]
+    rollup_deltas = defaultdict(lambda: [Decimal("0"), 0])
+
+    for tx, sign in signed:
+        wallet = wallets[tx.wallet_id]
+        amount = tx.amount * sign
+        period = (tx.transaction_date.year, tx.transaction_date.month)
+        totals = summary_totals[(*period, wallet.currency)]
+        inflow = is_inflow(tx)
+
+        balance_deltas[wallet.id] += amount if inflow else -amount
+
+        rollup = rollup_deltas[(tx.transaction_date, tx.category_id, tx.type, wallet.currency)]
+        rollup[0] += amount
+        rollup[1] += int(sign)
+
+        if tx.type == TransactionType.INCOME:
+            totals[0] += amount
+        elif tx.type == TransactionType.EXPENSE:
+            totals[1] += amount
+            if period == (today.year, today.month):
+                monthly_spent += amount
+                if tx.transaction_date == today:
+                    daily_spent += amount
+
+        if inflow and wallet.wallet_type in SAVING_WALLET_TYPES:
+            saved_totals[period] += amount
+            if tx.type == TransactionType.TRANSFER:
+                totals[2] += amount
+                if wallet.wallet_type == WalletType.GOAL:
+                    goal_deltas[wallet.id] += amount
+
+    for wallet_id, delta in balance_deltas.items():
+        if not delta:
+            continue
+        wallet = wallets[wallet_id]
+        if wallet.balance + delta < 0:
+            raise HTTPException(400, "Insufficient balance")
+        wallet.balance += delta
+
+    if monthly_spent or daily_spent:
+        budget_service.apply_expense_totals(db, user_id, daily_spent, monthly_spent)
+
+    # Convert once per currency, then write once per month
+    display_currency = db.get(User, user_id).default_currency.upper()
+    monthly_totals = defaultdict(lambda: [Decimal("0"), Decimal("0"), Decimal("0")])
+    for (year, month, currency), values in summary_totals.items():
+        for i, value in enumerate(values):
+            if value:
+                monthly_totals[(year, month)][i] += currency_service.convert_amount(
+                    value, from_currency=currency, to_currency=display_currency
+                )
+
+    for (year, month), (income, spent, saved) in monthly_totals.items():
+        if not (income or spent or saved):
+            continue
+        apply_summary_totals(db, user_id, year, month, income=income, spent=spent, saved=saved)
+
+    for (year, month), amount in saved_totals.items():
+        if not amount:
+            continue
+        apply_saved_total(db, user_id, year, month, amount)
+
+    for wallet_id, amount in goal_deltas.items():
+        if not amount:
+            continue
+        apply_goal_progress(db, wallet_id, amount)
+
+    apply_rollup_deltas(db, user_id, rollup_deltas)
+
+    apply_amount_stats(db, user_id, [
+        (tx, int(sign), wallets[tx.wallet_id].currency) for tx, sign in signed
+    ])
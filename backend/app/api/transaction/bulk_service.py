@@ -0,0 +1,131 @@
+from sqlalchemy.orm import Session
+
+from app.entities.category import Category
+from app.entities.tag import Tag
+from app.entities.transaction import Transaction
+from app.entities.wallet import Wallet
+from app.utils.enums.transaction_type import TransactionType
+from app.api.transaction.model import TransactionCreate
+from app.api.transaction.aggregate_service import apply_transaction_effects
+from app.services import search_index
+
+'''
+Set-based write path for creating many transactions at once.
+
+Wallets, categories and tags are checked with one query each, all rows are
+inserted with a single flush, and the derived aggregates (wallet balances,
+budget counters, monthly summaries and savings goals) are applied once per
+wallet / month through apply_transaction_effects instead of once per row.
+
+Nothing here commits: the caller decides where the transaction boundary is.
+'''
+
+def create_transactions_bulk(
+    db: Session,
+    user_id: int,
+    rows: list[tuple[int, TransactionCreate]],
+    row_attrs: dict[int, dict] | None = None,
+) -> tuple[list[Transaction], list[dict]]:
+    """
+    Validate and insert `rows` (pairs of row number and payload).
+    `row_attrs` optionally maps a row number to extra column values, such
+    as the recurring rule an occurrence belongs to.
+
+    Returns the created transactions and a list of {"row", "error"} dicts for
+    the rows that were rejected. Rows are applied in order, so a balance check
+    sees the effect of earlier rows in the same call.
+    """
+    if not rows:
+        return [], []
+
+    wallets = _load_wallets(db, user_id, {data.wallet_id for _, data in rows})
+    categories = _load_categories(db, user_id, {data.category_id for _, data in rows})
+    tags = _load_tags(db, user_id, {tag_id for _, data in rows for tag_id in data.tags})
+
+    created: list[Transaction] = []
+    errors: list[dict] = []
+    # Running balances for validation; wallets are only touched once at the end
+    balances = {w.id: w.balance for w in wallets.values()}
+
+    for row_number, data in rows:
+        wallet = wallets.get(data.wallet_id)
+        error = _validate_row(data, wallet, categories, balances)
+        if error:
+            errors.append({"row": row_number, "error": error})
+            continue
+
+        if data.type == TransactionType.INCOME:
+            balances[wallet.id] += data.amount
+        else:
+            balances[wallet.id] -= data.amount
+
+        transaction = Transaction(
+            name=data.name,
+            amount=data.amount,
+            note=data.note,
+            type=data.type,
+            transaction_date=data.transaction_date,
+            wallet_id=data.wallet_id,
+            category_id=data.category_id,
+            user_id=user_id,
+            **(row_attrs or {}).get(row_number, {}),
+        )
+        # Unknown tag ids are dropped, same as the single create endpoint
+        transaction.tags = [tags[t] for t in data.tags if t in tags]
+        created.append(transaction)
+
+    if created:
+        db.add_all(created)
+        db.flush()
+        search_index.index_transactions(db, created)
+        apply_transaction_effects(db, user_id, created, wallets)
+
+    return created, errors
+
+
+def _validate_row(data: TransactionCreate, wallet: Wallet | None, categories: dict, balances: dict) -> str | None:
+    if not wallet:
+        return "Wallet not found or you don't have permission"
+
+    if data.category_id not in categories:
+        return "Category not found"
+
+    if data.type == TransactionType.TRANSFER:
+        return "Transfers must be created through /transfer"
+
+    if categories[data.category_id].type != data.type:
+        return "Category type does not match the transaction type"
+
+    if data.amount <= 0:
+        return "Amount must be greater than zero"
+
+    if data.type == TransactionType.EXPENSE and balances[wallet.id] < data.amount:
+        return "Insufficient balance"
+
+    return None
+
+
+def _load_wallets(db: Session, user_id: int, wallet_ids: set[int]) -> dict[int, Wallet]:
+    wallets = db.query(Wallet).filter(
+        Wallet.id.in_(wallet_ids),
+        Wallet.user_id == user_id
+    ).all()
+    return {w.id: w for w in wallets}
+
+
+def _load_categories(db: Session, user_id: int, category_ids: set[int]) -> dict[int, Category]:
+    categories = db.query(Category).filter(
+        Category.id.in_(category_ids),
+        (Category.user_id == user_id) | (Category.user_id.is_(None))
+    ).all()
+    return {c.id: c for c in categories}
+
+
+def _load_tags(db: Session, user_id: int, tag_ids: set[int]) -> dict[int, Tag]:
+    if not tag_ids:
+        return {}
+    tags = db.query(Tag).filter(
+        Tag.id.in_(tag_ids),
+        Tag.user_id == user_id
+    ).all()
+    return {t.id: t for t in tags}
@@ -4,16 +4,22 @@ from datetime import date
 from decimal import Decimal
 from app.utils.enums.transaction_type import TransactionType
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.core.auth import get_current_user
 from app.entities.user import User
 from app.api.transaction.model import (
-    TransactionCreate, TransactionResponse,
+    TransactionCreate, TransactionUpdate, TransactionResponse, TransactionPage, TransactionFilter, ImportResult,
     TransferCreate, TransferResponse, TransferPreviewResponse
 )
 from app.api.transaction import service
+from app.api.transaction import import_service
+from app.api.transaction import export_service
+from fastapi.responses import StreamingResponse
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services import upload_service
 from fastapi import UploadFile, File
 
 router = APIRouter()
@@ -41,47 +47,204 @@ class TransactionCreateForm:
             tags=[int(t) for t in tags.split(",")] if tags else []
         )
 
+class TransactionQueryForm:
+    def __init__(
+        self,
+        start_date: Optional[date] = Query(None),
+        end_date: Optional[date] = Query(None),
+        wallet_id: list[int] = Query([], description="Repeat to match any of several wallets"),
+        category_id: list[int] = Query([], description="Repeat to match any of several categories"),
+        type: list[TransactionType] = Query([], description="Repeat to match any of several types"),
+        min_amount: Optional[Decimal] = Query(None, ge=0),
+        max_amount: Optional[Decimal] = Query(None, ge=0),
+        tag_id: list[int] = Query([], description="Repeat to filter by several tags"),
+        tag_match: str = Query("all", enum=["all", "any"]),
+        sort_by: str = Query("date", enum=["date", "amount"]),
+        order: str = Query("desc", enum=["asc", "desc"]),
+    ):
+        self.data = TransactionFilter(
+            start_date=start_date,
+            end_date=end_date,
+            wallet_ids=wallet_id,
+            category_ids=category_id,
+            types=type,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            tag_ids=tag_id,
+            match_all_tags=tag_match != "any",
+            sort_by=sort_by,
+            descending=order != "asc",
+        )
+
 @router.post("/", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
-def create_transaction(
+async def create_transaction(
     form: TransactionCreateForm = Depends(),
     receipt: UploadFile | None = File(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return service.create_transaction(
+    receipt_url = None
+    if receipt:
+        receipt_url = await service.save_receipt(upload_service.upload_file_chunks(receipt))
+
+    return await run_in_threadpool(
+        service.create_transaction, db, current_user.id, form.data, receipt_url
+    )
+
+@router.put("/{transaction_id}/receipt", response_model=TransactionResponse)
+async def upload_receipt(
+    transaction_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Attach a receipt sent as the raw request body (image/jpeg, image/png or
+    image/gif, not multipart). The body is streamed to disk as it arrives
+    and replaces any previous receipt.
+    """
+    # 404 before any bytes are read
+    await run_in_threadpool(service.get_transaction, db, current_user.id, transaction_id)
+
+    receipt_url = await service.save_receipt(upload_service.request_body_chunks(request))
+
+    return await run_in_threadpool(
+        service.set_receipt, db, current_user.id, transaction_id, receipt_url
+    )
+
+@router.post("/batch", response_model=list[TransactionResponse], status_code=status.HTTP_201_CREATED)
+def create_transactions_batch(
+    items: list[TransactionCreate],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create several transactions at once, e.g. when a client replays
+    expenses queued while offline. All items are stored or none is.
+    """
+    return service.create_transactions_batch(db, current_user.id, items)
+
+
+@router.post("/import", response_model=ImportResult)
+def import_transactions(
+    wallet_id: int = Form(...),
+    category_id: Optional[int] = Form(None),
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Import a CSV or OFX bank export into a wallet.
+    Valid rows are imported, invalid ones are reported with their row number.
+    """
+    return import_service.import_transactions(
         db=db,
         user_id=current_user.id,
-        data=form.data,
-        receipt=receipt
+        file=file,
+        wallet_id=wallet_id,
+        category_id=category_id
+    )
+
+@router.get("/export")
+def export_transactions(
+    format: str = Query("csv", enum=list(export_service.EXPORT_FORMATS)),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    wallet_id: Optional[int] = Query(None),
+    category_id: Optional[int] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download the full transaction history (optionally filtered) as CSV or NDJSON.
+    The file is streamed, so it can be arbitrarily large.
+    """
+    export_service.validate_export(db, current_user.id, format, start_date, end_date, wallet_id)
+
+    return StreamingResponse(
+        export_service.stream_transactions(
+            user_id=current_user.id,
+            fmt=format,
+            start_date=start_date,
+            end_date=end_date,
+            wallet_id=wallet_id,
+            category_id=category_id
+        ),
+        media_type=export_service.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'}
     )
 
-@router.get("/wallet/{wallet_id}", response_model=list[TransactionResponse])
+@router.get("/query", response_model=TransactionPage)
+def query_transactions(
+    filters: TransactionQueryForm = Depends(),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Filter by any mix of date range, wallets, categories, types, amount range
+    and tags in one call. Multiple tags must all match unless tag_match=any.
+    """
+    return service.query_transactions(db, current_user.id, filters.data, limit, cursor)
+
+
+@router.get("/search", response_model=TransactionPage)
+def search_transactions(
+    q: str = Query(..., min_length=1, description="Words to look for in name, note and tags"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return service.search_transactions(db, current_user.id, q, limit, cursor)
+
+
+@router.get("/wallet/{wallet_id}", response_model=TransactionPage)
 def get_wallet_transactions(
     wallet_id: int,
-    limit: int = Query(10, ge=1, le=100),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return service.get_wallet_transactions(db, current_user.id, wallet_id, limit)
+    return service.get_wallet_transactions(db, current_user.id, wallet_id, limit, cursor)
 
 
-@router.get("/filter/by-tag/{tag_id}", response_model=list[TransactionResponse])
+@router.get("/filter/by-tag/{tag_id}", response_model=TransactionPage)
 def get_transactions_by_tag(
     tag_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return service.get_transactions_by_tag(db, current_user.id, tag_id)
+    return service.get_transactions_by_tag(db, current_user.id, tag_id, limit, cursor)
 
 
-@router.get("/", response_model=list[TransactionResponse])
+@router.get("/", response_model=TransactionPage)
 def get_user_transactions(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return service.get_user_transactions(db, current_user.id)
+    return service.get_user_transactions(db, current_user.id, limit, cursor)
 
 
+@router.put("/{transaction_id}", response_model=TransactionResponse)
+def update_transaction(
+    transaction_id: int,
+    data: TransactionUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Edit a transaction. Send only the fields to change; balances, budget,
+    monthly summary and savings are adjusted by the difference.
+    """
+    return service.update_transaction(db, current_user.id, transaction_id, data)
+
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_transaction(
     transaction_id: int,
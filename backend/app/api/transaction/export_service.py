@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterator
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from app.database import SessionLocal
+from app.entities.transaction import Transaction
+from app.entities.wallet import Wallet
+
+'''
+Streams a user's transaction history as CSV or NDJSON.
+
+Rows are pulled from a server-side cursor EXPORT_CHUNK_SIZE at a time and
+written out as they arrive, so memory stays flat whatever the history size.
+The generator opens its own session: the request session may already be
+closed by the time the response body is being sent.
+'''
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_COLUMNS = [
+    "id", "transaction_date", "name", "amount", "type", "wallet_id",
+    "category_id", "note", "tags", "receipt_url", "created_at",
+]
+
+
+def validate_export(
+    db: Session,
+    user_id: int,
+    fmt: str,
+    start_date: date | None,
+    end_date: date | None,
+    wallet_id: int | None,
+):
+    """Runs before the response starts so errors still produce a proper status code."""
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(400, "Invalid format. Use 'csv' or 'ndjson'")
+
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(400, "Start date cannot be after end date")
+
+    if wallet_id is not None:
+        wallet = db.query(Wallet).filter(
+            Wallet.id == wallet_id,
+            Wallet.user_id == user_id
+        ).first()
+        if not wallet:
+            raise HTTPException(404, "Wallet not found or forbidden")
+
+
+def stream_transactions(
+    user_id: int,
+    fmt: str,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    wallet_id: int | None = None,
+    category_id: int | None = None,
+) -> Iterator[str]:
+    db = SessionLocal()
+    try:
+        stmt = select(Transaction).where(Transaction.user_id == user_id)
+
+        if start_date:
+            stmt = stmt.where(Transaction.transaction_date >= start_date)
+        if end_date:
+            stmt = stmt.where(Transaction.transaction_date <= end_date)
+        if wallet_id is not None:
+            stmt = stmt.where(Transaction.wallet_id == wallet_id)
+        if category_id is not None:
+            stmt = stmt.where(Transaction.category_id == category_id)
+
+        stmt = (
+            stmt.options(selectinload(Transaction.tags))
+            .order_by(Transaction.transaction_date, Transaction.id)
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        rows = db.execute(stmt).scalars()
+
+        if fmt == "csv":
+            yield from _csv_chunks(rows)
+        else:
+            yield from _ndjson_chunks(rows)
+    finally:
+        db.close()
+
+
+def _row(tx: Transaction) -> dict:
+    return {
+        "id": tx.id,
+        "transaction_date": tx.transaction_date.isoformat(),
+        "name": tx.name,
+        "amount": str(tx.amount),
+        "type": tx.type.value,
+        "wallet_id": tx.wallet_id,
+        "category_id": tx.category_id,
+        "note": tx.note,
+        "tags": [t.name for t in tx.tags],
+        "receipt_url": tx.receipt_url,
+        "created_at": tx.created_at.isoformat() if tx.created_at else None,
+    }
+
+
+def _csv_chunks(rows) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+
+    for i, tx in enumerate(rows, start=1):
+        row = _row(tx)
+        row["tags"] = ";".join(row["tags"])
+        writer.writerow([row[col] for col in EXPORT_COLUMNS])
+
+        if i % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def _ndjson_chunks(rows) -> Iterator[str]:
+    lines = []
+    for tx in rows:
+        lines.append(json.dumps(_row(tx)) + "\n")
+
+        if len(lines) >= EXPORT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines.clear()
+
+    if lines:
+        yield "".join(lines)
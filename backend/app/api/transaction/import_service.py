@@ -0,0 +1,267 @@
+import csv
+import io
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Iterator
+from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.entities.category import Category
+from app.entities.tag import Tag
+from app.entities.wallet import Wallet
+from app.utils.enums.transaction_type import TransactionType
+from app.api.transaction.model import TransactionCreate
+from app.api.transaction.bulk_service import create_transactions_bulk
+from app.utils.concurrency import run_with_retry
+
+'''
+Imports a bank export (CSV or OFX) into one wallet.
+
+The upload is parsed lazily row by row, validated and inserted in batches of
+IMPORT_BATCH_SIZE through the bulk write path, and committed once per batch.
+Memory use is bounded by the batch size, not by the file size. Rows that
+fail to parse or validate are skipped and reported back with their row number.
+If the file itself turns out to be unreadable part-way through (bad encoding,
+broken CSV quoting), the rows read so far are still imported and the result
+says where and why the import stopped; only when nothing was imported is
+that a 400.
+
+CSV columns: transaction_date, name, amount (required) and type, category_id,
+note, tags (optional; tags are tag names separated by ";"). Without a type
+column the sign of the amount decides: negative is an expense.
+'''
+
+IMPORT_BATCH_SIZE = 500
+MAX_NAME_LENGTH = 30
+
+_OFX_CHUNK_SIZE = 64 * 1024
+_OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def import_transactions(
+    db: Session,
+    user_id: int,
+    file: UploadFile,
+    wallet_id: int,
+    category_id: int | None = None,
+):
+    wallet = db.query(Wallet).filter(
+        Wallet.id == wallet_id,
+        Wallet.user_id == user_id
+    ).first()
+
+    if not wallet:
+        raise HTTPException(404, "Wallet not found or you don't have permission")
+
+    ext = Path(file.filename or "").suffix.lower()
+    if ext == ".csv":
+        records = _parse_csv
+    elif ext in (".ofx", ".qfx"):
+        records = _parse_ofx
+    else:
+        raise HTTPException(400, "Unsupported file type, expected .csv or .ofx")
+
+    fallback_categories = _fallback_categories(db)
+    tag_ids = {
+        t.name.lower(): t.id
+        for t in db.query(Tag).filter(Tag.user_id == user_id).all()
+    }
+
+    imported = 0
+    errors: list[dict] = []
+    stopped: str | None = None
+    last_row = 0
+    batch: list[tuple[int, TransactionCreate]] = []
+
+    def commit_batch():
+        result = create_transactions_bulk(db, user_id, batch)
+        db.commit()
+        return result
+
+    def flush_batch():
+        nonlocal imported
+        created, batch_errors = run_with_retry(db, commit_batch)
+        imported += len(created)
+        errors.extend(batch_errors)
+        batch.clear()
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        for row_number, record in records(stream):
+            last_row = row_number
+            try:
+                data = _to_transaction(record, wallet_id, category_id, fallback_categories, tag_ids)
+            except (ValueError, ArithmeticError, ValidationError) as e:
+                errors.append({"row": row_number, "error": _error_message(e)})
+                continue
+
+            batch.append((row_number, data))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                flush_batch()
+
+    except UnicodeDecodeError:
+        stopped = "File must be UTF-8 encoded"
+    except csv.Error as e:
+        stopped = f"Malformed CSV: {e}"
+    finally:
+        stream.detach()
+
+    # Rows read before the file broke off are imported all the same
+    if batch:
+        flush_batch()
+
+    if stopped:
+        if not imported:
+            raise HTTPException(400, stopped)
+        stopped = f"{stopped}; import stopped after row {last_row}"
+
+    errors.sort(key=lambda e: e["row"])
+    return {
+        "imported": imported,
+        "failed": len(errors),
+        "errors": errors,
+        "error": stopped,
+    }
+
+
+def _parse_csv(stream) -> Iterator[tuple[int, dict]]:
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames:
+        return
+
+    missing = {"transaction_date", "name", "amount"} - {f.strip() for f in reader.fieldnames}
+    if missing:
+        raise HTTPException(400, f"Missing CSV columns: {', '.join(sorted(missing))}")
+
+    # Header is line 1, so data rows start at 2
+    for row_number, row in enumerate(reader, start=2):
+        yield row_number, {
+            (k or "").strip(): (v or "").strip()
+            for k, v in row.items()
+        }
+
+
+def _parse_ofx(stream) -> Iterator[tuple[int, dict]]:
+    """
+    Streams <STMTTRN> blocks out of an OFX file (SGML v1 or XML v2).
+    Rows are numbered by their position among the statement transactions.
+    """
+    current = None
+    row_number = 0
+
+    for closing, tag, value in _ofx_tokens(stream):
+        tag = tag.upper()
+        if tag == "STMTTRN":
+            if closing and current is not None:
+                row_number += 1
+                yield row_number, _ofx_record(current)
+                current = None
+            elif not closing:
+                current = {}
+        elif current is not None and not closing:
+            current[tag] = value.strip()
+
+
+def _ofx_tokens(stream) -> Iterator[tuple[bool, str, str]]:
+    buffer = ""
+    while True:
+        chunk = stream.read(_OFX_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+
+        # The element starting at the last "<" may continue in the next chunk
+        cut = buffer.rfind("<")
+        for match in _OFX_TOKEN.finditer(buffer, 0, cut):
+            yield match.group(1) == "/", match.group(2), match.group(3)
+        buffer = buffer[cut:] if cut >= 0 else ""
+
+    for match in _OFX_TOKEN.finditer(buffer):
+        yield match.group(1) == "/", match.group(2), match.group(3)
+
+
+def _ofx_record(fields: dict) -> dict:
+    posted = fields.get("DTPOSTED", "")[:8]
+    return {
+        "transaction_date": f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}" if len(posted) == 8 else posted,
+        "name": fields.get("NAME") or fields.get("MEMO") or fields.get("TRNTYPE", ""),
+        "amount": fields.get("TRNAMT", ""),
+        "note": fields.get("MEMO"),
+    }
+
+
+def _to_transaction(
+    record: dict,
+    wallet_id: int,
+    category_id: int | None,
+    fallback_categories: dict,
+    tag_ids: dict,
+) -> TransactionCreate:
+    try:
+        amount = Decimal(record.get("amount", "").replace(",", ""))
+    except InvalidOperation:
+        raise ValueError("Invalid amount")
+    if not amount.is_finite():
+        raise ValueError("Invalid amount")
+
+    raw_type = (record.get("type") or "").lower()
+    if raw_type:
+        tx_type = TransactionType(raw_type)
+    else:
+        tx_type = TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME
+
+    raw_category = record.get("category_id")
+    if raw_category:
+        row_category = int(raw_category)
+    elif category_id is not None:
+        row_category = category_id
+    else:
+        row_category = fallback_categories.get(tx_type)
+
+    tags = []
+    for name in filter(None, (t.strip() for t in (record.get("tags") or "").split(";"))):
+        if name.lower() not in tag_ids:
+            raise ValueError(f"Unknown tag '{name}'")
+        tags.append(tag_ids[name.lower()])
+
+    return TransactionCreate(
+        name=(record.get("name") or "")[:MAX_NAME_LENGTH],
+        amount=abs(amount),
+        note=record.get("note") or None,
+        type=tx_type,
+        transaction_date=_parse_date(record.get("transaction_date", "")),
+        wallet_id=wallet_id,
+        category_id=row_category,
+        tags=tags,
+    )
+
+
+def _parse_date(value: str) -> date:
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date '{value}'")
+
+
+def _fallback_categories(db: Session) -> dict:
+    """System "Others" categories, used when neither the row nor the request names one."""
+    categories = db.query(Category).filter(
+        Category.name == "Others",
+        Category.user_id.is_(None)
+    ).all()
+    return {c.type: c.id for c in categories}
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        first = error.errors()[0]
+        field = ".".join(str(p) for p in first["loc"])
+        return f"{field}: {first['msg']}" if field else first["msg"]
+    if isinstance(error, ArithmeticError):
+        return "Invalid number"
+    return str(error)
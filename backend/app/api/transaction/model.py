@@ -17,6 +17,16 @@ class TransactionCreate(TransactionBase):
     tags: list[int] = []
     pass
 
+class TransactionUpdate(BaseModel):
+    name: Optional[str] = None
+    amount: Optional[Decimal] = None
+    note: Optional[str] = None
+    type: Optional[TransactionType] = None
+    transaction_date: Optional[date] = None
+    wallet_id: Optional[int] = None
+    category_id: Optional[int] = None
+    tags: Optional[list[int]] = None
+
 class TransactionResponse(TransactionBase):
     id: int
     user_id: int
@@ -27,6 +37,34 @@ class TransactionResponse(TransactionBase):
     class Config:
         from_attributes = True
 
+class TransactionPage(BaseModel):
+    items: list[TransactionResponse]
+    next_cursor: Optional[str] = None
+
+class TransactionFilter(BaseModel):
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    wallet_ids: list[int] = []
+    category_ids: list[int] = []
+    types: list[TransactionType] = []
+    min_amount: Optional[Decimal] = None
+    max_amount: Optional[Decimal] = None
+    tag_ids: list[int] = []
+    match_all_tags: bool = True
+    sort_by: str = "date"
+    descending: bool = True
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[ImportRowError]
+    # Why the file could not be read to the end, if it could not
+    error: Optional[str] = None
+
 class TransferCreate(BaseModel):
     source_wallet_id: int
     destination_wallet_id: int
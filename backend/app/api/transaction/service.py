@@ -1,50 +1,50 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session, Query, selectinload
 from fastapi import HTTPException
 from datetime import date
 from decimal import Decimal
-from app.api.transaction.model import TransactionResponse
-from app.entities.tag import Tag
+from app.api.transaction.model import (
+    TransactionCreate,
+    TransactionUpdate,
+    TransactionResponse,
+    TransactionPage,
+    TransactionFilter
+)
+from app.entities.tag import Tag, TransactionTag
 from app.entities.transaction import Transaction
 from app.entities.wallet import Wallet
 from app.entities.category import Category
 from app.utils.enums.transaction_type import TransactionType
-from app.api.budget import service as budget_service
-from app.api.financial_summary.service import update_monthly_summary
 from app.services.currency_service import currency_service
-from fastapi import UploadFile
-from app.core.file_settings import (
-    TRANSACTION_UPLOAD_DIR,
-    ALLOWED_EXTENSIONS,
-    MAX_FILE_SIZE
+from typing import AsyncIterator
+from app.api.transaction.aggregate_service import (
+    apply_transaction_effects,
+    apply_transaction_change,
+    snapshot
+)
+from app.api.transaction.bulk_service import create_transactions_bulk
+from app.services import search_index
+from app.services import upload_service
+from app.services import blob_service
+from app.utils.concurrency import retry_on_conflict
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    encode_cursor,
+    decode_cursor,
+    encode_offset,
+    decode_offset
 )
-from uuid import uuid4
-from pathlib import Path
-import shutil
-from app.api.goal.service import update_goal_progress
-from app.api.savings_goal.service import record_savings
-
-def save_receipt(user_id: int, file: UploadFile) -> str:
-    ext = Path(file.filename).suffix.lower()
-
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(400, "Invalid file type")
-
-    file.file.seek(0, 2)
-    size = file.file.tell()
-    file.file.seek(0)
-
-    if size > MAX_FILE_SIZE:
-        raise HTTPException(400, "File too large")
 
-    filename = f"{user_id}_{uuid4()}{ext}"
-    path = TRANSACTION_UPLOAD_DIR / filename
+MAX_BATCH_SIZE = 500
 
-    with open(path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+CATEGORY_TYPE_MISMATCH = "Category type does not match the transaction type"
 
-    return f"/static/receipts/{filename}"
+async def save_receipt(chunks: AsyncIterator[bytes]) -> str:
+    return await upload_service.store_image(chunks)
 
-def create_transaction(db: Session, user_id: int, data, receipt: UploadFile | None = None):
+@retry_on_conflict
+def create_transaction(db: Session, user_id: int, data, receipt_url: str | None = None):
+    """`receipt_url` comes from save_receipt, which the caller awaits first."""
     wallet = db.query(Wallet).filter(
         Wallet.id == data.wallet_id,
         Wallet.user_id == user_id
@@ -60,9 +60,11 @@ def create_transaction(db: Session, user_id: int, data, receipt: UploadFile | No
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
 
-    receipt_url = None
-    if receipt:
-        receipt_url = save_receipt(user_id, receipt)
+    if category.type != data.type:
+        raise HTTPException(400, CATEGORY_TYPE_MISMATCH)
+
+    if data.type != TransactionType.INCOME and wallet.balance < data.amount:
+        raise HTTPException(400, "Insufficient balance")
 
     transaction = Transaction(
         name=data.name,
@@ -71,25 +73,11 @@ def create_transaction(db: Session, user_id: int, data, receipt: UploadFile | No
         type=data.type,
         transaction_date=data.transaction_date,
         wallet_id=data.wallet_id,
-        category_id=data.category_id,
+        category=category,
         user_id=user_id,
         receipt_url=receipt_url
     )
 
-    # Update wallet balance
-    if data.type == TransactionType.INCOME:
-        wallet.balance += data.amount
-    else:  # EXPENSE
-        if wallet.balance < data.amount:
-            raise HTTPException(400, "Insufficient balance")
-        wallet.balance -= data.amount
-
-        budget_service.record_expense(
-            db=db,
-            user_id=user_id,
-            amount=float(data.amount)
-        )
-
     # Convert tag IDs → Tag ORM instances
     if data.tags:
         tag_objects = db.query(Tag).filter(
@@ -98,16 +86,53 @@ def create_transaction(db: Session, user_id: int, data, receipt: UploadFile | No
         ).all()
         transaction.tags = tag_objects
 
+    # Row, search entry, balance and aggregates are committed together
     db.add(transaction)
+    db.flush()
+    search_index.index_transactions(db, [transaction])
+    apply_transaction_effects(db, user_id, [transaction], {wallet.id: wallet})
+    blob_service.acquire(db, receipt_url)
     db.commit()
     db.refresh(transaction)
 
-    update_monthly_summary(db, user_id, transaction)
-    record_savings(db, transaction)
-
     return _serialize_transaction(transaction)
 
-def get_wallet_transactions(db: Session, user_id: int, wallet_id: int, limit: int):
+@retry_on_conflict
+def create_transactions_batch(db: Session, user_id: int, items: list[TransactionCreate]):
+    """
+    Create many transactions in one database transaction.
+    Either every item is stored or, if any item is invalid, none is.
+    """
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(400, f"A batch can contain at most {MAX_BATCH_SIZE} transactions")
+
+    created, errors = create_transactions_bulk(db, user_id, list(enumerate(items)))
+
+    if errors:
+        db.rollback()
+        raise HTTPException(400, detail={"errors": errors})
+
+    db.commit()
+
+    # Reload in one query instead of refreshing each expired row
+    ids = [tx.id for tx in created]
+    by_id = {
+        tx.id: tx
+        for tx in db.query(Transaction)
+        .options(selectinload(Transaction.tags))
+        .filter(Transaction.id.in_(ids))
+        .all()
+    }
+
+    return _serialize_transactions([by_id[i] for i in ids])
+
+def get_wallet_transactions(
+    db: Session,
+    user_id: int,
+    wallet_id: int,
+    limit: int,
+    cursor: str | None = None
+) -> TransactionPage:
     wallet = db.query(Wallet).filter(
         Wallet.id == wallet_id,
         Wallet.user_id == user_id
@@ -116,25 +141,27 @@ def get_wallet_transactions(db: Session, user_id: int, wallet_id: int, limit: in
     if not wallet:
         raise HTTPException(404, "Wallet not found or forbidden")
 
-    txs = db.query(Transaction).filter(
+    query = db.query(Transaction).filter(
         Transaction.wallet_id == wallet_id
-    ).order_by(
-        Transaction.transaction_date.desc(),
-        Transaction.id.desc()
-    ).limit(limit).all()
+    )
 
-    return _serialize_transactions(txs)
+    return _paginate(query, limit, cursor)
 
 
-def get_user_transactions(db: Session, user_id: int):
-    txs = db.query(Transaction).filter(
+def get_user_transactions(
+    db: Session,
+    user_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None
+) -> TransactionPage:
+    query = db.query(Transaction).filter(
         Transaction.user_id == user_id
-    ).order_by(Transaction.transaction_date.desc()).all()
+    )
 
-    return _serialize_transactions(txs)
+    return _paginate(query, limit, cursor)
 
 
-def delete_transaction(db: Session, user_id: int, transaction_id: int):
+def get_transaction(db: Session, user_id: int, transaction_id: int) -> Transaction:
     transaction = db.query(Transaction).filter(
         Transaction.id == transaction_id,
         Transaction.user_id == user_id
@@ -143,6 +170,97 @@ def delete_transaction(db: Session, user_id: int, transaction_id: int):
     if not transaction:
         raise HTTPException(404, "Transaction not found")
 
+    return transaction
+
+
+def set_receipt(db: Session, user_id: int, transaction_id: int, receipt_url: str):
+    """Point the transaction at a newly saved receipt and drop the one it replaces."""
+    transaction = get_transaction(db, user_id, transaction_id)
+
+    blob_service.acquire(db, receipt_url)
+    blob_service.release(db, [transaction.receipt_url])
+    transaction.receipt_url = receipt_url
+    db.commit()
+    db.refresh(transaction)
+
+    return _serialize_transaction(transaction)
+
+
+# Editing these on one leg would leave the other leg of the transfer wrong
+TRANSFER_LOCKED_FIELDS = {"amount", "type", "transaction_date", "wallet_id", "category_id"}
+
+@retry_on_conflict
+def update_transaction(db: Session, user_id: int, transaction_id: int, data: TransactionUpdate):
+    """
+    Edit a transaction in place. Only the difference between the old and new
+    values is applied to balances and aggregates, in the same commit.
+    """
+    transaction = get_transaction(db, user_id, transaction_id)
+    before = snapshot(transaction)
+    changes = {
+        field: value
+        for field, value in data.dict(exclude_unset=True).items()
+        if value is not None or field == "note"
+    }
+
+    if transaction.type == TransactionType.TRANSFER:
+        locked = {f for f in TRANSFER_LOCKED_FIELDS & changes.keys() if changes[f] != getattr(transaction, f)}
+        if locked:
+            raise HTTPException(400, "Only the name, note and tags of a transfer can be edited")
+    elif changes.get("type") == TransactionType.TRANSFER:
+        raise HTTPException(400, "Transfers must be created through /transfer")
+
+    if "amount" in changes and changes["amount"] <= 0:
+        raise HTTPException(400, "Amount must be greater than zero")
+
+    wallets = {transaction.wallet_id: transaction.wallet}
+    if "wallet_id" in changes and changes["wallet_id"] not in wallets:
+        wallet = db.query(Wallet).filter(
+            Wallet.id == changes["wallet_id"],
+            Wallet.user_id == user_id
+        ).first()
+        if not wallet:
+            raise HTTPException(404, "Wallet not found or you don't have permission")
+        wallets[wallet.id] = wallet
+
+    category = transaction.category
+    if "category_id" in changes and changes["category_id"] != transaction.category_id:
+        category = db.query(Category).filter(
+            Category.id == changes["category_id"],
+            (Category.user_id == user_id) | (Category.user_id.is_(None))
+        ).first()
+        if not category:
+            raise HTTPException(404, "Category not found")
+
+    # Checked against the resulting pair, so changing only the type is caught too
+    if category is not None and category.type != changes.get("type", transaction.type):
+        raise HTTPException(400, CATEGORY_TYPE_MISMATCH)
+    transaction.category = category
+
+    tag_ids = changes.pop("tags", None)
+    if tag_ids is not None:
+        transaction.tags = db.query(Tag).filter(
+            Tag.id.in_(tag_ids),
+            Tag.user_id == user_id
+        ).all() if tag_ids else []
+
+    for field, value in changes.items():
+        if field != "category_id":
+            setattr(transaction, field, value)
+
+    db.flush()
+    search_index.index_transactions(db, [transaction])
+    apply_transaction_change(db, user_id, before, transaction, wallets)
+    db.commit()
+    db.refresh(transaction)
+
+    return _serialize_transaction(transaction)
+
+
+@retry_on_conflict
+def delete_transaction(db: Session, user_id: int, transaction_id: int):
+    transaction = get_transaction(db, user_id, transaction_id)
+
     wallet = db.query(Wallet).filter(
         Wallet.id == transaction.wallet_id,
         Wallet.user_id == user_id
@@ -151,20 +269,15 @@ def delete_transaction(db: Session, user_id: int, transaction_id: int):
     if not wallet:
         raise HTTPException(404, "Wallet not found")
 
-    # Reverse transaction effect
-    if transaction.type == TransactionType.INCOME:
-        wallet.balance = max(Decimal('0'), wallet.balance - transaction.amount)
-    else:
-        wallet.balance += transaction.amount
-
-        budget = budget_service.get_or_create_current_budget(db, user_id)
-        budget.daily_spent = max(Decimal('0.00'), budget.daily_spent - transaction.amount)
-        budget.monthly_spent = max(Decimal('0.00'), budget.monthly_spent - transaction.amount)
-
+    # Undo everything the transaction contributed, in the same commit as the delete
+    apply_transaction_effects(db, user_id, [transaction], {wallet.id: wallet}, reverse=True)
+    search_index.remove_transactions(db, [transaction.id])
+    blob_service.release(db, [transaction.receipt_url])
     db.delete(transaction)
     db.commit()
 
 
+@retry_on_conflict
 def transfer_funds(db: Session, user_id: int, data):
     source_wallet = db.query(Wallet).filter(
         Wallet.id == data.source_wallet_id,
@@ -221,7 +334,7 @@ def transfer_funds(db: Session, user_id: int, data):
         type=TransactionType.TRANSFER,
         transaction_date=today,
         wallet_id=source_wallet.id,
-        category_id=transfer_out.id,
+        category=transfer_out,
         user_id=user_id
     )
 
@@ -232,25 +345,24 @@ def transfer_funds(db: Session, user_id: int, data):
         type=TransactionType.TRANSFER,
         transaction_date=today,
         wallet_id=destination_wallet.id,
-        category_id=transfer_in.id,
+        category=transfer_in,
         user_id=user_id
     )
 
-    source_wallet.balance -= data.amount
-    destination_wallet.balance += converted_amount
-
     db.add(source_tx)
     db.add(dest_tx)
+    db.flush()
+    search_index.index_transactions(db, [source_tx, dest_tx])
+    apply_transaction_effects(
+        db,
+        user_id,
+        [source_tx, dest_tx],
+        {source_wallet.id: source_wallet, destination_wallet.id: destination_wallet},
+    )
     db.commit()
     db.refresh(source_tx)
     db.refresh(dest_tx)
 
-    update_monthly_summary(db, user_id, source_tx)
-    update_monthly_summary(db, user_id, dest_tx)
-
-    update_goal_progress(db, dest_tx)
-    record_savings(db, dest_tx)
-
     return {
         "message": "Transfer completed successfully",
         "source_transaction": source_tx,
@@ -304,32 +416,208 @@ def preview_transfer(
     }
 
 
-def get_transactions_by_tag(db: Session, user_id: int, tag_id: int):
-    txs = (
+def get_transactions_by_tag(
+    db: Session,
+    user_id: int,
+    tag_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None
+) -> TransactionPage:
+    query = (
         db.query(Transaction)
         .join(Transaction.tags)
         .filter(
             Tag.id == tag_id,
             Transaction.user_id == user_id
         )
-        .order_by(Transaction.transaction_date.desc())
-        .all()
     )
 
-    return _serialize_transactions(txs)
+    return _paginate(query, limit, cursor)
 
-def search_transactions_by_tag(db: Session, user_id: int, text: str):
-    txs = (
+def search_transactions_by_tag(
+    db: Session,
+    user_id: int,
+    text: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None
+) -> TransactionPage:
+    # EXISTS instead of a join so a transaction matching several tags is listed once
+    query = (
         db.query(Transaction)
-        .join(Transaction.tags)
         .filter(
-            Tag.name.ilike(f"%{text}%"),
+            Transaction.tags.any(Tag.name.ilike(f"%{text}%")),
             Transaction.user_id == user_id
         )
+    )
+
+    return _paginate(query, limit, cursor)
+
+def query_transactions(
+    db: Session,
+    user_id: int,
+    filters: TransactionFilter,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None
+) -> TransactionPage:
+    """
+    Any combination of filters, answered by a single paginated statement.
+    Tag filters are EXISTS subqueries so a row is never duplicated by a join.
+    """
+    if filters.start_date and filters.end_date and filters.start_date > filters.end_date:
+        raise HTTPException(400, "Start date cannot be after end date")
+
+    if (
+        filters.min_amount is not None
+        and filters.max_amount is not None
+        and filters.min_amount > filters.max_amount
+    ):
+        raise HTTPException(400, "min_amount cannot be greater than max_amount")
+
+    if filters.sort_by not in SORT_KEYS:
+        raise HTTPException(400, "Invalid sort_by. Use 'date' or 'amount'")
+
+    query = db.query(Transaction).filter(Transaction.user_id == user_id)
+
+    if filters.start_date:
+        query = query.filter(Transaction.transaction_date >= filters.start_date)
+    if filters.end_date:
+        query = query.filter(Transaction.transaction_date <= filters.end_date)
+    if filters.wallet_ids:
+        query = query.filter(Transaction.wallet_id.in_(filters.wallet_ids))
+    if filters.category_ids:
+        query = query.filter(Transaction.category_id.in_(filters.category_ids))
+    if filters.types:
+        query = query.filter(Transaction.type.in_(filters.types))
+    if filters.min_amount is not None:
+        query = query.filter(Transaction.amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        query = query.filter(Transaction.amount <= filters.max_amount)
+
+    if filters.tag_ids:
+        if filters.match_all_tags:
+            # One EXISTS per tag: the transaction must carry every one of them
+            for tag_id in set(filters.tag_ids):
+                query = query.filter(_has_tag(TransactionTag.tag_id == tag_id))
+        else:
+            query = query.filter(_has_tag(TransactionTag.tag_id.in_(filters.tag_ids)))
+
+    return _paginate(query, limit, cursor, filters.sort_by, filters.descending)
+
+def _has_tag(condition):
+    return (
+        select(TransactionTag.transaction_id)
+        .where(TransactionTag.transaction_id == Transaction.id, condition)
+        .exists()
+    )
+
+def search_transactions(
+    db: Session,
+    user_id: int,
+    query: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None
+) -> TransactionPage:
+    """
+    Ranked full-text search over transaction name, note and tag names.
+    Every word must match, each as a prefix ("gro" finds "groceries").
+    """
+    offset = decode_offset(cursor) if cursor else 0
+
+    ids = search_index.search_transaction_ids(db, user_id, query, limit + 1, offset)
+    if ids is None:
+        # No full-text index on this database: fall back to a plain scan
+        pattern = f"%{query}%"
+        ids = [
+            tx_id for (tx_id,) in db.query(Transaction.id)
+            .filter(
+                Transaction.user_id == user_id,
+                or_(
+                    Transaction.name.ilike(pattern),
+                    Transaction.note.ilike(pattern),
+                    Transaction.tags.any(Tag.name.ilike(pattern))
+                )
+            )
+            .order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+            .limit(limit + 1)
+            .offset(offset)
+        ]
+
+    next_cursor = None
+    if len(ids) > limit:
+        ids = ids[:limit]
+        next_cursor = encode_offset(offset + limit)
+
+    by_id = {
+        tx.id: tx
+        for tx in db.query(Transaction)
+        .options(selectinload(Transaction.tags))
+        .filter(Transaction.id.in_(ids))
         .all()
+    }
+
+    return TransactionPage(
+        items=_serialize_transactions([by_id[i] for i in ids if i in by_id]),
+        next_cursor=next_cursor
     )
 
-    return _serialize_transactions(txs)
+# sort key -> (column, parser for the cursor value)
+SORT_KEYS = {
+    "date": (Transaction.transaction_date, date.fromisoformat),
+    "amount": (Transaction.amount, Decimal),
+}
+
+def _paginate(
+    query: Query,
+    limit: int,
+    cursor: str | None,
+    sort_by: str = "date",
+    descending: bool = True
+) -> TransactionPage:
+    """
+    Keyset pagination over (sort column, id), newest first by default.
+
+    The cursor carries the position of the last row already sent, so every page
+    is a bounded range scan no matter how deep the client has paged.
+    """
+    column, parse = SORT_KEYS[sort_by]
+
+    if cursor:
+        cursor_value, cursor_id = decode_cursor(cursor, parse)
+        if descending:
+            after = or_(
+                column < cursor_value,
+                and_(column == cursor_value, Transaction.id < cursor_id)
+            )
+        else:
+            after = or_(
+                column > cursor_value,
+                and_(column == cursor_value, Transaction.id > cursor_id)
+            )
+        query = query.filter(after)
+
+    if descending:
+        ordering = (column.desc(), Transaction.id.desc())
+    else:
+        ordering = (column.asc(), Transaction.id.asc())
+
+    # Tags for the whole page come from one extra IN query instead of one
+    # lazy load per row during serialization.
+    # Fetch one extra row to know whether another page exists.
+    txs = query.options(
+        selectinload(Transaction.tags)
+    ).order_by(*ordering).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(txs) > limit:
+        txs = txs[:limit]
+        last = txs[-1]
+        last_value = last.transaction_date if sort_by == "date" else last.amount
+        next_cursor = encode_cursor(last_value, last.id)
+
+    return TransactionPage(
+        items=_serialize_transactions(txs),
+        next_cursor=next_cursor
+    )
 
 def _serialize_transaction(tx: Transaction) -> TransactionResponse:
     return TransactionResponse(
@@ -36,7 +36,7 @@ async def upload_avatar(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return UserService.upload_avatar(db, current_user, file)
+    return await UserService.upload_avatar(db, current_user, file)
 
 
 @router.delete("/me/avatar", response_model=UserResponse)
@@ -1,20 +1,15 @@
-import shutil
-import uuid
-from pathlib import Path
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from app.entities.user import User
 from app.entities.wallet import Wallet
 from app.entities.transaction import Transaction
 from app.utils.enums.transaction_type import TransactionType
 from app.api.auth.model import UserUpdate
 from app.core.security import get_password_hash
-from app.core.file_settings import (
-    AVATAR_UPLOAD_DIR,
-    ALLOWED_EXTENSIONS,
-    MAX_FILE_SIZE
-)
+from app.services import upload_service
+from app.services import blob_service
 
 class UserService:
 
@@ -121,59 +116,32 @@ class UserService:
 
 
     @staticmethod
-    def upload_avatar(db: Session, current_user: User, file: UploadFile):
-        ext = Path(file.filename).suffix.lower()
-        if ext not in ALLOWED_EXTENSIONS:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Only JPG, JPEG, PNG, and GIF files are allowed",
-            )
-
-        file.file.seek(0, 2)
-        file_size = file.file.tell()
-        file.file.seek(0)
-
-        if file_size > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File size must be less than 5MB",
-            )
-
-        unique_name = f"{current_user.id}_{uuid.uuid4()}{ext}"
-        file_path = AVATAR_UPLOAD_DIR / unique_name
+    async def upload_avatar(db: Session, current_user: User, file: UploadFile):
+        """Stream the image to disk first, then swap it in on a worker thread."""
+        avatar_url = await upload_service.store_image(upload_service.upload_file_chunks(file))
 
         try:
-            # Delete old avatar
-            if current_user.avatar_url:
-                old_name = current_user.avatar_url.split("/")[-1]
-                old_path = AVATAR_UPLOAD_DIR / old_name
-                if old_path.exists():
-                    old_path.unlink()
-
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-
-            current_user.avatar_url = f"/static/avatars/{unique_name}"
-            db.commit()
-            db.refresh(current_user)
-            return current_user
-
+            return await run_in_threadpool(UserService.set_avatar, db, current_user, avatar_url)
         except Exception:
-            if file_path.exists():
-                file_path.unlink()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to upload avatar",
             )
 
+    @staticmethod
+    def set_avatar(db: Session, current_user: User, avatar_url: str):
+        blob_service.acquire(db, avatar_url)
+        blob_service.release(db, [current_user.avatar_url])
+
+        current_user.avatar_url = avatar_url
+        db.commit()
+        db.refresh(current_user)
+        return current_user
+
 
     @staticmethod
     def delete_avatar(db: Session, current_user: User):
-        if current_user.avatar_url:
-            filename = current_user.avatar_url.split("/")[-1]
-            file_path = AVATAR_UPLOAD_DIR / filename
-            if file_path.exists():
-                file_path.unlink()
+        blob_service.release(db, [current_user.avatar_url])
 
         current_user.avatar_url = None
         db.commit()
@@ -3,12 +3,13 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
 from app.core.auth import get_current_user
+from app.core.etag import conditional_get
 from app.api.wallet.model import WalletCreate, WalletUpdate, WalletResponse
 from app.api.wallet.service import WalletService
 
 router = APIRouter()
 
-@router.get("/user/total")
+@router.get("/user/total", dependencies=[Depends(conditional_get)])
 def get_user_total_balance(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -25,7 +26,7 @@ def create_wallet(
     return WalletService.create_wallet(db, current_user, wallet_data)
 
 
-@router.get("/", response_model=List[WalletResponse])
+@router.get("/", response_model=List[WalletResponse], dependencies=[Depends(conditional_get)])
 def get_wallets(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
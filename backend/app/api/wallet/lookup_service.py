@@ -0,0 +1,24 @@
+from sqlalchemy.orm import Session
+
+from app.entities.wallet import Wallet
+from app.services.request_memo import request_memoized
+
+
+@request_memoized
+def get_user_wallet_rows(db: Session, user_id: int) -> tuple:
+    """
+    The user's wallets as read-only rows, oldest first. Shared within a
+    request: the current summary and the total balance both need them.
+    """
+    return tuple(
+        db.query(
+            Wallet.id,
+            Wallet.name,
+            Wallet.currency,
+            Wallet.balance,
+            Wallet.wallet_type,
+        )
+        .filter(Wallet.user_id == user_id)
+        .order_by(Wallet.id)
+        .all()
+    )
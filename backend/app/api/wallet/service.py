@@ -5,12 +5,19 @@ from app.entities.wallet import Wallet
 from app.entities.transaction import Transaction
 from app.services.currency_service import currency_service
 from app.api.financial_summary.service import recalculate_monthly_summary
+from app.api.wallet.lookup_service import get_user_wallet_rows
+from app.services import search_index
+from app.services import blob_service
+from app.api.recurring.service import delete_wallet_rules
+from app.api.analytics.rollup_service import add_wallet_transactions, remove_wallet_transactions
+from app.api.analytics.anomaly_service import add_wallet_expenses, remove_wallet_expenses
+from app.utils.concurrency import retry_on_conflict
 
 class WalletService:
 
     @staticmethod
     def get_user_total_balance(db: Session, user):
-        wallets = db.query(Wallet).filter(Wallet.user_id == user.id).all()
+        wallets = get_user_wallet_rows(db, user.id)
         total = Decimal("0.0")
         breakdown = []
 
@@ -100,6 +107,7 @@ class WalletService:
 
 
     @staticmethod
+    @retry_on_conflict
     def update_wallet(db: Session, user, wallet_id: int, data):
         wallet = WalletService.get_wallet(db, user, wallet_id)
 
@@ -143,7 +151,12 @@ class WalletService:
             wallet.balance = currency_service.convert_amount(
                 wallet.balance, wallet.currency, data.currency
             )
+            # Rollups and amount stats are kept per currency; move this wallet's share across
+            remove_wallet_transactions(db, user.id, wallet)
+            remove_wallet_expenses(db, user.id, wallet)
             wallet.currency = data.currency
+            add_wallet_transactions(db, user.id, wallet)
+            add_wallet_expenses(db, user.id, wallet)
 
         # Optional fields
         if data.wallet_type is not None:
@@ -161,9 +174,18 @@ class WalletService:
     
 
     @staticmethod
+    @retry_on_conflict
     def delete_wallet(db: Session, user, wallet_id: int):
         wallet = WalletService.get_wallet(db, user, wallet_id)
 
+        rows = db.query(Transaction.id, Transaction.receipt_url).filter(
+            Transaction.wallet_id == wallet_id
+        ).all()
+        search_index.remove_transactions(db, [tx_id for tx_id, _ in rows])
+        blob_service.release(db, [receipt_url for _, receipt_url in rows])
+        delete_wallet_rules(db, wallet_id)
+        remove_wallet_transactions(db, user.id, wallet)
+        remove_wallet_expenses(db, user.id, wallet)
         db.query(Transaction).filter(Transaction.wallet_id == wallet_id).delete()
 
         db.delete(wallet)
@@ -6,4 +6,20 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
-DATABASE_URL = os.getenv("DATABASE_URL")
\ No newline at end of file
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Analytics response cache: "memory" (per process) or "redis" (shared between workers)
+ANALYTICS_CACHE_BACKEND = os.getenv("ANALYTICS_CACHE_BACKEND", "memory")
+ANALYTICS_CACHE_URL = os.getenv("ANALYTICS_CACHE_URL", "redis://localhost:6379/0")
+ANALYTICS_CACHE_TTL_SECONDS = int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", 300))
+ANALYTICS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", 2048))
+
+# Unusual expenses: flagged when this many standard deviations above the
+# category's mean, once the category has enough history
+ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", 3.0))
+ANOMALY_MIN_HISTORY = int(os.getenv("ANOMALY_MIN_HISTORY", 10))
+
+# Dashboard loads running at once across all requests of a process; each
+# holds a pooled database connection. Keep it at or below the engine's
+# pool_size (5 by default) so the overflow stays free for other requests.
+DASHBOARD_PARALLEL_LOADS = int(os.getenv("DASHBOARD_PARALLEL_LOADS", 5))
@@ -0,0 +1,48 @@
+import hashlib
+from datetime import date
+from fastapi import Depends, HTTPException, Request, Response, status
+from app.core.auth import get_current_user
+from app.entities.user import User
+from app.services.response_cache import response_cache
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Route dependency for per-user read endpoints: sets a weak ETag derived
+    from the user's persisted data version (see response_cache), and
+    answers 304 Not Modified before the endpoint runs when the client
+    already has it. The version was loaded with the user, so this costs no
+    extra query, and it is the same in every worker.
+
+    The tag covers the url and today's date too, so it can only stay valid
+    while the endpoint would return the same data.
+    """
+    version = response_cache.data_version(current_user)
+
+    source = f"{current_user.id}|{request.url.path}?{request.url.query}|{date.today()}|{version}"
+    etag = f'W/"{hashlib.sha1(source.encode()).hexdigest()[:20]}"'
+
+    if _matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+        )
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored on both sides
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
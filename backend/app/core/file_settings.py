@@ -9,5 +9,24 @@ TRANSACTION_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 GOAL_UPLOAD_DIR = Path("static/goals")
 GOAL_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Content-addressed store every new upload goes to; the directories above
+# only hold files uploaded before it existed
+BLOB_UPLOAD_DIR = Path("static/blobs")
+BLOB_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+BLOB_URL_PREFIX = "/static/blobs/"
+# Unreferenced blobs younger than this are kept: their upload may still be
+# waiting for the row that will point at it
+BLOB_GC_GRACE_SECONDS = 60 * 60
+
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif"}
-MAX_FILE_SIZE = 5 * 1024 * 1024
\ No newline at end of file
+MAX_FILE_SIZE = 5 * 1024 * 1024
+# Whole multipart request carrying an image: the file plus the other form fields
+MAX_UPLOAD_REQUEST_SIZE = MAX_FILE_SIZE + 64 * 1024
+# Multipart endpoints that take something other than an image
+MULTIPART_SIZE_LIMITS = {
+    "/api/transactions/import": 50 * 1024 * 1024,
+}
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Threads reserved for writing uploads, separate from the pool that runs sync endpoints
+UPLOAD_WRITE_THREADS = 4
@@ -0,0 +1,24 @@
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from app.database import engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Last revision whose schema create_all used to produce on its own
+BASELINE_REVISION = "0001"
+
+def upgrade_database():
+    """Bring the database schema to the latest migration."""
+    config = Config(str(ALEMBIC_INI))
+
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+
+        tables = inspect(connection).get_table_names()
+        if tables and "alembic_version" not in tables:
+            # Database created by create_all before migrations existed
+            command.stamp(config, BASELINE_REVISION)
+
+        command.upgrade(config, "head")
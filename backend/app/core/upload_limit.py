@@ -0,0 +1,54 @@
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.file_settings import MAX_UPLOAD_REQUEST_SIZE, MULTIPART_SIZE_LIMITS
+
+'''
+Caps the size of multipart request bodies while they are being received.
+
+Starlette parses and spools a multipart form (to memory, then to a temp
+file) before the endpoint runs, so upload_service only sees the file once
+it has been received in full. This middleware sits in front of that: a
+declared Content-Length over the limit is refused without reading the
+body, and a body that turns out larger than the limit is cut off as soon as
+it crosses it. The limit is MAX_UPLOAD_REQUEST_SIZE (an image plus the
+other form fields) unless MULTIPART_SIZE_LIMITS names the path.
+'''
+
+
+class MultipartSizeLimitMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = MULTIPART_SIZE_LIMITS.get(scope["path"], MAX_UPLOAD_REQUEST_SIZE)
+        declared = headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > limit:
+            response = JSONResponse({"detail": "File too large"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside the form parsing, so it becomes a normal 400
+                    raise HTTPException(400, "File too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
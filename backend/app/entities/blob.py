@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from app.database import Base
+
+class Blob(Base):
+    """
+    One stored upload, shared by every row that points at it. `key` is the
+    file name under BLOB_UPLOAD_DIR: the SHA-256 of the content plus the
+    image extension.
+    """
+    __tablename__ = "blobs"
+
+    key = Column(String(80), primary_key=True)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, DateTime, DECIMAL, Date
+from sqlalchemy import Column, ForeignKey, Integer, DateTime, DECIMAL, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -6,6 +6,9 @@ from datetime import date
 
 class Budget(Base):
     __tablename__ = "budgets"
+    __table_args__ = (
+        Index("uq_budgets_user_period", "user_id", "year", "month", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -21,6 +24,9 @@ class Budget(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Optimistic lock, same as Wallet.version
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
 
     last_updated_date = Column(Date, default=date.today)
 
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, Float, Index
+from app.database import Base
+
+class CategoryAmountStats(Base):
+    """
+    Running count, mean and sum of squared deviations (Welford's M2) of a
+    user's expense amounts in one category and wallet currency. Kept in
+    step with `transactions` by the write paths (see
+    analytics/anomaly_service), so the variance is always at hand without
+    reading the history.
+    """
+    __tablename__ = "category_amount_stats"
+    __table_args__ = (
+        Index("uq_category_amount_stats_key", "user_id", "category_id", "currency", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    currency = Column(String, nullable=False)
+
+    count = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=False, default=0)
+    m2 = Column(Float, nullable=False, default=0)
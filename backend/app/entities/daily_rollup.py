@@ -0,0 +1,33 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, DECIMAL, Date, Enum, Index
+from sqlalchemy.orm import validates
+from app.database import Base
+from app.utils.enums.transaction_type import TransactionType
+from app.utils.periods import year_month
+
+class DailyRollup(Base):
+    """
+    Sum and count of a user's transactions for one day, category, type and
+    wallet currency. Kept in step with `transactions` by the write paths
+    (see analytics/rollup_service) so reports never scan raw rows.
+    """
+    __tablename__ = "daily_rollups"
+    __table_args__ = (
+        Index("uq_daily_rollups_key", "user_id", "date", "category_id", "type", "currency", unique=True),
+        Index("ix_daily_rollups_user_year_month", "user_id", "year_month"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    date = Column(Date, nullable=False)
+    year_month = Column(Integer, nullable=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    type = Column(Enum(TransactionType), nullable=False)
+    currency = Column(String, nullable=False)
+
+    total = Column(DECIMAL(14, 2), nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    @validates("date")
+    def _set_year_month(self, key, value):
+        self.year_month = year_month(value)
+        return value
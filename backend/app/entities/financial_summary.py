@@ -1,10 +1,13 @@
-from sqlalchemy import Column, ForeignKey, Integer, DateTime, DECIMAL
+from sqlalchemy import Column, ForeignKey, Integer, DateTime, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
 class FinancialSummary(Base):
     __tablename__ = "financial_summaries"
+    __table_args__ = (
+        Index("uq_financial_summaries_user_period", "user_id", "year", "month", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -18,5 +21,8 @@ class FinancialSummary(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Optimistic lock, same as Wallet.version
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
 
     user = relationship("User", back_populates="financial_summaries")
\ No newline at end of file
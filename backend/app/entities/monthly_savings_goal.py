@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, DECIMAL
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, DECIMAL, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
 class MonthlySavingsGoal(Base):
     __tablename__ = "monthly_savings_goals"
+    __table_args__ = (
+        Index("uq_monthly_savings_goals_user_period", "user_id", "year", "month", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
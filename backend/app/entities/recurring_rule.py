@@ -0,0 +1,44 @@
+from sqlalchemy import Column, ForeignKey, Integer, DateTime, String, Text, DECIMAL, Date, Enum, Boolean, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+from app.utils.enums.transaction_type import TransactionType
+from app.utils.enums.recurrence_frequency import RecurrenceFrequency
+
+class RecurringRule(Base):
+    """
+    A schedule in the spirit of an RRULE (FREQ, INTERVAL, DTSTART, UNTIL)
+    plus the transaction to create on every occurrence.
+    """
+    __tablename__ = "recurring_rules"
+    __table_args__ = (
+        # The scheduler's "what is due" scan
+        Index("ix_recurring_rules_active_next_run", "active", "next_run_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    wallet_id = Column(Integer, ForeignKey("wallets.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+
+    name = Column(String(30), nullable=False)
+    amount = Column(DECIMAL(10, 2), nullable=False)
+    note = Column(Text, nullable=True)
+    type = Column(Enum(TransactionType), nullable=False)
+
+    frequency = Column(Enum(RecurrenceFrequency), nullable=False)
+    interval = Column(Integer, nullable=False, default=1)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)
+
+    # Occurrences materialized so far; the next one is number occurrence_count
+    occurrence_count = Column(Integer, nullable=False, default=0)
+    # Date of that next occurrence, NULL once the schedule is exhausted
+    next_run_date = Column(Date, nullable=True)
+    active = Column(Boolean, nullable=False, default=True)
+    last_error = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    wallet = relationship("Wallet")
+    category = relationship("Category")
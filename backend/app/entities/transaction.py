@@ -1,11 +1,21 @@
-from sqlalchemy import Column, ForeignKey, Integer, DateTime, String, Text, DECIMAL, Date, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, ForeignKey, Integer, DateTime, String, Text, DECIMAL, Date, Enum, Index, Float
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.database import Base
 from app.utils.enums.transaction_type import TransactionType
+from app.utils.periods import year_month
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_user_date", "user_id", "transaction_date"),
+        Index("ix_transactions_wallet_date_id", "wallet_id", "transaction_date", "id"),
+        Index("ix_transactions_user_type_date", "user_id", "type", "transaction_date"),
+        Index("ix_transactions_user_category_date", "user_id", "category_id", "transaction_date"),
+        Index("ix_transactions_user_year_month", "user_id", "year_month"),
+        # One transaction per occurrence, so re-running the scheduler cannot duplicate
+        Index("uq_transactions_recurring_occurrence", "recurring_rule_id", "transaction_date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(30), nullable=False)
@@ -14,12 +24,25 @@ class Transaction(Base):
     type = Column(Enum(TransactionType), nullable=False)
     receipt_url = Column(String, nullable=True)
     transaction_date = Column(Date, nullable=False, server_default=func.now())
+    # YYYYMM of transaction_date, so monthly filters and group-bys can use an index
+    year_month = Column(Integer, nullable=True)
     wallet_id = Column(Integer, ForeignKey("wallets.id"))
     category_id = Column(Integer, ForeignKey("categories.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
+    # z-score of the amount within its category when it was flagged as unusual, else NULL
+    anomaly_score = Column(Float, nullable=True)
+    # The category mean and standard deviation that z-score was computed from
+    anomaly_mean = Column(Float, nullable=True)
+    anomaly_std = Column(Float, nullable=True)
+    recurring_rule_id = Column(Integer, ForeignKey("recurring_rules.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     wallet = relationship("Wallet", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
     user = relationship("User", back_populates="transactions")
-    tags = relationship("Tag", secondary="transaction_tags", back_populates="transactions")
\ No newline at end of file
+    tags = relationship("Tag", secondary="transaction_tags", back_populates="transactions")
+
+    @validates("transaction_date")
+    def _set_year_month(self, key, value):
+        self.year_month = year_month(value) if value is not None else None
+        return value
@@ -17,6 +17,9 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped in every transaction that changes data the user's reports read;
+    # keys the response cache and ETags (see services/response_cache)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     wallets = relationship("Wallet", back_populates="owner")
     categories = relationship("Category", back_populates="user")
@@ -16,6 +16,9 @@ class Wallet(Base):
     color = Column(String, default="#3B82F6")
     user_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Bumped on every update; a stale write fails instead of overwriting (see utils/concurrency)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
     # is_goal = Column(Boolean, default=False)
 
     owner = relationship("User", back_populates="wallets")
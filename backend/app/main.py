@@ -1,15 +1,37 @@
+import asyncio
+import logging
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
-from app.database import engine
-from app.database import Base
 from .routes import register_routers
 from app.core.seed import seed_categories
+from app.core.migrations import upgrade_database
+from app.core.file_settings import BLOB_UPLOAD_DIR
+from app.core.upload_limit import MultipartSizeLimitMiddleware
+from app.services.blob_service import collect_garbage_now
+from app.services.response_cache import response_cache
+from app.services import request_memo
+from app.utils.static_files import ImmutableStaticFiles
+from app.api.recurring.scheduler_service import run_scheduler, RECURRING_INTERVAL_SECONDS
 from contextlib import asynccontextmanager
 
+logger = logging.getLogger(__name__)
+
+async def run_recurring_scheduler():
+    while True:
+        try:
+            await run_in_threadpool(run_scheduler)
+        except Exception:
+            logger.exception("Recurring transaction run failed")
+        await asyncio.sleep(RECURRING_INTERVAL_SECONDS)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     seed_categories()
+    collect_garbage_now()
+    scheduler = asyncio.create_task(run_recurring_scheduler())
     yield
+    scheduler.cancel()
 
 app = FastAPI(
     title="Personal Finance Tracker API",
@@ -18,12 +40,17 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-Base.metadata.create_all(bind=engine)
+upgrade_database()
 
+# More specific mount first: blobs are content-addressed and never change
+app.mount("/static/blobs", ImmutableStaticFiles(directory=BLOB_UPLOAD_DIR), name="blobs")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 register_routers(app)
 
+app.add_middleware(MultipartSizeLimitMiddleware)
+app.add_middleware(request_memo.RequestMemoMiddleware)
+
 @app.get("/")
 def root():
     return {
@@ -35,4 +62,8 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "analytics_cache": response_cache.stats(),
+        "request_memo": request_memo.stats(),
+    }
\ No newline at end of file
@@ -11,6 +11,8 @@ from app.api.tag.controller import router as tags
 from app.api.category_limits.controller import router as category_limits
 from app.api.goal.controller import router as goal
 from app.api.savings_goal.controller import router as savings_goal
+from app.api.recurring.controller import router as recurring
+from app.api.dashboard.controller import router as dashboard
 
 def register_routers(app: FastAPI):
     app.include_router(auth, prefix="/api/auth", tags=["auth"])
@@ -25,3 +27,5 @@ def register_routers(app: FastAPI):
     app.include_router(category_limits, prefix="/api/limits", tags=["category_limits"])
     app.include_router(goal, prefix="/api/goals", tags=["goals"])
     app.include_router(savings_goal, prefix="/api/savings_goal", tags=["savings_goal"])
+    app.include_router(recurring, prefix="/api/recurring", tags=["recurring"])
+    app.include_router(dashboard, prefix="/api/dashboard", tags=["dashboard"])
@@ -0,0 +1,111 @@
+import time
+from collections import Counter
+from pathlib import Path
+from sqlalchemy import case, update
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.entities.blob import Blob
+from app.core.file_settings import (
+    BLOB_UPLOAD_DIR,
+    BLOB_URL_PREFIX,
+    BLOB_GC_GRACE_SECONDS
+)
+
+'''
+Reference counts for the content-addressed upload store.
+
+upload_service.store_image puts the bytes on disk; the rows that point at
+them (transaction receipts, goal images, avatars) call acquire / release in
+the same database transaction that sets or clears their url. A blob whose
+count is zero, or a file that never got a row because the request failed
+after the upload, is removed by collect_garbage once it is older than
+BLOB_GC_GRACE_SECONDS.
+
+Urls from before the blob store (one file per upload) are not counted;
+releasing one deletes its file, as replacing an upload always did.
+'''
+
+
+def blob_key(url: str | None) -> str | None:
+    if url and url.startswith(BLOB_URL_PREFIX):
+        return url[len(BLOB_URL_PREFIX):]
+    return None
+
+
+def acquire(db: Session, url: str | None):
+    """Count a new reference to `url`. Does not commit."""
+    key = blob_key(url)
+    if not key:
+        return
+
+    updated = db.execute(
+        update(Blob).where(Blob.key == key).values(ref_count=Blob.ref_count + 1)
+    ).rowcount
+
+    if not updated:
+        db.add(Blob(key=key, size=(BLOB_UPLOAD_DIR / key).stat().st_size, ref_count=1))
+
+
+def release(db: Session, urls):
+    """Drop one reference per url in `urls` (None entries are ignored). Does not commit."""
+    counts = Counter()
+    for url in urls:
+        key = blob_key(url)
+        if key:
+            counts[key] += 1
+        elif url and url.startswith("/static/"):
+            _legacy_path(url).unlink(missing_ok=True)
+
+    for key, n in counts.items():
+        db.execute(
+            update(Blob)
+            .where(Blob.key == key)
+            .values(ref_count=case((Blob.ref_count > n, Blob.ref_count - n), else_=0))
+        )
+
+
+def collect_garbage(db: Session, grace_seconds: int = BLOB_GC_GRACE_SECONDS) -> int:
+    """Delete unreferenced blobs older than the grace period. Returns how many files were removed."""
+    cutoff = time.time() - grace_seconds
+    referenced = {
+        key for (key,) in db.query(Blob.key).filter(Blob.ref_count > 0)
+    }
+
+    removed = []
+    for path in BLOB_UPLOAD_DIR.iterdir():
+        if path.name in referenced or not path.is_file():
+            continue
+        # Fresh files may belong to an upload whose row is not committed yet;
+        # that includes in-flight ".part" files
+        if path.stat().st_mtime > cutoff:
+            continue
+        path.unlink(missing_ok=True)
+        removed.append(path.name)
+
+    if removed:
+        db.query(Blob).filter(
+            Blob.key.in_(removed),
+            Blob.ref_count == 0
+        ).delete(synchronize_session=False)
+    db.commit()
+
+    return len(removed)
+
+
+def collect_garbage_now() -> int:
+    """Entry point for startup and cron: runs collect_garbage on its own session."""
+    db = SessionLocal()
+    try:
+        return collect_garbage(db)
+    finally:
+        db.close()
+
+
+def _legacy_path(url: str) -> Path:
+    # "/static/receipts/x.png" -> static/receipts/x.png
+    return Path(url.lstrip("/"))
+
+
+if __name__ == "__main__":
+    print(f"Removed {collect_garbage_now()} unreferenced blob(s)")
@@ -0,0 +1,189 @@
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import engine
+
+'''
+Memoizes shared reads for the length of one request.
+
+Composed endpoints run several services that read the same rows: the
+dashboard's current summary and total balance both list the user's wallets,
+on two sessions running at the same time. Loaders decorated with
+@request_memoized are keyed on (function, user, arguments); within a
+request the first call runs the query and every other call, from any
+thread, gets that result. A call made while another is still computing
+the same key waits for it instead of querying again.
+
+Memoized loaders return plain rows, not ORM instances, so their results
+can be shared between sessions. A session with pending or uncommitted
+changes bypasses the memo, and a commit that changes a user's data drops
+that user's entries, so a request always reads its own writes.
+
+Each entry remembers how many SQL statements it took to compute, so every
+reuse knows how many it saved. The total per request is sent back in the
+X-Avoided-Queries header, and the totals are in stats() (see /health).
+'''
+
+logger = logging.getLogger(__name__)
+
+_current_memo: ContextVar["RequestMemo | None"] = ContextVar("request_memo", default=None)
+# Statement counter of the computation running in this context, if any
+_query_counter: ContextVar[list | None] = ContextVar("request_memo_queries", default=None)
+
+
+class _Entry:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.statements = 0
+        self.failed = False
+
+
+class RequestMemo:
+    def __init__(self):
+        self.entries: dict[tuple, _Entry] = {}
+        self.hits = 0
+        self.misses = 0
+        self.avoided_queries = 0
+        self.lock = threading.Lock()
+
+    def get_or_compute(self, key: tuple, compute):
+        while True:
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is None:
+                    entry = self.entries[key] = _Entry()
+                    self.misses += 1
+                    break
+
+            entry.done.wait()
+            if entry.failed:
+                # The first caller raised; compute again here, without the memo
+                return compute()
+            with self.lock:
+                self.hits += 1
+                self.avoided_queries += entry.statements
+            return entry.value
+
+        counter = [0]
+        token = _query_counter.set(counter)
+        try:
+            entry.value = compute()
+        except BaseException:
+            entry.failed = True
+            with self.lock:
+                self.entries.pop(key, None)
+            raise
+        finally:
+            _query_counter.reset(token)
+            entry.statements = counter[0]
+            entry.done.set()
+        return entry.value
+
+    def forget_user(self, user_id: int):
+        with self.lock:
+            for key in [key for key in self.entries if key[1] == user_id]:
+                del self.entries[key]
+
+
+class _Totals:
+    def __init__(self):
+        self.requests = 0
+        self.hits = 0
+        self.avoided_queries = 0
+        self.lock = threading.Lock()
+
+    def add(self, memo: RequestMemo):
+        with self.lock:
+            self.requests += 1
+            self.hits += memo.hits
+            self.avoided_queries += memo.avoided_queries
+
+
+_totals = _Totals()
+
+
+@contextmanager
+def request_memo():
+    """Open a memo scope; loader calls inside it (threadpool included) share it."""
+    memo = RequestMemo()
+    token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_memo.reset(token)
+        _totals.add(memo)
+        if memo.hits:
+            logger.debug(
+                "Request memo: %d hits, %d queries avoided", memo.hits, memo.avoided_queries
+            )
+
+
+def request_memoized(func):
+    """
+    Memoize a loader taking (db, user_id, *args) for the current request.
+    Outside a request scope, or when `db` holds changes not yet committed,
+    it just runs.
+    """
+    @wraps(func)
+    def wrapper(db: Session, user_id: int, *args):
+        memo = _current_memo.get()
+        if memo is None or _has_pending_changes(db):
+            return func(db, user_id, *args)
+        key = (func.__qualname__, user_id, args)
+        return memo.get_or_compute(key, lambda: func(db, user_id, *args))
+
+    return wrapper
+
+
+def forget_user(user_id: int):
+    """Drop the current request's entries for a user whose data changed."""
+    memo = _current_memo.get()
+    if memo is not None:
+        memo.forget_user(user_id)
+
+
+def stats() -> dict:
+    return {
+        "requests": _totals.requests,
+        "hits": _totals.hits,
+        "avoided_queries": _totals.avoided_queries,
+    }
+
+
+class RequestMemoMiddleware:
+    """Opens a memo scope per HTTP request and reports what it saved in X-Avoided-Queries."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with request_memo() as memo:
+            async def send_with_header(message: Message):
+                if message["type"] == "http.response.start" and memo.avoided_queries:
+                    MutableHeaders(scope=message)["X-Avoided-Queries"] = str(memo.avoided_queries)
+                await send(message)
+
+            await self.app(scope, receive, send_with_header)
+
+
+def _has_pending_changes(db: Session) -> bool:
+    return bool(db.new or db.dirty or db.deleted or db.info.get("changed_users"))
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
@@ -0,0 +1,259 @@
+import inspect
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from functools import wraps
+from sqlalchemy import event, update
+from sqlalchemy import inspect as inspect_state
+
+from app.core.config import (
+    ANALYTICS_CACHE_BACKEND,
+    ANALYTICS_CACHE_URL,
+    ANALYTICS_CACHE_TTL_SECONDS,
+    ANALYTICS_CACHE_MAX_ENTRIES
+)
+from app.database import SessionLocal
+from app.services import request_memo
+from app.entities.budget import Budget
+from app.entities.category import Category
+from app.entities.category_limit import CategoryLimit
+from app.entities.daily_rollup import DailyRollup
+from app.entities.financial_summary import FinancialSummary
+from app.entities.goal import Goal
+from app.entities.monthly_savings_goal import MonthlySavingsGoal
+from app.entities.transaction import Transaction
+from app.entities.user import User
+from app.entities.wallet import Wallet
+
+'''
+Caches analytics and financial-summary responses per user.
+
+Entries are keyed by (user, endpoint, parameters, data version, today). The
+data version is users.data_version, bumped by the same database transaction
+that changes any of the user's transactions, wallets, limits, goals or
+derived totals, right before it commits. Every worker therefore sees a new
+version together with the data it describes, so a write makes all of that
+user's cached reports unreachable at once, in every process, and a repeat
+load runs no report queries. Stale entries are never read again and age out
+through LRU / TTL; core/etag uses the same version for conditional GETs.
+
+A session that has changed a user's data but not committed yet bypasses
+the cache for that user: what it would compute is not committed under any
+version.
+'''
+
+logger = logging.getLogger(__name__)
+
+# Writes to these rows can change a report; every one carries user_id
+VERSIONED_ENTITIES = (
+    Transaction, Wallet, CategoryLimit, Goal, Budget, FinancialSummary,
+    MonthlySavingsGoal, Category, DailyRollup
+)
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    """Process-local LRU with a TTL per entry."""
+
+    def __init__(self, max_entries: int = ANALYTICS_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return _MISSING
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return _MISSING
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: int):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class RedisBackend:
+    """Shared between workers. Eviction is left to redis (TTL plus an LRU maxmemory-policy)."""
+
+    def __init__(self, url: str = ANALYTICS_CACHE_URL, prefix: str = "analytics:"):
+        # Optional dependency, only needed when this backend is configured
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.evictions = 0
+
+    def get(self, key):
+        raw = self.client.get(self._entry_key(key))
+        return _MISSING if raw is None else pickle.loads(raw)
+
+    def set(self, key, value, ttl: int):
+        self.client.set(self._entry_key(key), pickle.dumps(value), ex=ttl)
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+    def _entry_key(self, key) -> str:
+        return f"{self.prefix}entry:{key!r}"
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl: int = ANALYTICS_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_or_compute(self, user: User, endpoint: str, params: tuple, compute):
+        if has_uncommitted_changes(user):
+            return compute()
+
+        try:
+            key = (user.id, endpoint, params, self.data_version(user), date.today())
+            value = self.backend.get(key)
+        except Exception:
+            # A cache outage must not take the reports down with it
+            logger.exception("Analytics cache lookup failed")
+            return compute()
+
+        if value is not _MISSING:
+            self._count(hit=True)
+            return value
+
+        self._count(hit=False)
+        value = compute()
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception:
+            logger.exception("Analytics cache store failed")
+        return value
+
+    @staticmethod
+    def data_version(user: User) -> int:
+        """Token that changes whenever the user's data does, as loaded with `user`."""
+        return user.data_version
+
+    def stats(self) -> dict:
+        with self.lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.backend.evictions,
+        }
+
+    def _count(self, hit: bool):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+def _create_backend():
+    if ANALYTICS_CACHE_BACKEND == "redis":
+        return RedisBackend()
+    return MemoryBackend()
+
+
+response_cache = ResponseCache(_create_backend())
+
+
+def cached_response(endpoint: str, user_arg: str = "current_user"):
+    """
+    Serve the decorated service function from the response cache. Its
+    arguments other than `db` and the user make up the cache key, so the
+    result must depend only on them and on the user's data.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("db", None)
+            user = arguments.pop(user_arg)
+            params = tuple(sorted((name, repr(value)) for name, value in arguments.items()))
+
+            return response_cache.get_or_compute(
+                user, endpoint, params, lambda: func(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def has_uncommitted_changes(user: User) -> bool:
+    """Whether the session `user` belongs to has changed the user's data and not committed yet."""
+    session = inspect_state(user).session
+    return session is not None and user.id in session.info.get("changed_users", ())
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = session.info.setdefault("changed_users", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            column = "id"
+        elif isinstance(obj, VERSIONED_ENTITIES):
+            column = "user_id"
+        else:
+            continue
+        # Loaded values only: no SQL from inside a flush
+        user_id = inspect_state(obj).dict.get(column)
+        if user_id is not None:
+            changed.add(user_id)
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _bump_data_versions(session):
+    # Flush first so every change of this transaction is collected. The
+    # users rows are locked last, just before COMMIT, so concurrent writers
+    # of one user queue on them only briefly and never while holding them
+    session.flush()
+    changed = session.info.get("changed_users")
+    if not changed:
+        return
+    session.connection().execute(
+        update(User.__table__)
+        .where(User.__table__.c.id.in_(sorted(changed)))
+        # Not a profile change: keep updated_at's onupdate from firing
+        .values(
+            data_version=User.__table__.c.data_version + 1,
+            updated_at=User.__table__.c.updated_at,
+        )
+    )
+
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_changed_users(session):
+    # Rows memoized earlier in this request no longer match what was committed
+    for user_id in session.info.pop("changed_users", ()):
+        request_memo.forget_user(user_id)
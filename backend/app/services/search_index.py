@@ -0,0 +1,160 @@
+import re
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+'''
+Full-text index over transaction name, note and tag names.
+
+PostgreSQL keeps a tsvector per transaction behind a GIN index; SQLite uses
+an FTS5 virtual table whose rowid is the transaction id. Either way the
+table is "transaction_search" and it is written in the same database
+transaction as the rows it describes, so it never drifts from them.
+'''
+
+SEARCH_TABLE = "transaction_search"
+
+_DDL = {
+    "postgresql": [
+        f"""
+        CREATE TABLE {SEARCH_TABLE} (
+            transaction_id INTEGER PRIMARY KEY REFERENCES transactions(id) ON DELETE CASCADE,
+            user_id INTEGER NOT NULL,
+            document TSVECTOR NOT NULL
+        )
+        """,
+        f"CREATE INDEX ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+        f"CREATE INDEX ix_{SEARCH_TABLE}_user_id ON {SEARCH_TABLE} (user_id)",
+    ],
+    "sqlite": [
+        f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(user_id UNINDEXED, document)",
+    ],
+}
+
+# Fills the index from existing rows the first time it is created
+_BACKFILL = {
+    "postgresql": f"""
+        INSERT INTO {SEARCH_TABLE} (transaction_id, user_id, document)
+        SELECT t.id, t.user_id, to_tsvector('simple',
+            t.name || ' ' || COALESCE(t.note, '') || ' ' || COALESCE((
+                SELECT string_agg(g.name, ' ') FROM transaction_tags tt
+                JOIN tags g ON g.id = tt.tag_id WHERE tt.transaction_id = t.id
+            ), ''))
+        FROM transactions t
+    """,
+    "sqlite": f"""
+        INSERT INTO {SEARCH_TABLE} (rowid, user_id, document)
+        SELECT t.id, t.user_id,
+            t.name || ' ' || COALESCE(t.note, '') || ' ' || COALESCE((
+                SELECT group_concat(g.name, ' ') FROM transaction_tags tt
+                JOIN tags g ON g.id = tt.tag_id WHERE tt.transaction_id = t.id
+            ), '')
+        FROM transactions t
+    """,
+}
+
+_UPSERT = {
+    "postgresql": f"""
+        INSERT INTO {SEARCH_TABLE} (transaction_id, user_id, document)
+        VALUES (:id, :user_id, to_tsvector('simple', :document))
+        ON CONFLICT (transaction_id) DO UPDATE SET document = EXCLUDED.document
+    """,
+    "sqlite": f"""
+        INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, user_id, document)
+        VALUES (:id, :user_id, :document)
+    """,
+}
+
+_DELETE = {
+    "postgresql": f"DELETE FROM {SEARCH_TABLE} WHERE transaction_id = :id",
+    "sqlite": f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id",
+}
+
+# Returns (id, rank) best match first; lower bm25 is better in SQLite
+_SEARCH = {
+    "postgresql": f"""
+        SELECT s.transaction_id AS id, ts_rank(s.document, q) AS rank
+        FROM {SEARCH_TABLE} s, to_tsquery('simple', :query) q
+        WHERE s.user_id = :user_id AND s.document @@ q
+        ORDER BY rank DESC, s.transaction_id DESC
+        LIMIT :limit OFFSET :offset
+    """,
+    "sqlite": f"""
+        SELECT rowid AS id, bm25({SEARCH_TABLE}) AS rank
+        FROM {SEARCH_TABLE}
+        WHERE {SEARCH_TABLE} MATCH :query AND user_id = :user_id
+        ORDER BY rank, rowid DESC
+        LIMIT :limit OFFSET :offset
+    """,
+}
+
+
+def search_index_statements(dialect: str) -> list[str]:
+    """DDL plus backfill for `dialect`; empty when it has no full-text support."""
+    if dialect not in _DDL:
+        return []
+    return [*_DDL[dialect], _BACKFILL[dialect]]
+
+
+def create_search_index(connection: Connection):
+    """Create (and backfill) the index table if this database supports one."""
+    if inspect(connection).has_table(SEARCH_TABLE):
+        return
+
+    for statement in search_index_statements(connection.dialect.name):
+        connection.exec_driver_sql(statement)
+
+
+def index_transactions(db: Session, transactions):
+    """Add or refresh index entries. Transactions must be flushed so they have ids."""
+    dialect = _dialect(db)
+    if dialect not in _UPSERT or not transactions:
+        return
+
+    db.execute(text(_UPSERT[dialect]), [
+        {"id": tx.id, "user_id": tx.user_id, "document": _document(tx)}
+        for tx in transactions
+    ])
+
+
+def remove_transactions(db: Session, transaction_ids):
+    dialect = _dialect(db)
+    if dialect not in _DELETE or not transaction_ids:
+        return
+
+    db.execute(text(_DELETE[dialect]), [{"id": i} for i in transaction_ids])
+
+
+def search_transaction_ids(db: Session, user_id: int, query: str, limit: int, offset: int = 0) -> list[int] | None:
+    """
+    Ranked ids of the user's transactions matching every word of `query`
+    (as a prefix). Returns None when the database has no search index.
+    """
+    dialect = _dialect(db)
+    if dialect not in _SEARCH:
+        return None
+
+    words = re.findall(r"\w+", query)
+    if not words:
+        return []
+
+    if dialect == "postgresql":
+        match = " & ".join(f"{w}:*" for w in words)
+    else:
+        match = " ".join(f'"{w}"*' for w in words)
+
+    rows = db.execute(text(_SEARCH[dialect]), {
+        "query": match,
+        "user_id": user_id,
+        "limit": limit,
+        "offset": offset,
+    }).all()
+    return [row.id for row in rows]
+
+
+def _document(tx) -> str:
+    return " ".join(filter(None, [tx.name, tx.note, *(t.name for t in tx.tags)]))
+
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
@@ -0,0 +1,148 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import uuid4
+
+import anyio
+from fastapi import HTTPException, Request, UploadFile
+
+from app.core.file_settings import (
+    ALLOWED_EXTENSIONS,
+    BLOB_UPLOAD_DIR,
+    BLOB_URL_PREFIX,
+    MAX_FILE_SIZE,
+    UPLOAD_CHUNK_SIZE,
+    UPLOAD_WRITE_THREADS
+)
+
+'''
+Streams uploaded images to disk without holding a worker thread.
+
+Chunks are read asynchronously and only the individual file writes go to a
+thread, through a small limiter of their own, so uploads never take threads
+away from the pool sync endpoints run in. The type is decided from the
+first bytes of content rather than the file name, uploads over the size
+limit are rejected before they are stored, and data is written to a hidden
+temp file that is renamed into place only once it is complete. Files are
+content-addressed; see blob_service for reference counting and garbage
+collection.
+
+Only a raw request body (request_body_chunks) is streamed here straight
+from the client, with the limit enforced as bytes arrive. Multipart
+uploads (upload_file_chunks) have already been received and spooled by
+Starlette when the endpoint runs; their size is capped while they arrive
+by core/upload_limit, and checked again here.
+'''
+
+# Magic bytes -> extension
+IMAGE_SIGNATURES = [
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+]
+SNIFF_BYTES = max(len(magic) for magic, _ in IMAGE_SIGNATURES)
+
+_write_limiter: anyio.CapacityLimiter | None = None
+
+
+def sniff_image_extension(head: bytes) -> str | None:
+    for magic, ext in IMAGE_SIGNATURES:
+        if head.startswith(magic) and ext in ALLOWED_EXTENSIONS:
+            return ext
+    return None
+
+
+async def upload_file_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    """Chunks of a multipart upload, read back from Starlette's spooled copy."""
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+async def request_body_chunks(request: Request, max_size: int = MAX_FILE_SIZE) -> AsyncIterator[bytes]:
+    """Raw request body; a declared Content-Length over the limit is refused before reading."""
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_size:
+        raise HTTPException(400, "File too large")
+
+    async for chunk in request.stream():
+        if chunk:
+            yield chunk
+
+
+async def store_image(chunks: AsyncIterator[bytes], max_size: int = MAX_FILE_SIZE) -> str:
+    """
+    Write an image from `chunks` into the blob store and return its url.
+
+    The file is named after the SHA-256 of its content, so uploading the same
+    image again reuses the stored copy. Raises 400 for content that is not an
+    allowed image or is larger than `max_size`; nothing is left on disk in
+    that case. The caller records the reference with blob_service.acquire.
+    """
+    temp_path = BLOB_UPLOAD_DIR / f".{uuid4().hex}.part"
+    digest = hashlib.sha256()
+    head = b""
+    ext = None
+    size = 0
+    buffer = None
+
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_size:
+                raise HTTPException(400, "File too large")
+
+            if ext is None:
+                head += chunk
+                if len(head) < SNIFF_BYTES:
+                    continue
+                ext = _require_image(head)
+                buffer = await _run(open, temp_path, "wb")
+                chunk, head = head, b""
+
+            digest.update(chunk)
+            await _run(buffer.write, chunk)
+
+        if ext is None:
+            # Whole upload was shorter than the sniff window
+            ext = _require_image(head)
+            buffer = await _run(open, temp_path, "wb")
+            digest.update(head)
+            await _run(buffer.write, head)
+
+        await _run(buffer.close)
+        key = f"{digest.hexdigest()}{ext}"
+        await _run(_publish, temp_path, BLOB_UPLOAD_DIR / key)
+        return f"{BLOB_URL_PREFIX}{key}"
+
+    except BaseException:
+        if buffer is not None:
+            buffer.close()
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _publish(temp_path: Path, path: Path):
+    if path.exists():
+        # Same content is already stored; refresh its age so garbage
+        # collection leaves it alone until the new reference is committed
+        temp_path.unlink()
+        os.utime(path)
+    else:
+        os.replace(temp_path, path)
+
+
+def _require_image(head: bytes) -> str:
+    ext = sniff_image_extension(head)
+    if not ext:
+        raise HTTPException(400, "Invalid file type")
+    return ext
+
+
+async def _run(func, *args):
+    global _write_limiter
+    # Limiters belong to the running event loop, so create it on first use
+    if _write_limiter is None:
+        _write_limiter = anyio.CapacityLimiter(UPLOAD_WRITE_THREADS)
+    return await anyio.to_thread.run_sync(func, *args, limiter=_write_limiter)
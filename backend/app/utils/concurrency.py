@@ -0,0 +1,65 @@
+import random
+import time
+from functools import wraps
+from typing import Callable, TypeVar
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+'''
+Bounded retry for optimistic concurrency.
+
+Wallet, Budget and FinancialSummary carry a version column that SQLAlchemy
+checks on every UPDATE/DELETE (compare-and-swap). When another worker
+changed the row after we read it, the flush raises StaleDataError; the
+unit of work is rolled back and run again against fresh rows. Losing a
+race to create the same month's row (unique index) is retried the same way.
+Any other integrity error (a foreign key, NOT NULL or CHECK violation) is
+bad input that a retry cannot fix, so it is rolled back and answered with
+400 straight away. No row locks are taken, so writes to different wallets
+never wait on each other.
+'''
+
+MAX_ATTEMPTS = 3
+BASE_BACKOFF_SECONDS = 0.02
+
+T = TypeVar("T")
+
+# SQLSTATE of a unique constraint violation (PostgreSQL)
+UNIQUE_VIOLATION = "23505"
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """Whether `error` is a unique constraint violation, i.e. a lost race to insert the same row."""
+    orig = error.orig
+    # psycopg2 / psycopg 3
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    # pg8000 passes the server's error fields as a dict
+    if code is None and orig is not None and orig.args and isinstance(orig.args[0], dict):
+        code = orig.args[0].get("C")
+    if code is not None:
+        return code == UNIQUE_VIOLATION
+    # SQLite has no SQLSTATE, only the message
+    return "UNIQUE constraint failed" in str(orig)
+
+def run_with_retry(db: Session, work: Callable[[], T]) -> T:
+    """Run `work` (which must commit itself) until it succeeds or MAX_ATTEMPTS is reached."""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            return work()
+        except (StaleDataError, IntegrityError) as e:
+            db.rollback()
+            if isinstance(e, IntegrityError) and not is_unique_violation(e):
+                raise HTTPException(400, "Invalid data provided") from e
+            if attempt == MAX_ATTEMPTS:
+                raise HTTPException(409, "The record was changed by another request, please retry") from e
+            # Jittered backoff so the same contenders don't collide again
+            time.sleep(random.uniform(0, BASE_BACKOFF_SECONDS * 2 ** attempt))
+
+def retry_on_conflict(func):
+    """Decorator form of run_with_retry for service functions taking `db` first."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        db = kwargs["db"] if "db" in kwargs else args[0]
+        return run_with_retry(db, lambda: func(*args, **kwargs))
+    return wrapper
@@ -0,0 +1,7 @@
+import enum
+
+class RecurrenceFrequency(enum.Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
@@ -0,0 +1,42 @@
+import base64
+import binascii
+from datetime import date
+from decimal import InvalidOperation
+from typing import Any, Callable
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(sort_value: Any, transaction_id: int) -> str:
+    """
+    Pack the (sort value, id) position of the last row into an opaque token.
+    The sort value is usually the transaction date, or the amount when
+    sorting by amount.
+    """
+    raw = f"{sort_value}|{transaction_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, parse: Callable[[str], Any] = date.fromisoformat) -> tuple[Any, int]:
+    """Inverse of encode_cursor. Raises 400 for anything that was not produced by it."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        value_part, id_part = raw.split("|")
+        return parse(value_part), int(id_part)
+    except (binascii.Error, UnicodeDecodeError, ValueError, InvalidOperation):
+        raise HTTPException(400, "Invalid cursor")
+
+def encode_offset(offset: int) -> str:
+    """Opaque cursor for result sets that are ordered by rank rather than by date."""
+    return base64.urlsafe_b64encode(f"o|{offset}".encode()).decode().rstrip("=")
+
+def decode_offset(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, offset = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        if kind != "o" or int(offset) < 0:
+            raise ValueError(cursor)
+        return int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(400, "Invalid cursor")
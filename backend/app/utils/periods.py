@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+import numpy as np
+
+# Calendar periods reports can be bucketed by; weeks start on Monday
+GRANULARITIES = ("day", "week", "month", "quarter", "year")
+
+_MONTH_STEPS = {"month": ("M", 1), "quarter": ("M", 3), "year": ("Y", 1)}
+
+
+def year_month(day: date) -> int:
+    """Month bucket of `day` as an integer, e.g. 202610 for October 2026."""
+    return day.year * 100 + day.month
+
+
+def months_back(day: date, months: int) -> date:
+    """First day of the month `months - 1` months before `day`'s, so [result, day] spans `months` calendar months."""
+    index = day.year * 12 + day.month - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def period_start(day: date, granularity: str) -> date:
+    """Start of the `granularity` period `day` falls in."""
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "quarter":
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    return date(day.year, 1, 1)
+
+
+def period_starts(start_date: date, end_date: date, granularity: str) -> np.ndarray:
+    """Start of every period overlapping [start_date, end_date], oldest first, as datetime64[D]."""
+    first = np.datetime64(period_start(start_date, granularity), "D")
+    last = np.datetime64(end_date, "D")
+    if granularity == "day":
+        return np.arange(first, last + 1)
+    if granularity == "week":
+        return np.arange(first, last + 1, 7)
+
+    unit, step = _MONTH_STEPS[granularity]
+    return np.arange(first.astype(f"datetime64[{unit}]"), last.astype(f"datetime64[{unit}]") + 1, step).astype("datetime64[D]")
+
+
+def period_ends(starts: np.ndarray, granularity: str) -> np.ndarray:
+    """Last day of each period in `starts` (as returned by period_starts)."""
+    if granularity == "day":
+        return starts
+    if granularity == "week":
+        return starts + 6
+
+    unit, step = _MONTH_STEPS[granularity]
+    return (starts.astype(f"datetime64[{unit}]") + step).astype("datetime64[D]") - 1
+
+
+def period_label(start: date, granularity: str) -> tuple[str, str]:
+    """Machine label and display name of the period starting at `start`, e.g. ("2026-Q4", "Q4 2026")."""
+    if granularity == "day":
+        return start.isoformat(), start.strftime("%d %b %Y")
+    if granularity == "week":
+        iso_year, iso_week, _ = start.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}", start.strftime("Week of %d %b %Y")
+    if granularity == "month":
+        return start.strftime("%Y-%m"), start.strftime("%b %Y")
+    if granularity == "quarter":
+        quarter = (start.month - 1) // 3 + 1
+        return f"{start.year}-Q{quarter}", f"Q{quarter} {start.year}"
+    return str(start.year), str(start.year)
@@ -0,0 +1,110 @@
+"""
+Per-write latency of the transaction write path: create, transfer and
+delete, called through the service layer against a fresh SQLite database.
+
+Run from /backend:
+
+    python benchmarks/write_path.py [--count 300] [--app-root PATH]
+
+--app-root points at another checkout's backend directory, so the same
+measurement can be taken before and after a change, e.g.:
+
+    git worktree add /tmp/before <commit>
+    python benchmarks/write_path.py --app-root /tmp/before/backend
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=300, help="calls per operation")
+    parser.add_argument("--app-root", default=str(Path(__file__).resolve().parent.parent))
+    args = parser.parse_args()
+
+    # The app reads its settings and creates its upload directories on import
+    workdir = tempfile.mkdtemp(prefix="write-path-")
+    os.chdir(workdir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/benchmark.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    sys.path.insert(0, os.path.abspath(args.app_root))
+
+    from sqlalchemy import event
+
+    import app.main  # noqa: F401  creates the schema
+    from app.core.seed import seed_categories
+    from app.database import SessionLocal, engine
+    from app.entities.category import Category
+    from app.entities.user import User
+    from app.entities.wallet import Wallet
+    from app.api.transaction import service
+    from app.api.transaction.model import TransactionCreate, TransferCreate
+    from app.utils.enums.transaction_type import TransactionType
+    from app.utils.enums.wallet_type import WalletType
+
+    seed_categories()
+    db = SessionLocal()
+    user = User(email="benchmark@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    main_wallet = Wallet(name="Main", currency="USD", balance=Decimal("1000000"),
+                         wallet_type=WalletType.CASH, user_id=user.id)
+    saving_wallet = Wallet(name="Savings", currency="USD", balance=Decimal("0"),
+                           wallet_type=WalletType.SAVING_ACCOUNT, user_id=user.id)
+    db.add_all([main_wallet, saving_wallet])
+    db.commit()
+    user_id, main_id, saving_id = user.id, main_wallet.id, saving_wallet.id
+    category_id = db.query(Category.id).filter(Category.type == TransactionType.EXPENSE).first()[0]
+
+    commits = [0]
+    event.listen(engine, "commit", lambda conn: commits.__setitem__(0, commits[0] + 1))
+
+    created = []
+
+    def create(_):
+        transaction = service.create_transaction(db, user_id, TransactionCreate(
+            name="Benchmark",
+            amount=Decimal("1"),
+            type=TransactionType.EXPENSE,
+            transaction_date=date.today(),
+            wallet_id=main_id,
+            category_id=category_id,
+        ))
+        created.append(transaction.id)
+
+    def transfer(_):
+        service.transfer_funds(db, user_id, TransferCreate(
+            source_wallet_id=main_id, destination_wallet_id=saving_id, amount=Decimal("1")
+        ))
+
+    def delete(i):
+        service.delete_transaction(db, user_id, created[i])
+
+    print(f"{args.count} calls per operation, app at {args.app_root}")
+    for label, operation in (("create", create), ("transfer", transfer), ("delete", delete)):
+        timings = []
+        commits[0] = 0
+        for i in range(args.count):
+            started = time.perf_counter()
+            operation(i)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(
+            f"{label:9s} median {statistics.median(timings):7.2f} ms"
+            f"  p95 {timings[int(len(timings) * 0.95)]:7.2f} ms"
+            f"  commits/op {commits[0] / args.count:.1f}"
+        )
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
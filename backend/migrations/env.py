@@ -0,0 +1,65 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine
+from app.core.config import DATABASE_URL
+from app.database import Base
+from app.entities import (  # noqa: F401  registers every table on Base.metadata
+    blob, budget, category, category_amount_stats, category_limit, daily_rollup, financial_summary, goal,
+    monthly_savings_goal, recurring_rule, tag, transaction, user, wallet
+)
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("connection") is None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Tables maintained by hand-written DDL rather than by the ORM models
+IGNORED_TABLES = {"transaction_search"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # FTS5 also creates shadow tables named transaction_search_*
+    return not (type_ == "table" and name.startswith(tuple(IGNORED_TABLES)))
+
+
+def run_migrations_offline():
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_with_connection(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # app.core.migrations passes the application's connection in
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_with_connection(connection)
+        return
+
+    engine = create_engine(DATABASE_URL)
+    with engine.connect() as connection:
+        run_with_connection(connection)
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
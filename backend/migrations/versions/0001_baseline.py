@@ -0,0 +1,177 @@
+"""baseline schema
+
+The schema as it was created by Base.metadata.create_all before migrations
+existed. Databases created that way are stamped at this revision on startup
+instead of running it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+transaction_type = sa.Enum("INCOME", "EXPENSE", "TRANSFER", name="transactiontype")
+wallet_type = sa.Enum(
+    "DEBIT_CARD", "CASH", "CREDIT_CARD", "SAVING_ACCOUNT",
+    "INVESTMENT", "LOAN", "MORTGAGE", "GOAL",
+    name="wallettype",
+)
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String()),
+        sa.Column("phone_number", sa.String()),
+        sa.Column("date_of_birth", sa.Date()),
+        sa.Column("avatar_url", sa.String()),
+        sa.Column("default_currency", sa.String()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "budgets",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("monthly_limit", sa.DECIMAL(10, 2)),
+        sa.Column("daily_limit", sa.DECIMAL(10, 2)),
+        sa.Column("monthly_spent", sa.DECIMAL(10, 2)),
+        sa.Column("daily_spent", sa.DECIMAL(10, 2)),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        sa.Column("last_updated_date", sa.Date()),
+    )
+    op.create_index("ix_budgets_id", "budgets", ["id"])
+
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("type", transaction_type, nullable=False),
+        sa.Column("color", sa.String()),
+        sa.Column("icon", sa.String()),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+    )
+    op.create_index("ix_categories_id", "categories", ["id"])
+
+    op.create_table(
+        "financial_summaries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("total_income", sa.DECIMAL(10, 2)),
+        sa.Column("total_spent", sa.DECIMAL(10, 2)),
+        sa.Column("total_saved", sa.DECIMAL(10, 2)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_financial_summaries_id", "financial_summaries", ["id"])
+
+    op.create_table(
+        "monthly_savings_goals",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("target_amount", sa.DECIMAL(10, 2)),
+        sa.Column("current_saved", sa.DECIMAL(10, 2)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+
+    op.create_table(
+        "tags",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(30), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+    )
+    op.create_index("ix_tags_id", "tags", ["id"])
+
+    op.create_table(
+        "wallets",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("currency", sa.String(), nullable=False),
+        sa.Column("balance", sa.DECIMAL(10, 2)),
+        sa.Column("wallet_type", wallet_type, nullable=False),
+        sa.Column("card_number", sa.String()),
+        sa.Column("color", sa.String()),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_wallets_id", "wallets", ["id"])
+
+    op.create_table(
+        "category_limits",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("monthly_limit", sa.DECIMAL(10, 2)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_category_limits_id", "category_limits", ["id"])
+
+    op.create_table(
+        "goals",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String()),
+        sa.Column("image", sa.String()),
+        sa.Column("deadline", sa.Date()),
+        sa.Column("goal_amount", sa.DECIMAL(10, 2), nullable=False),
+        sa.Column("amount_saved", sa.DECIMAL(10, 2)),
+        sa.Column("wallet_id", sa.Integer(), sa.ForeignKey("wallets.id"), unique=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+    )
+
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(30), nullable=False),
+        sa.Column("amount", sa.DECIMAL(10, 2), nullable=False),
+        sa.Column("note", sa.Text()),
+        sa.Column("type", transaction_type, nullable=False),
+        sa.Column("receipt_url", sa.String()),
+        sa.Column("transaction_date", sa.Date(), nullable=False, server_default=sa.func.now()),
+        sa.Column("wallet_id", sa.Integer(), sa.ForeignKey("wallets.id")),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id")),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_transactions_id", "transactions", ["id"])
+
+    op.create_table(
+        "transaction_tags",
+        sa.Column("transaction_id", sa.Integer(), sa.ForeignKey("transactions.id"), primary_key=True),
+        sa.Column("tag_id", sa.Integer(), sa.ForeignKey("tags.id"), primary_key=True),
+    )
+
+
+def downgrade():
+    for table in (
+        "transaction_tags", "transactions", "goals", "category_limits",
+        "wallets", "tags", "monthly_savings_goals", "financial_summaries",
+        "categories", "budgets", "users",
+    ):
+        op.drop_table(table)
+
+    bind = op.get_bind()
+    transaction_type.drop(bind, checkfirst=True)
+    wallet_type.drop(bind, checkfirst=True)
@@ -0,0 +1,32 @@
+"""full-text search index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import context, op
+
+from app.services.search_index import (
+    SEARCH_TABLE,
+    create_search_index,
+    search_index_statements,
+)
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if context.is_offline_mode():
+        for statement in search_index_statements(context.get_context().dialect.name):
+            op.execute(statement)
+        return
+
+    # No-op when the table was already created by an earlier startup
+    create_search_index(op.get_bind())
+
+
+def downgrade():
+    op.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
@@ -0,0 +1,84 @@
+"""composite indexes for the hot query shapes
+
+Every transaction list, analytics, limits and summary query filters on the
+owner plus a date range, type or category. The per-month tables are looked
+up by (user_id, year, month) and must hold one row per month.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+TRANSACTION_INDEXES = {
+    "ix_transactions_user_date": ["user_id", "transaction_date"],
+    "ix_transactions_wallet_date_id": ["wallet_id", "transaction_date", "id"],
+    "ix_transactions_user_type_date": ["user_id", "type", "transaction_date"],
+    "ix_transactions_user_category_date": ["user_id", "category_id", "transaction_date"],
+}
+
+# table -> (unique index name, columns summed when merging duplicate months)
+MONTHLY_TABLES = {
+    "budgets": ("uq_budgets_user_period", ["monthly_spent", "daily_spent"]),
+    "financial_summaries": ("uq_financial_summaries_user_period", ["total_income", "total_spent", "total_saved"]),
+    "monthly_savings_goals": ("uq_monthly_savings_goals_user_period", ["current_saved"]),
+}
+
+
+def upgrade():
+    for name, columns in TRANSACTION_INDEXES.items():
+        op.create_index(name, "transactions", columns)
+
+    for table, (name, summed) in MONTHLY_TABLES.items():
+        # Needs to read rows, so it only runs against a live database
+        if not context.is_offline_mode():
+            _merge_duplicate_months(table, summed)
+        op.create_index(name, table, ["user_id", "year", "month"], unique=True)
+
+
+def downgrade():
+    for table, (name, _) in MONTHLY_TABLES.items():
+        op.drop_index(name, table_name=table)
+
+    for name in TRANSACTION_INDEXES:
+        op.drop_index(name, table_name="transactions")
+
+
+def _merge_duplicate_months(table: str, summed: list[str]):
+    """
+    Racing get-or-create calls could insert the same month twice. Fold the
+    counters of the extra rows into the oldest one so the unique index fits.
+    """
+    bind = op.get_bind()
+    duplicates = bind.execute(sa.text(f"""
+        SELECT user_id, year, month FROM {table}
+        GROUP BY user_id, year, month HAVING COUNT(*) > 1
+    """)).all()
+
+    for user_id, year, month in duplicates:
+        params = {"user_id": user_id, "year": year, "month": month}
+        rows = bind.execute(sa.text(f"""
+            SELECT id, {", ".join(summed)} FROM {table}
+            WHERE user_id = :user_id AND year = :year AND month = :month
+            ORDER BY id
+        """), params).all()
+
+        keep, extra = rows[0], rows[1:]
+        totals = {
+            col: sum((row[i + 1] or 0) for row in rows)
+            for i, col in enumerate(summed)
+        }
+
+        bind.execute(
+            sa.text(f"UPDATE {table} SET {', '.join(f'{c} = :{c}' for c in summed)} WHERE id = :id"),
+            {**totals, "id": keep.id},
+        )
+        bind.execute(
+            sa.text(f"DELETE FROM {table} WHERE id IN ({', '.join(str(r.id) for r in extra)})")
+        )
@@ -0,0 +1,32 @@
+"""version columns for optimistic concurrency
+
+wallets, budgets and financial_summaries are updated by read-modify-write
+from several workers. Each row now carries a version that every UPDATE
+compares and bumps, so a write based on a stale read fails and is retried
+instead of silently overwriting the other one.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ["wallets", "budgets", "financial_summaries"]
+
+
+def upgrade():
+    for table in VERSIONED_TABLES:
+        # Existing rows start at version 1
+        op.add_column(table, sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade():
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("version")
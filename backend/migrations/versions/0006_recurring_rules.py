@@ -0,0 +1,80 @@
+"""recurring transaction rules
+
+Rules describe a schedule and the transaction to create on it. Created
+transactions point back at their rule; the unique (rule, date) index makes
+re-running the scheduler after a crash harmless.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# Already created by the baseline on PostgreSQL
+transaction_type = sa.Enum("INCOME", "EXPENSE", "TRANSFER", name="transactiontype").with_variant(
+    postgresql.ENUM("INCOME", "EXPENSE", "TRANSFER", name="transactiontype", create_type=False),
+    "postgresql",
+)
+recurrence_frequency = sa.Enum("DAILY", "WEEKLY", "MONTHLY", "YEARLY", name="recurrencefrequency")
+
+
+def upgrade():
+    op.create_table(
+        "recurring_rules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("wallet_id", sa.Integer(), sa.ForeignKey("wallets.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id"), nullable=False),
+        sa.Column("name", sa.String(length=30), nullable=False),
+        sa.Column("amount", sa.DECIMAL(10, 2), nullable=False),
+        sa.Column("note", sa.Text()),
+        sa.Column("type", transaction_type, nullable=False),
+        sa.Column("frequency", recurrence_frequency, nullable=False),
+        sa.Column("interval", sa.Integer(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date()),
+        sa.Column("occurrence_count", sa.Integer(), nullable=False),
+        sa.Column("next_run_date", sa.Date()),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("last_error", sa.String()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_recurring_rules_id", "recurring_rules", ["id"])
+    op.create_index("ix_recurring_rules_user_id", "recurring_rules", ["user_id"])
+    op.create_index("ix_recurring_rules_active_next_run", "recurring_rules", ["active", "next_run_date"])
+
+    if context.is_offline_mode() and op.get_context().dialect.name == "sqlite":
+        # Batch mode needs to reflect the table; SQLite does not enforce the
+        # foreign key by default anyway
+        op.add_column("transactions", sa.Column("recurring_rule_id", sa.Integer(), nullable=True))
+    else:
+        with op.batch_alter_table("transactions") as batch:
+            batch.add_column(sa.Column("recurring_rule_id", sa.Integer(), nullable=True))
+            batch.create_foreign_key(
+                "fk_transactions_recurring_rule_id", "recurring_rules",
+                ["recurring_rule_id"], ["id"], ondelete="SET NULL",
+            )
+    op.create_index(
+        "uq_transactions_recurring_occurrence", "transactions",
+        ["recurring_rule_id", "transaction_date"], unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index("uq_transactions_recurring_occurrence", table_name="transactions")
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_constraint("fk_transactions_recurring_rule_id", type_="foreignkey")
+        batch.drop_column("recurring_rule_id")
+
+    op.drop_index("ix_recurring_rules_active_next_run", table_name="recurring_rules")
+    op.drop_index("ix_recurring_rules_user_id", table_name="recurring_rules")
+    op.drop_index("ix_recurring_rules_id", table_name="recurring_rules")
+    op.drop_table("recurring_rules")
+    recurrence_frequency.drop(op.get_bind(), checkfirst=True)
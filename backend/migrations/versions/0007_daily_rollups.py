@@ -0,0 +1,61 @@
+"""daily analytics rollups
+
+Per-day sums and counts of transactions by category, type and wallet
+currency, backfilled from the existing rows. From here on the write paths
+keep them up to date.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# Already created by the baseline on PostgreSQL
+transaction_type = sa.Enum("INCOME", "EXPENSE", "TRANSFER", name="transactiontype").with_variant(
+    postgresql.ENUM("INCOME", "EXPENSE", "TRANSFER", name="transactiontype", create_type=False),
+    "postgresql",
+)
+
+
+def upgrade():
+    op.create_table(
+        "daily_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id")),
+        sa.Column("type", transaction_type, nullable=False),
+        sa.Column("currency", sa.String(), nullable=False),
+        sa.Column("total", sa.DECIMAL(14, 2), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "uq_daily_rollups_key", "daily_rollups",
+        ["user_id", "date", "category_id", "type", "currency"], unique=True,
+    )
+
+    # Transactions whose wallet is gone (deleted goals) still count, as they
+    # did when reports read the raw rows
+    op.execute(
+        """
+        INSERT INTO daily_rollups (user_id, date, category_id, type, currency, total, count)
+        SELECT t.user_id, t.transaction_date, t.category_id, t.type,
+               COALESCE(w.currency, 'USD'), SUM(t.amount), COUNT(t.id)
+        FROM transactions t
+        LEFT JOIN wallets w ON w.id = t.wallet_id
+        WHERE t.user_id IS NOT NULL
+        GROUP BY t.user_id, t.transaction_date, t.category_id, t.type, COALESCE(w.currency, 'USD')
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("uq_daily_rollups_key", table_name="daily_rollups")
+    op.drop_table("daily_rollups")
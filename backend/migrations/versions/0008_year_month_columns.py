@@ -0,0 +1,43 @@
+"""year_month columns
+
+Stored YYYYMM month bucket on transactions and daily_rollups, indexed with
+user_id, so monthly filters compare an indexed integer instead of
+extract()ing the year and month of every row. Backfilled here; from here
+on the entities set it whenever the date is assigned.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+# table -> its date column
+MONTH_BUCKETED = {"transactions": "transaction_date", "daily_rollups": "date"}
+
+
+def upgrade():
+    dialect = op.get_context().dialect.name
+
+    for table, date_column in MONTH_BUCKETED.items():
+        op.add_column(table, sa.Column("year_month", sa.Integer(), nullable=True))
+        op.execute(f"UPDATE {table} SET year_month = {_year_month_sql(dialect, date_column)}")
+        op.create_index(f"ix_{table}_user_year_month", table, ["user_id", "year_month"])
+
+
+def downgrade():
+    for table in MONTH_BUCKETED:
+        op.drop_index(f"ix_{table}_user_year_month", table_name=table)
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("year_month")
+
+
+def _year_month_sql(dialect: str, column: str) -> str:
+    if dialect == "sqlite":
+        return f"CAST(strftime('%Y%m', {column}) AS INTEGER)"
+    return f"CAST(EXTRACT(YEAR FROM {column}) * 100 + EXTRACT(MONTH FROM {column}) AS INTEGER)"
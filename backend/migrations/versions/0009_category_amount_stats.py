@@ -0,0 +1,56 @@
+"""category amount stats
+
+Running count, mean and M2 of expense amounts per user, category and wallet
+currency, backfilled from the existing rows, and the anomaly_score column
+on transactions where write paths store the z-score of unusual expenses.
+Existing rows start unflagged.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "category_amount_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("currency", sa.String(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("mean", sa.Float(), nullable=False),
+        sa.Column("m2", sa.Float(), nullable=False),
+    )
+    op.create_index(
+        "uq_category_amount_stats_key", "category_amount_stats",
+        ["user_id", "category_id", "currency"], unique=True,
+    )
+    op.add_column("transactions", sa.Column("anomaly_score", sa.Float(), nullable=True))
+
+    # M2 = sum(x^2) - sum(x)^2 / n, exact over the DECIMAL amounts
+    op.execute(
+        """
+        INSERT INTO category_amount_stats (user_id, category_id, currency, count, mean, m2)
+        SELECT t.user_id, t.category_id, COALESCE(w.currency, 'USD'), COUNT(t.id),
+               AVG(t.amount), SUM(t.amount * t.amount) - SUM(t.amount) * SUM(t.amount) / COUNT(t.id)
+        FROM transactions t
+        LEFT JOIN wallets w ON w.id = t.wallet_id
+        WHERE t.type = 'EXPENSE' AND t.user_id IS NOT NULL AND t.category_id IS NOT NULL
+        GROUP BY t.user_id, t.category_id, COALESCE(w.currency, 'USD')
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_column("anomaly_score")
+    op.drop_index("uq_category_amount_stats_key", table_name="category_amount_stats")
+    op.drop_table("category_amount_stats")
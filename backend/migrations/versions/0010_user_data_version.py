@@ -0,0 +1,26 @@
+"""user data version
+
+Persisted per-user change counter, bumped by the transaction that changes
+the user's data, so every worker agrees on it. Replaces the counters the
+response cache kept per process.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("data_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("data_version")
@@ -0,0 +1,28 @@
+"""anomaly baseline
+
+The category mean and standard deviation an unusual expense was compared
+with, stored next to its z-score so the three always agree. Expenses
+flagged before this revision keep their score with no baseline.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("transactions", sa.Column("anomaly_mean", sa.Float(), nullable=True))
+    op.add_column("transactions", sa.Column("anomaly_std", sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_column("anomaly_std")
+        batch.drop_column("anomaly_mean")
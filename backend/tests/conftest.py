@@ -0,0 +1,74 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from uuid import uuid4
+
+# The app reads its settings and creates its upload directories on import,
+# so point both at a scratch directory first
+_workdir = tempfile.mkdtemp(prefix="finance-tests-")
+os.chdir(_workdir)
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import engine
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def headers(client):
+    """Authorization headers of a freshly registered user."""
+    email = f"{uuid4().hex[:12]}@example.com"
+    response = client.post("/api/auth/register", json={"email": email, "password": "secret1"})
+    assert response.status_code == 201, response.text
+    token = client.post(
+        "/api/auth/login", params={"email": email, "password": "secret1"}
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def wallet(client, headers):
+    response = client.post(
+        "/api/wallets/", json={"name": "Main", "wallet_type": "cash", "balance": "1000"}, headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.fixture
+def categories(client, headers):
+    """First system category of each type, by type name."""
+    result = {}
+    for category in client.get("/api/categories/", headers=headers).json():
+        result.setdefault(category["type"], category)
+    return result
+
+
+@pytest.fixture
+def count_statements():
+    """Context manager yielding a one-item list that counts the SQL statements run inside it."""
+    @contextmanager
+    def counting():
+        count = [0]
+
+        def listener(*args):
+            count[0] += 1
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            yield count
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+    return counting
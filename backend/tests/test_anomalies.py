@@ -0,0 +1,37 @@
+from datetime import date
+
+import pytest
+
+
+def _expenses(client, headers, wallet, categories, amounts):
+    response = client.post("/api/transactions/batch", json=[
+        {
+            "name": f"Lunch {i}",
+            "amount": str(amount),
+            "type": "expense",
+            "transaction_date": date.today().isoformat(),
+            "wallet_id": wallet["id"],
+            "category_id": categories["expense"]["id"],
+        }
+        for i, amount in enumerate(amounts)
+    ], headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_unusual_expense_is_listed_with_the_baseline_it_was_scored_against(client, headers, wallet, categories):
+    _expenses(client, headers, wallet, categories, [10, 12, 14] * 4)
+    [unusual] = _expenses(client, headers, wallet, categories, [200])
+    # Later expenses move the category's statistics, not the stored baseline
+    _expenses(client, headers, wallet, categories, [50, 60, 70])
+
+    response = client.get("/api/analytics/anomalies", headers=headers)
+
+    assert response.status_code == 200, response.text
+    [listed] = response.json()
+    assert listed["transaction_id"] == unusual["id"]
+    assert listed["category_mean"] == 12.0
+    assert listed["category_std"] == 1.71
+    # Up to the rounding of the returned values
+    expected_z = (listed["amount"] - listed["category_mean"]) / listed["category_std"]
+    assert listed["z_score"] == pytest.approx(expected_z, rel=0.01)
@@ -0,0 +1,61 @@
+import sqlite3
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app.utils import concurrency
+
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def failing_work(message):
+    attempts = [0]
+
+    def work():
+        attempts[0] += 1
+        raise IntegrityError("INSERT ...", {}, sqlite3.IntegrityError(message))
+
+    return work, attempts
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(concurrency.time, "sleep", lambda seconds: None)
+
+
+def test_foreign_key_violation_is_not_retried():
+    db = FakeSession()
+    work, attempts = failing_work("FOREIGN KEY constraint failed")
+
+    with pytest.raises(HTTPException) as raised:
+        concurrency.run_with_retry(db, work)
+
+    assert raised.value.status_code == 400
+    assert attempts[0] == 1
+    assert db.rollbacks == 1
+
+
+def test_unique_violation_is_retried_then_reported_as_conflict():
+    db = FakeSession()
+    work, attempts = failing_work("UNIQUE constraint failed: budgets.user_id, budgets.month")
+
+    with pytest.raises(HTTPException) as raised:
+        concurrency.run_with_retry(db, work)
+
+    assert raised.value.status_code == 409
+    assert attempts[0] == concurrency.MAX_ATTEMPTS
+
+
+def test_unique_violation_detected_from_postgres_sqlstate():
+    pg8000_error = Exception({"S": "ERROR", "C": "23505", "M": "duplicate key value"})
+    fk_error = Exception({"S": "ERROR", "C": "23503", "M": "violates foreign key constraint"})
+
+    assert concurrency.is_unique_violation(IntegrityError("INSERT ...", {}, pg8000_error))
+    assert not concurrency.is_unique_violation(IntegrityError("INSERT ...", {}, fk_error))
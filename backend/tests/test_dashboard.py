@@ -0,0 +1,45 @@
+import asyncio
+import threading
+import time
+
+from app.api.dashboard import service
+from app.database import SessionLocal
+from app.entities.user import User
+
+
+def test_dashboard_is_served_without_a_redirect(client, headers, wallet):
+    response = client.get("/api/dashboard", headers=headers, follow_redirects=False)
+
+    assert response.status_code == 200, response.text
+    assert float(response.json()["total_balance"]["total_balance"]) == 1000
+
+
+def test_concurrent_dashboards_share_a_bounded_number_of_sessions(client, headers, monkeypatch):
+    user_id = client.get("/api/users/me", headers=headers).json()["id"]
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        db.expunge(user)
+
+    running, peak = [0], [0]
+    lock = threading.Lock()
+    call_with_session = service._call_with_session
+
+    def tracked(func, *args):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            time.sleep(0.02)
+            return call_with_session(func, *args)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    monkeypatch.setattr(service, "_call_with_session", tracked)
+    monkeypatch.setattr(service, "_load_slots", asyncio.Semaphore(2))
+
+    async def three_dashboards():
+        return await asyncio.gather(*(service.get_dashboard(user) for _ in range(3)))
+
+    assert len(asyncio.run(three_dashboards())) == 3
+    assert peak[0] == 2
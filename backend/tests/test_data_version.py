@@ -0,0 +1,62 @@
+from datetime import date
+
+from app.database import SessionLocal
+from app.entities.user import User
+from app.entities.wallet import Wallet
+
+
+def _data_version(client, headers) -> int:
+    user_id = client.get("/api/users/me", headers=headers).json()["id"]
+    db = SessionLocal()
+    try:
+        return db.get(User, user_id).data_version
+    finally:
+        db.close()
+
+
+def test_a_write_bumps_the_persisted_version_once(client, headers, wallet, categories):
+    before = _data_version(client, headers)
+
+    response = client.post("/api/transactions/", data={
+        "name": "Groceries",
+        "amount": "40",
+        "type": "expense",
+        "transaction_date": date.today().isoformat(),
+        "wallet_id": wallet["id"],
+        "category_id": categories["expense"]["id"],
+    }, headers=headers)
+
+    assert response.status_code == 201, response.text
+    assert _data_version(client, headers) == before + 1
+
+
+def test_a_rolled_back_write_keeps_the_version(client, headers, wallet):
+    before = _data_version(client, headers)
+
+    db = SessionLocal()
+    try:
+        db.get(Wallet, wallet["id"]).name = "Renamed"
+        db.flush()
+        db.rollback()
+    finally:
+        db.close()
+
+    assert _data_version(client, headers) == before
+
+
+def test_etag_changes_with_the_data(client, headers, wallet):
+    first = client.get("/api/wallets/user/total", headers=headers)
+    etag = first.headers["ETag"]
+
+    assert client.get("/api/wallets/user/total", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    db = SessionLocal()
+    try:
+        db.get(Wallet, wallet["id"]).balance = 60
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.get("/api/wallets/user/total", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total_balance"] == 60
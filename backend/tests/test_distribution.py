@@ -0,0 +1,27 @@
+from datetime import date
+
+
+def test_distribution_summarises_each_category(client, headers, wallet, categories):
+    amounts = list(range(1, 11))
+    response = client.post("/api/transactions/batch", json=[
+        {
+            "name": f"Snack {amount}",
+            "amount": str(amount),
+            "type": "expense",
+            "transaction_date": date.today().isoformat(),
+            "wallet_id": wallet["id"],
+            "category_id": categories["expense"]["id"],
+        }
+        for amount in amounts
+    ], headers=headers)
+    assert response.status_code == 201, response.text
+
+    response = client.get("/api/analytics/distribution", params={"bins": 5}, headers=headers)
+
+    assert response.status_code == 200, response.text
+    [category] = response.json()["categories"]
+    assert category["category_id"] == categories["expense"]["id"]
+    assert (category["count"], category["min"], category["max"], category["mean"]) == (10, 1.0, 10.0, 5.5)
+    assert category["p50"] == 5.5
+    assert category["histogram"]["counts"] == [2, 2, 2, 2, 2]
+    assert len(category["histogram"]["edges"]) == 6
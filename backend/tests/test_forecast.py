@@ -0,0 +1,79 @@
+from datetime import date, timedelta
+
+from app.api.analytics.forecasting_service import _usual_monthly_spending
+
+
+def _expense(client, headers, wallet, categories, amount, day):
+    response = client.post("/api/transactions/batch", json=[{
+        "name": "Rent",
+        "amount": amount,
+        "type": "expense",
+        "transaction_date": day.isoformat(),
+        "wallet_id": wallet["id"],
+        "category_id": categories["expense"]["id"],
+    }], headers=headers)
+    assert response.status_code == 201, response.text
+
+
+def test_usual_month_ignores_months_without_spending():
+    months = [{"total_spent": spent} for spent in (0.0, 0.0, 120.0, 0.0, 80.0)]
+
+    assert _usual_monthly_spending(months) == 100.0
+    assert _usual_monthly_spending([{"total_spent": 0.0}]) == 0.0
+
+
+def test_suggestions_compare_the_forecast_with_active_months(client, headers, wallet, categories):
+    today = date.today()
+    _expense(client, headers, wallet, categories, "100", today.replace(day=1) - timedelta(days=1))
+    _expense(client, headers, wallet, categories, "300", today)
+
+    response = client.get("/api/analytics/forecast/suggestions", headers=headers)
+
+    assert response.status_code == 200, response.text
+    # One active month of 100, not 400 spread over six months
+    messages = [s["message"] for s in response.json()["suggestions"] if s["type"] == "forecast_overspending"]
+    assert len(messages) == 1
+    assert messages[0].endswith("above your usual 100.00.")
+
+
+def test_spending_forecast_starts_from_what_is_spent(client, headers, wallet, categories):
+    today = date.today()
+    _expense(client, headers, wallet, categories, "60", today)
+
+    for model in ("average", "smoothing", "seasonal", "trend"):
+        response = client.get("/api/analytics/forecast/spending", params={"model": model}, headers=headers)
+
+        assert response.status_code == 200, response.text
+        forecast = response.json()
+        assert forecast["model"] == model
+        assert forecast["spent_so_far"] == 60.0
+        assert forecast["days_elapsed"] == today.day
+        band = forecast["confidence_interval"]
+        assert 60.0 <= band["lower"] <= forecast["forecast_end_of_month"] <= band["upper"]
+
+
+def test_savings_forecast_projects_monthly_savings(client, headers, categories):
+    savings = client.post(
+        "/api/wallets/", json={"name": "Savings", "wallet_type": "saving_account", "balance": "0"}, headers=headers
+    ).json()
+    today = date.today()
+    response = client.post("/api/transactions/batch", json=[
+        {
+            "name": "Deposit",
+            "amount": amount,
+            "type": "income",
+            "transaction_date": day.isoformat(),
+            "wallet_id": savings["id"],
+            "category_id": categories["income"]["id"],
+        }
+        for amount, day in (("100", today.replace(day=1) - timedelta(days=1)), ("300", today))
+    ], headers=headers)
+    assert response.status_code == 201, response.text
+
+    response = client.get("/api/analytics/forecast/savings", params={"months_ahead": 2}, headers=headers)
+
+    assert response.status_code == 200, response.text
+    forecast = response.json()
+    assert forecast["average_monthly_saving"] == 200.0
+    # The latest month's 300 plus the average for every month ahead
+    assert [point["predicted_saved_amount"] for point in forecast["forecast"]] == [500.0, 700.0]
@@ -0,0 +1,27 @@
+from datetime import date, timedelta
+
+
+def test_rule_creates_its_due_occurrences_and_keeps_them_when_deleted(client, headers, wallet, categories):
+    start = date.today() - timedelta(days=70)
+    response = client.post("/api/recurring/", json={
+        "name": "Rent",
+        "amount": "5",
+        "type": "expense",
+        "wallet_id": wallet["id"],
+        "category_id": categories["expense"]["id"],
+        "frequency": "monthly",
+        "interval": 1,
+        "start_date": start.isoformat(),
+    }, headers=headers)
+
+    assert response.status_code == 201, response.text
+    rule = response.json()
+    # The start date and the same day one and two months later; three months later is still ahead
+    assert rule["occurrence_count"] == 3
+    assert client.get("/api/recurring/", headers=headers).json() == [rule]
+
+    assert client.delete(f"/api/recurring/{rule['id']}", headers=headers).status_code == 204
+    items = client.get("/api/transactions/", headers=headers).json()["items"]
+    assert [tx["name"] for tx in items] == ["Rent"] * 3
+    balance = client.get(f"/api/wallets/{wallet['id']}", headers=headers).json()["balance"]
+    assert float(balance) == 985
@@ -0,0 +1,40 @@
+from datetime import date
+
+from app.api.wallet.lookup_service import get_user_wallet_rows
+from app.database import SessionLocal
+from app.entities.wallet import Wallet
+from app.services import request_memo
+
+
+def test_dashboard_reads_the_wallets_once(client, headers, wallet, categories):
+    # Also creates this month's summary, which the dashboard would otherwise create and commit first
+    response = client.post("/api/transactions/batch", json=[{
+        "name": "Groceries",
+        "amount": "40",
+        "type": "expense",
+        "transaction_date": date.today().isoformat(),
+        "wallet_id": wallet["id"],
+        "category_id": categories["expense"]["id"],
+    }], headers=headers)
+    assert response.status_code == 201, response.text
+    before = client.get("/health").json()["request_memo"]
+
+    response = client.get("/api/dashboard", headers=headers)
+
+    assert response.status_code == 200, response.text
+    # The current summary and the total balance share one wallet query
+    assert response.headers["X-Avoided-Queries"] == "1"
+    after = client.get("/health").json()["request_memo"]
+    assert after["hits"] == before["hits"] + 1
+    assert after["avoided_queries"] == before["avoided_queries"] + 1
+
+
+def test_a_commit_drops_the_users_memoized_rows(client, headers, wallet):
+    user_id = client.get("/api/users/me", headers=headers).json()["id"]
+    with request_memo.request_memo() as memo, SessionLocal() as db:
+        assert [row.balance for row in get_user_wallet_rows(db, user_id)] == [1000]
+        db.get(Wallet, wallet["id"]).balance = 500
+        db.commit()
+
+        assert [row.balance for row in get_user_wallet_rows(db, user_id)] == [500]
+        assert memo.hits == 0
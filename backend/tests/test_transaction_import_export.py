@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+from datetime import date
+
+from app.api.transaction.export_service import EXPORT_COLUMNS
+
+
+def test_import_keeps_valid_rows_and_reports_the_others(client, headers, wallet):
+    content = (
+        "transaction_date,name,amount\n"
+        "2026-01-02,Coffee,-3.50\n"
+        "2026-01-03,Refund,20\n"
+        "2026-01-04,Broken,NaN\n"
+    )
+
+    response = client.post(
+        "/api/transactions/import",
+        data={"wallet_id": wallet["id"]},
+        files={"file": ("bank.csv", content, "text/csv")},
+        headers=headers,
+    )
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (2, 1)
+    assert result["errors"] == [{"row": 4, "error": "Invalid amount"}]
+    items = client.get("/api/transactions/", headers=headers).json()["items"]
+    assert sorted((tx["name"], tx["type"]) for tx in items) == [("Coffee", "expense"), ("Refund", "income")]
+
+
+def test_export_streams_every_transaction(client, headers, wallet, categories):
+    rows = [
+        {
+            "name": f"Row {i}",
+            "amount": "5",
+            "type": "expense",
+            "transaction_date": date.today().isoformat(),
+            "wallet_id": wallet["id"],
+            "category_id": categories["expense"]["id"],
+        }
+        for i in range(3)
+    ]
+    assert client.post("/api/transactions/batch", json=rows, headers=headers).status_code == 201
+
+    exported = client.get("/api/transactions/export", params={"format": "csv"}, headers=headers)
+    assert exported.status_code == 200, exported.text
+    reader = csv.reader(io.StringIO(exported.text))
+    assert next(reader) == EXPORT_COLUMNS
+    assert sorted(row[2] for row in reader) == ["Row 0", "Row 1", "Row 2"]
+
+    exported = client.get("/api/transactions/export", params={"format": "ndjson"}, headers=headers)
+    assert exported.status_code == 200, exported.text
+    lines = [json.loads(line) for line in exported.text.splitlines()]
+    assert sorted(line["name"] for line in lines) == ["Row 0", "Row 1", "Row 2"]
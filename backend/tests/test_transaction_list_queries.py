@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+
+from app.api.transaction import service
+from app.database import SessionLocal
+
+PAGE_SIZES = (5, 50, 100)
+
+
+@pytest.fixture
+def tagged_transactions(client, headers, wallet, categories):
+    """100 expenses with two tags each, so lazily loaded tags would cost a query per row."""
+    tags = [
+        client.post("/api/tags/", json={"name": name}, headers=headers).json()["id"]
+        for name in ("food", "weekly")
+    ]
+    rows = [
+        {
+            "name": f"row {i}",
+            "amount": "1",
+            "type": "expense",
+            "transaction_date": date.today().isoformat(),
+            "wallet_id": wallet["id"],
+            "category_id": categories["expense"]["id"],
+            "tags": tags,
+        }
+        for i in range(max(PAGE_SIZES))
+    ]
+    response = client.post("/api/transactions/batch", json=rows, headers=headers)
+    assert response.status_code == 201, response.text
+    return tags
+
+
+def _statements_per_page(client, headers, count_statements, url):
+    counts = []
+    for limit in PAGE_SIZES:
+        with count_statements() as count:
+            response = client.get(url, params={"limit": limit}, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()["items"]
+        assert len(page) == limit
+        assert all(len(item["tags"]) == 2 for item in page)
+        counts.append(count[0])
+    return counts
+
+
+@pytest.mark.parametrize("endpoint", ["user", "wallet", "tag"])
+def test_list_endpoints_cost_the_same_queries_for_any_page_size(
+    client, headers, wallet, tagged_transactions, count_statements, endpoint
+):
+    url = {
+        "user": "/api/transactions/",
+        "wallet": f"/api/transactions/wallet/{wallet['id']}",
+        "tag": f"/api/transactions/filter/by-tag/{tagged_transactions[0]}",
+    }[endpoint]
+
+    counts = _statements_per_page(client, headers, count_statements, url)
+
+    assert len(set(counts)) == 1, dict(zip(PAGE_SIZES, counts))
+
+
+def test_tag_search_costs_the_same_queries_for_any_page_size(
+    client, headers, wallet, tagged_transactions, count_statements
+):
+    user_id = client.get("/api/users/me", headers=headers).json()["id"]
+    counts = []
+    for limit in PAGE_SIZES:
+        db = SessionLocal()
+        try:
+            with count_statements() as count:
+                page = service.search_transactions_by_tag(db, user_id, "week", limit=limit)
+                assert all(len(item.tags) == 2 for item in page.items)
+        finally:
+            db.close()
+        assert len(page.items) == limit
+        counts.append(count[0])
+
+    assert len(set(counts)) == 1, dict(zip(PAGE_SIZES, counts))
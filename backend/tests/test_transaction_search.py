@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def transactions(client, headers, wallet, categories):
+    tag = client.post("/api/tags/", json={"name": "travel"}, headers=headers).json()["id"]
+    rows = [
+        ("Train ticket", "30", "expense", [tag], 0),
+        ("Hotel", "120", "expense", [tag], 1),
+        ("Groceries", "45", "expense", [], 2),
+        ("Salary", "900", "income", [], 3),
+    ]
+    response = client.post("/api/transactions/batch", json=[
+        {
+            "name": name,
+            "amount": amount,
+            "type": tx_type,
+            "transaction_date": (date.today() - timedelta(days=days_ago)).isoformat(),
+            "wallet_id": wallet["id"],
+            "category_id": categories[tx_type]["id"],
+            "tags": tags,
+        }
+        for name, amount, tx_type, tags, days_ago in rows
+    ], headers=headers)
+    assert response.status_code == 201, response.text
+    return tag
+
+
+def test_search_matches_names_and_tags(client, headers, transactions):
+    by_name = client.get("/api/transactions/search", params={"q": "train"}, headers=headers)
+    by_tag = client.get("/api/transactions/search", params={"q": "travel"}, headers=headers)
+
+    assert by_name.status_code == 200, by_name.text
+    assert [tx["name"] for tx in by_name.json()["items"]] == ["Train ticket"]
+    assert sorted(tx["name"] for tx in by_tag.json()["items"]) == ["Hotel", "Train ticket"]
+
+
+def test_query_combines_filters_and_pages_by_amount(client, headers, transactions):
+    params = {"type": "expense", "min_amount": "40", "sort_by": "amount", "order": "desc", "limit": 1}
+
+    first = client.get("/api/transactions/query", params=params, headers=headers).json()
+    second = client.get(
+        "/api/transactions/query", params={**params, "cursor": first["next_cursor"]}, headers=headers
+    ).json()
+
+    assert [tx["name"] for tx in first["items"]] == ["Hotel"]
+    assert [tx["name"] for tx in second["items"]] == ["Groceries"]
+    assert second["next_cursor"] is None
+
+
+def test_query_by_tag(client, headers, transactions):
+    response = client.get("/api/transactions/query", params={"tag_id": transactions}, headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert [tx["name"] for tx in response.json()["items"]] == ["Train ticket", "Hotel"]
@@ -0,0 +1,53 @@
+from datetime import date
+
+import pytest
+
+
+@pytest.fixture
+def expense(client, headers, wallet, categories):
+    response = client.post("/api/transactions/batch", json=[{
+        "name": "Groceries",
+        "amount": "40",
+        "type": "expense",
+        "transaction_date": date.today().isoformat(),
+        "wallet_id": wallet["id"],
+        "category_id": categories["expense"]["id"],
+    }], headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()[0]
+
+
+def test_changing_only_the_type_must_match_the_category(client, headers, expense):
+    response = client.put(f"/api/transactions/{expense['id']}", json={"type": "income"}, headers=headers)
+
+    assert response.status_code == 400, response.text
+    stored = client.get("/api/transactions/", headers=headers).json()["items"]
+    assert [tx["type"] for tx in stored] == ["expense"]
+
+
+def test_changing_type_and_category_together(client, headers, wallet, expense, categories):
+    response = client.put(
+        f"/api/transactions/{expense['id']}",
+        json={"type": "income", "category_id": categories["income"]["id"]},
+        headers=headers,
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["type"] == "income"
+    # The 40 spent is given back and 40 received on top
+    balance = client.get(f"/api/wallets/{wallet['id']}", headers=headers).json()["balance"]
+    assert float(balance) == 1040
+
+
+def test_create_rejects_a_category_of_another_type(client, headers, wallet, categories):
+    response = client.post("/api/transactions/batch", json=[{
+        "name": "Salary",
+        "amount": "10",
+        "type": "income",
+        "transaction_date": date.today().isoformat(),
+        "wallet_id": wallet["id"],
+        "category_id": categories["expense"]["id"],
+    }], headers=headers)
+
+    assert response.status_code == 400
+    assert "does not match" in response.text
@@ -0,0 +1,156 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.api.transaction import aggregate_service, service
+from app.api.transaction.model import TransactionCreate, TransferCreate
+from app.database import SessionLocal, engine
+from app.entities.daily_rollup import DailyRollup
+from app.entities.financial_summary import FinancialSummary
+from app.entities.transaction import Transaction
+from app.entities.wallet import Wallet
+from app.utils.enums.transaction_type import TransactionType
+
+
+@pytest.fixture
+def user_id(client, headers):
+    return client.get("/api/users/me", headers=headers).json()["id"]
+
+
+@pytest.fixture
+def saving_wallet(client, headers):
+    response = client.post(
+        "/api/wallets/", json={"name": "Save", "wallet_type": "saving_account", "balance": "0"}, headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def count_commits():
+    commits = [0]
+
+    def listener(conn):
+        commits[0] += 1
+
+    event.listen(engine, "commit", listener)
+    yield commits
+    event.remove(engine, "commit", listener)
+
+
+@pytest.fixture
+def break_last_step(monkeypatch):
+    """Call to make the last aggregate write fail, after balances and rollups are already staged."""
+    def fail(*args, **kwargs):
+        raise RuntimeError("aggregate write failed")
+
+    return lambda: monkeypatch.setattr(aggregate_service, "apply_amount_stats", fail)
+
+
+def _expense(wallet_id: int, category_id: int, amount: str = "40") -> TransactionCreate:
+    return TransactionCreate(
+        name="Groceries",
+        amount=Decimal(amount),
+        type=TransactionType.EXPENSE,
+        transaction_date=date.today(),
+        wallet_id=wallet_id,
+        category_id=category_id,
+    )
+
+
+def _committed_state(user_id: int) -> dict:
+    """Everything a write touches, read back in a fresh session."""
+    db = SessionLocal()
+    try:
+        return {
+            "balances": sorted(db.query(Wallet.id, Wallet.balance).filter(Wallet.user_id == user_id).all()),
+            "transactions": sorted(
+                db.query(Transaction.id, Transaction.amount).filter(Transaction.user_id == user_id).all()
+            ),
+            "rollups": sorted(
+                (row.date, row.category_id, row.type.value, row.total, row.count)
+                for row in db.query(DailyRollup).filter(DailyRollup.user_id == user_id)
+            ),
+            "summaries": sorted(
+                (row.year, row.month, row.total_income, row.total_spent, row.total_saved)
+                for row in db.query(FinancialSummary).filter(FinancialSummary.user_id == user_id)
+            ),
+        }
+    finally:
+        db.close()
+
+
+def test_create_commits_once(db, user_id, wallet, categories, count_commits):
+    service.create_transaction(db, user_id, _expense(wallet["id"], categories["expense"]["id"]))
+
+    assert count_commits[0] == 1
+    state = _committed_state(user_id)
+    assert dict(state["balances"])[wallet["id"]] == Decimal("960")
+    assert [(total, count) for *_, total, count in state["rollups"]] == [(Decimal("40"), 1)]
+
+
+def test_transfer_commits_once(db, user_id, wallet, saving_wallet, count_commits):
+    service.transfer_funds(db, user_id, TransferCreate(
+        source_wallet_id=wallet["id"], destination_wallet_id=saving_wallet["id"], amount=Decimal("25")
+    ))
+
+    assert count_commits[0] == 1
+    balances = dict(_committed_state(user_id)["balances"])
+    assert balances == {wallet["id"]: Decimal("975"), saving_wallet["id"]: Decimal("25")}
+
+
+def test_delete_commits_once(db, user_id, wallet, categories, count_commits):
+    transaction = service.create_transaction(db, user_id, _expense(wallet["id"], categories["expense"]["id"]))
+    count_commits[0] = 0
+
+    service.delete_transaction(db, user_id, transaction.id)
+
+    assert count_commits[0] == 1
+    state = _committed_state(user_id)
+    assert dict(state["balances"])[wallet["id"]] == Decimal("1000")
+    assert state["transactions"] == []
+
+
+def test_failed_create_leaves_nothing_behind(db, user_id, wallet, categories, break_last_step):
+    before = _committed_state(user_id)
+    break_last_step()
+
+    with pytest.raises(RuntimeError):
+        service.create_transaction(db, user_id, _expense(wallet["id"], categories["expense"]["id"]))
+    db.close()
+
+    assert _committed_state(user_id) == before
+
+
+def test_failed_transfer_leaves_nothing_behind(db, user_id, wallet, saving_wallet, break_last_step):
+    before = _committed_state(user_id)
+    break_last_step()
+
+    with pytest.raises(RuntimeError):
+        service.transfer_funds(db, user_id, TransferCreate(
+            source_wallet_id=wallet["id"], destination_wallet_id=saving_wallet["id"], amount=Decimal("25")
+        ))
+    db.close()
+
+    assert _committed_state(user_id) == before
+
+
+def test_failed_delete_leaves_nothing_behind(db, user_id, wallet, categories, break_last_step):
+    transaction = service.create_transaction(db, user_id, _expense(wallet["id"], categories["expense"]["id"]))
+    before = _committed_state(user_id)
+    break_last_step()
+
+    with pytest.raises(RuntimeError):
+        service.delete_transaction(db, user_id, transaction.id)
+    db.close()
+
+    assert _committed_state(user_id) == before
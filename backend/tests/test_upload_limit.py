@@ -0,0 +1,19 @@
+from app.core.file_settings import MAX_UPLOAD_REQUEST_SIZE
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"0" * 100
+
+
+def test_image_upload_within_the_limit_is_stored(client, headers):
+    response = client.post("/api/users/me/avatar", files={"file": ("a.png", PNG)}, headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["avatar_url"].endswith(".png")
+
+
+def test_multipart_body_over_the_limit_is_refused(client, headers):
+    oversized = PNG + b"0" * MAX_UPLOAD_REQUEST_SIZE
+
+    response = client.post("/api/users/me/avatar", files={"file": ("a.png", oversized)}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "File too large"}
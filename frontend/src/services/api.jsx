@@ -3,6 +3,8 @@
 // ==========================================================
 
 const API_BASE_URL = "/api";
+// Largest page the transaction list endpoints serve (MAX_PAGE_SIZE on the backend)
+const TRANSACTION_PAGE_SIZE = 100;
 
 class ApiService {
     constructor() {
@@ -331,13 +333,32 @@ class ApiService {
         return await this.getUserTransactions();
     }
 
-    async getUserTransactions() {
-        const response = await fetch(`${API_BASE_URL}/transactions/`, {
-            method: "GET",
-            headers: this.getAuthHeaders(),
-        });
+    // List endpoints return pages ({ items, next_cursor }); follow the cursor
+    // until the last page so callers keep getting the full list
+    async getAllPages(path) {
+        const items = [];
+        let cursor = null;
 
-        return this.handleResponse(response);
+        do {
+            const url = new URL(`${API_BASE_URL}${path}`, window.location.origin);
+            url.searchParams.set("limit", String(TRANSACTION_PAGE_SIZE));
+            if (cursor) url.searchParams.set("cursor", cursor);
+
+            const response = await fetch(url.toString(), {
+                method: "GET",
+                headers: this.getAuthHeaders(),
+            });
+
+            const page = await this.handleResponse(response);
+            items.push(...(page?.items || []));
+            cursor = page?.next_cursor;
+        } while (cursor);
+
+        return items;
+    }
+
+    async getUserTransactions() {
+        return this.getAllPages("/transactions/");
     }
 
     async getWalletTransactions(walletId, limit = 10) {
@@ -352,7 +373,9 @@ class ApiService {
             headers: this.getAuthHeaders(),
         });
 
-        return this.handleResponse(response);
+        // Only the most recent `limit` transactions are wanted here
+        const page = await this.handleResponse(response);
+        return page?.items || [];
     }
 
     async createTransaction(data) {
@@ -505,15 +528,7 @@ class ApiService {
 
     async getTransactionsByTag(tagId) {
         try {
-            const response = await fetch(
-                `${API_BASE_URL}/transactions/filter/by-tag/${tagId}`,
-                {
-                    method: "GET",
-                    headers: this.getAuthHeaders(),
-                }
-            );
-
-            return this.handleResponse(response);
+            return await this.getAllPages(`/transactions/filter/by-tag/${tagId}`);
         } catch (error) {
             console.error('API Error (getTransactionsByTag):', error);
             return [];
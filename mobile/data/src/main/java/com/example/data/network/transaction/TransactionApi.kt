@@ -6,6 +6,7 @@ import com.example.data.network.transaction.model.SavingsTrendsResponse
 import com.example.data.network.transaction.model.SpendingTrendsResponse
 import com.example.data.network.transaction.model.TopCategoryResponse
 import com.example.data.network.transaction.model.TransactionDto
+import com.example.data.network.transaction.model.TransactionPageDto
 import com.example.data.network.transaction.model.TransferCreateRequest
 import com.example.data.network.transaction.model.TransferDto
 import com.example.data.network.transaction.model.TransferPreviewResponse
@@ -48,10 +49,18 @@ interface TransactionApi {
     ): Response<TransferPreviewResponse>
 
     @GET("api/transactions/")
-    suspend fun getTransactions(): Response<List<TransactionDto>>
+    suspend fun getTransactions(
+        @Query("limit") limit: Int = TRANSACTION_PAGE_SIZE,
+        @Query("cursor") cursor: String? = null
+    ): Response<TransactionPageDto>
 
     @GET("api/transactions/wallet/{wallet_id}")
-    suspend fun getTransactionsByWalletId(@Path("wallet_id") walletId: Int): Response<List<TransactionDto>>
+    suspend fun getTransactionsByWalletId(
+        @Path("wallet_id") walletId: Int,
+        // Most recent transactions only, as the endpoint has always defaulted to
+        @Query("limit") limit: Int = 10,
+        @Query("cursor") cursor: String? = null
+    ): Response<TransactionPageDto>
 
     @DELETE("api/transactions/{transaction_id}")
     suspend fun deleteTransaction(@Path("id") id: Int): Response<Unit>
@@ -86,4 +95,7 @@ interface TransactionApi {
     suspend fun getSavingsTrends(
         @Query("months") months: Int = 6
     ): Response<SavingsTrendsResponse>
-}
\ No newline at end of file
+}
+
+// Largest page the transaction list endpoints serve (MAX_PAGE_SIZE on the backend)
+const val TRANSACTION_PAGE_SIZE = 100
@@ -118,17 +118,19 @@ class TransactionRepositoryImpl(
 
     override suspend fun getTransactions(): Result<List<TransactionEntity>> {
         return try {
-            val response = apiService.getTransactions()
-            if (response.isSuccessful) {
-                val transactionDtos = response.body()
-                if (transactionDtos != null) {
-                    Result.success(transactionDtos.map { it.toEntity() })
-                } else {
-                    Result.success(emptyList())
+            // The list is paged; follow next_cursor until the last page
+            val transactions = mutableListOf<TransactionEntity>()
+            var cursor: String? = null
+            do {
+                val response = apiService.getTransactions(cursor = cursor)
+                if (!response.isSuccessful) {
+                    return Result.failure(Exception("API error: ${response.code()}"))
                 }
-            } else {
-                Result.failure(Exception("API error: ${response.code()}"))
-            }
+                val page = response.body() ?: break
+                transactions += page.items.map { it.toEntity() }
+                cursor = page.nextCursor
+            } while (cursor != null)
+            Result.success(transactions)
         } catch (e: Exception) {
             Result.failure(e)
         }
@@ -138,9 +140,9 @@ class TransactionRepositoryImpl(
         return try {
             val response = apiService.getTransactionsByWalletId(walletId)
             if (response.isSuccessful) {
-                val transactionDtos = response.body()
-                if (transactionDtos != null) {
-                    Result.success(transactionDtos.map { it.toEntity() })
+                val page = response.body()
+                if (page != null) {
+                    Result.success(page.items.map { it.toEntity() })
                 } else {
                     Result.success(emptyList())
                 }
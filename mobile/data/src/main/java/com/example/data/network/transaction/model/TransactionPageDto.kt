@@ -0,0 +1,11 @@
+package com.example.data.network.transaction.model
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+// One page of a transaction list; pass nextCursor back as `cursor` for the next one
+@Serializable
+data class TransactionPageDto(
+    @SerialName("items") val items: List<TransactionDto>,
+    @SerialName("next_cursor") val nextCursor: String? = null
+)